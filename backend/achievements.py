@@ -0,0 +1,192 @@
+import json
+from datetime import date, datetime, timedelta
+from typing import NamedTuple, Optional, Tuple
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.orm import Session
+from models import LearningPath, LearningPathVideo, UserAchievementStats, UserProgress, UserSkillProgress
+from progress import dialect_insert
+
+
+class Rule(NamedTuple):
+    code: str
+    name: str
+    description: str
+    counter: str  # UserAchievementStats column compared against threshold
+    threshold: int
+
+
+ACHIEVEMENTS = [
+    Rule('first_video', 'First Steps', 'Completed your first video', 'videos_completed', 1),
+    Rule('video_marathon', 'Video Marathon', 'Completed 20 videos', 'videos_completed', 20),
+    Rule('video_century', 'Century', 'Completed 100 videos', 'videos_completed', 100),
+    Rule('first_path', 'Path Finder', 'Finished your first learning path', 'paths_completed', 1),
+    Rule('path_master', 'Path Master', 'Finished 5 learning paths', 'paths_completed', 5),
+    Rule('explorer', 'Learning Explorer', 'Completed videos in 3 different skills', 'skills_covered', 3),
+    Rule('polymath', 'Polymath', 'Completed videos in 10 different skills', 'skills_covered', 10),
+    Rule('streak_7', 'Persistent Learner', 'Completed videos on 7 consecutive days', 'longest_streak', 7),
+    Rule('streak_30', 'Unstoppable', 'Completed videos on 30 consecutive days', 'longest_streak', 30),
+]
+
+def record_progress_change(db: Session, user_id: int, learning_path_id: int, completed: bool, changed_at: datetime) -> None:
+    """Update a user's counters for one progress row whose `completed` flag just flipped.
+
+    Runs in the transaction that wrote the progress row, after the write.
+    Apart from the locked counter row it only touches the learning path
+    itself (its size and the user's completions in it) and one per-skill
+    counter, so the cost does not grow with the user's history. The first
+    change of a user whose counters don't exist yet builds them from the
+    history once instead.
+    """
+    stats, created = _lock_stats(db, user_id)
+    if created:
+        rebuild_stats(db, user_id, stats)
+        return
+    delta = 1 if completed else -1
+    stats.videos_completed = max(stats.videos_completed + delta, 0)
+
+    total = db.scalar(select(func.count()).where(LearningPathVideo.learning_path_id == learning_path_id))
+    done = db.scalar(select(func.count()).where(
+        UserProgress.user_id == user_id,
+        UserProgress.learning_path_id == learning_path_id,
+        UserProgress.completed.is_(True),
+    ))
+    if total:
+        # Finished before the change vs. after it
+        stats.paths_completed = max(stats.paths_completed + int(done == total) - int(done - delta == total), 0)
+
+    skill_id = db.scalar(select(LearningPath.skill_id).where(LearningPath.id == learning_path_id))
+    if skill_id is not None:
+        skill_videos = _add_skill_videos(db, user_id, skill_id, delta)
+        if completed and skill_videos == 1:
+            stats.skills_covered += 1
+        elif not completed and skill_videos == 0:
+            stats.skills_covered = max(stats.skills_covered - 1, 0)
+
+    if completed:
+        _extend_streak(stats, changed_at.date())
+    award(stats, changed_at)
+
+def rebuild_stats(db: Session, user_id: int, stats: Optional[UserAchievementStats] = None) -> UserAchievementStats:
+    """Recompute a user's counters from their whole progress history.
+
+    Used once per user when the counters don't exist yet and after batch
+    syncs, whose client timestamps can land anywhere in the history.
+    Achievements already earned are kept.
+    """
+    if stats is None:
+        stats, _ = _lock_stats(db, user_id)
+    completed = (UserProgress.user_id == user_id, UserProgress.completed.is_(True))
+
+    stats.videos_completed = db.scalar(select(func.count()).where(*completed))
+
+    path_totals = (
+        select(LearningPathVideo.learning_path_id, func.count().label('total'))
+        .group_by(LearningPathVideo.learning_path_id)
+        .subquery()
+    )
+    stats.paths_completed = db.scalar(
+        select(func.count()).select_from(
+            select(UserProgress.learning_path_id)
+            .join(path_totals, path_totals.c.learning_path_id == UserProgress.learning_path_id)
+            .where(*completed)
+            .group_by(UserProgress.learning_path_id, path_totals.c.total)
+            .having(func.count() == path_totals.c.total)
+            .subquery()
+        )
+    )
+
+    skill_counts = db.execute(
+        select(LearningPath.skill_id, func.count())
+        .select_from(UserProgress)
+        .join(LearningPath, LearningPath.id == UserProgress.learning_path_id)
+        .where(*completed, LearningPath.skill_id.is_not(None))
+        .group_by(LearningPath.skill_id)
+    ).all()
+    db.execute(delete(UserSkillProgress).where(UserSkillProgress.user_id == user_id))
+    if skill_counts:
+        db.execute(insert(UserSkillProgress), [
+            {'user_id': user_id, 'skill_id': skill_id, 'completed_videos': count}
+            for skill_id, count in skill_counts
+        ])
+    stats.skills_covered = len(skill_counts)
+
+    days = db.scalars(
+        select(func.date(UserProgress.completed_at))
+        .where(*completed, UserProgress.completed_at.is_not(None))
+        .distinct()
+    ).all()
+    stats.current_streak, stats.longest_streak, stats.last_active_on = 0, 0, None
+    for day in sorted(_as_date(day) for day in days):
+        _extend_streak(stats, day)
+
+    award(stats, datetime.utcnow())
+    return stats
+
+def award(stats: UserAchievementStats, at: datetime) -> None:
+    """Mark rules whose threshold the counters reached; earned achievements are never taken back."""
+    earned = json.loads(stats.earned or '{}')
+    new = {rule.code: at.isoformat() for rule in ACHIEVEMENTS
+           if rule.code not in earned and (getattr(stats, rule.counter) or 0) >= rule.threshold}
+    if new:
+        stats.earned = json.dumps({**earned, **new})
+
+def achievements_summary(stats: Optional[UserAchievementStats], today: date) -> dict:
+    """Every achievement with the user's progress towards it, from the counter row alone."""
+    counters = {
+        'videos_completed': stats.videos_completed if stats else 0,
+        'paths_completed': stats.paths_completed if stats else 0,
+        'skills_covered': stats.skills_covered if stats else 0,
+        'longest_streak': stats.longest_streak if stats else 0,
+    }
+    earned = json.loads(stats.earned) if stats and stats.earned else {}
+    # A streak is only current while its last day is today or yesterday
+    active = stats is not None and stats.last_active_on is not None and stats.last_active_on >= today - timedelta(days=1)
+    return {
+        **counters,
+        'current_streak': stats.current_streak if active else 0,
+        'achievements': [
+            {
+                'code': rule.code,
+                'name': rule.name,
+                'description': rule.description,
+                'earned_at': earned.get(rule.code),
+                'current': min(counters[rule.counter], rule.threshold),
+                'total': rule.threshold,
+            }
+            for rule in ACHIEVEMENTS
+        ],
+    }
+
+def _lock_stats(db: Session, user_id: int) -> Tuple[UserAchievementStats, bool]:
+    """The user's counter row, locked for this transaction, and whether it was only just created."""
+    table = UserAchievementStats.__table__
+    created = db.execute(
+        dialect_insert(db, table).values(user_id=user_id).on_conflict_do_nothing().returning(table.c.user_id)
+    ).first()
+    stats = db.execute(
+        select(UserAchievementStats).where(UserAchievementStats.user_id == user_id).with_for_update()
+    ).scalar_one()
+    return stats, created is not None
+
+def _add_skill_videos(db: Session, user_id: int, skill_id: int, delta: int) -> int:
+    table = UserSkillProgress.__table__
+    stmt = dialect_insert(db, table).values(user_id=user_id, skill_id=skill_id, completed_videos=max(delta, 0))
+    updated = table.c.completed_videos + delta
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['user_id', 'skill_id'],
+        set_={'completed_videos': case((updated < 0, 0), else_=updated)},
+    ).returning(table.c.completed_videos)
+    return db.execute(stmt).scalar_one()
+
+def _extend_streak(stats: UserAchievementStats, day: date) -> None:
+    last = stats.last_active_on
+    if last is not None and day <= last:
+        # Same day, or a late-arriving earlier one that can't extend the current streak
+        return
+    stats.current_streak = (stats.current_streak or 0) + 1 if last == day - timedelta(days=1) else 1
+    stats.longest_streak = max(stats.longest_streak or 0, stats.current_streak)
+    stats.last_active_on = day
+
+def _as_date(value) -> date:
+    # func.date() returns a string on SQLite
+    return value if isinstance(value, date) else date.fromisoformat(value)
@@ -0,0 +1,75 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from models import UserDailyActivity, UserProgress
+from progress import dialect_insert
+
+DEFAULT_ACTIVITY_DAYS = 7
+MAX_ACTIVITY_DAYS = 365
+
+def completion_days(completed_at: Iterable[datetime]) -> Dict[date, int]:
+    """Number of completions per UTC day."""
+    return dict(Counter(moment.date() for moment in completed_at))
+
+def record_completions(db: Session, user_id: int, days: Dict[date, int]) -> None:
+    """Add completions to the user's daily rollup, in the transaction that wrote them.
+
+    Every completion counts on the day it happened; un-completing a video
+    later does not take it back, so a day's count is the activity of that
+    day rather than what is still completed.
+    """
+    if not days:
+        return
+    table = UserDailyActivity.__table__
+    stmt = dialect_insert(db, table).values([
+        {'user_id': user_id, 'day': day, 'completed_videos': count} for day, count in days.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['user_id', 'day'],
+        set_={'completed_videos': table.c.completed_videos + stmt.excluded.completed_videos},
+    )
+    db.execute(stmt)
+
+def recent_activity(db: Session, user_id: int, days: int, today: date) -> dict:
+    """The user's last `days` days up to `today`, oldest first, days without activity included as zero.
+
+    One range read on the (user_id, day) primary key.
+    """
+    first = today - timedelta(days=days - 1)
+    counts = {
+        day: count for day, count in db.execute(
+            select(UserDailyActivity.day, UserDailyActivity.completed_videos)
+            .where(UserDailyActivity.user_id == user_id, UserDailyActivity.day >= first, UserDailyActivity.day <= today)
+        )
+    }
+    series = [{'day': first + timedelta(days=i), 'completed_videos': counts.get(first + timedelta(days=i), 0)} for i in range(days)]
+    return {
+        'days': series,
+        'completed_videos': sum(counts.values()),
+        'active_days': sum(1 for count in counts.values() if count > 0),
+    }
+
+def backfill_users(db: Session, first_user_id: int, last_user_id: int, until: date) -> int:
+    """Rebuild the rollup of users first_user_id..last_user_id for the days before `until` from user_progress.
+
+    The progress table only keeps the latest completion of each video, so
+    that is what the rebuilt days count. Days from `until` on are left to
+    record_completions. Returns the number of rollup rows written.
+    """
+    in_range = (UserDailyActivity.user_id >= first_user_id, UserDailyActivity.user_id <= last_user_id)
+    db.execute(delete(UserDailyActivity).where(*in_range, UserDailyActivity.day < until))
+    day = func.date(UserProgress.completed_at)
+    rollup = (
+        select(UserProgress.user_id, day, func.count())
+        .where(
+            UserProgress.user_id >= first_user_id,
+            UserProgress.user_id <= last_user_id,
+            UserProgress.completed.is_(True),
+            UserProgress.completed_at < datetime.combine(until, datetime.min.time()),
+        )
+        .group_by(UserProgress.user_id, day)
+    )
+    result = db.execute(insert(UserDailyActivity).from_select(['user_id', 'day', 'completed_videos'], rollup))
+    return result.rowcount
@@ -0,0 +1,191 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import DateTime, Integer, String, column, select, table, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from database import engine
+
+# The admin statistics are read from precomputed summaries: materialized
+# views on PostgreSQL, plain tables on SQLite, created by the migration
+# f2b4d6e8a1c3. They are refreshed every ADMIN_STATS_REFRESH_SECONDS by
+# whichever worker notices first that they went stale.
+ADMIN_STATS_REFRESH_SECONDS = float(os.getenv('ADMIN_STATS_REFRESH_SECONDS', 300))
+DEFAULT_TOP_PATHS = 10
+MAX_TOP_PATHS = 100
+
+# Videos per learning path
+_PATH_VIDEOS = "SELECT learning_path_id, count(*) AS videos FROM learning_path_videos GROUP BY learning_path_id"
+# Completed videos of every user on every path they started
+_USER_PATHS = (
+    "SELECT up.user_id, up.learning_path_id, sum(CASE WHEN up.completed THEN 1 ELSE 0 END) AS done, max(v.videos) AS videos "
+    f"FROM user_progress up JOIN ({_PATH_VIDEOS}) v ON v.learning_path_id = up.learning_path_id "
+    "GROUP BY up.user_id, up.learning_path_id"
+)
+
+# Summary name -> (defining query, unique key). {now} is the dialect's
+# current UTC time. The migration holds a copy of these queries: changing
+# one needs a migration that recreates the summary.
+SUMMARIES = {
+    'admin_totals': (
+        "SELECT 1 AS id, "
+        "(SELECT count(*) FROM users) AS users, "
+        "(SELECT count(*) FROM skills) AS skills, "
+        "(SELECT count(*) FROM learning_paths) AS learning_paths, "
+        "(SELECT count(*) FROM videos) AS videos, "
+        "(SELECT count(*) FROM user_progress WHERE completed) AS completed_videos, "
+        "(SELECT count(DISTINCT user_id) FROM user_progress) AS started_learners, "
+        "(SELECT count(DISTINCT user_id) FROM user_progress WHERE completed) AS completing_learners, "
+        f"(SELECT count(DISTINCT p.user_id) FROM ({_USER_PATHS}) p WHERE p.done >= p.videos) AS finishing_learners, "
+        "{now} AS refreshed_at",
+        'id',
+    ),
+    'admin_skill_stats': (
+        "SELECT s.id AS skill_id, s.name AS name, "
+        "count(DISTINCT lp.id) AS learning_paths, "
+        "count(DISTINCT lpv.video_id) AS videos, "
+        "(SELECT count(DISTINCT up.user_id) FROM user_progress up JOIN learning_paths sp ON sp.id = up.learning_path_id "
+        "WHERE sp.skill_id = s.id) AS started_learners "
+        "FROM skills s "
+        "LEFT JOIN learning_paths lp ON lp.skill_id = s.id "
+        "LEFT JOIN learning_path_videos lpv ON lpv.learning_path_id = lp.id "
+        "GROUP BY s.id, s.name",
+        'skill_id',
+    ),
+    'admin_path_stats': (
+        "SELECT lp.id AS learning_path_id, lp.name AS name, lp.skill_id AS skill_id, "
+        "coalesce(v.videos, 0) AS videos, "
+        "count(p.user_id) AS started_learners, "
+        "coalesce(sum(CASE WHEN p.done * 2 >= p.videos THEN 1 ELSE 0 END), 0) AS halfway_learners, "
+        "coalesce(sum(CASE WHEN p.done >= p.videos THEN 1 ELSE 0 END), 0) AS finishing_learners, "
+        "coalesce(sum(p.done), 0) AS completed_videos "
+        "FROM learning_paths lp "
+        f"LEFT JOIN ({_PATH_VIDEOS}) v ON v.learning_path_id = lp.id "
+        f"LEFT JOIN ({_USER_PATHS}) p ON p.learning_path_id = lp.id "
+        "GROUP BY lp.id, lp.name, lp.skill_id, v.videos",
+        'learning_path_id',
+    ),
+}
+CURRENT_UTC = {
+    'postgresql': "(now() AT TIME ZONE 'utc')",
+    'sqlite': "CURRENT_TIMESTAMP",
+}
+
+totals = table(
+    'admin_totals',
+    *(column(name, Integer) for name in (
+        'users', 'skills', 'learning_paths', 'videos', 'completed_videos',
+        'started_learners', 'completing_learners', 'finishing_learners',
+    )),
+    column('refreshed_at', DateTime),
+)
+skill_stats = table(
+    'admin_skill_stats',
+    column('skill_id', Integer), column('name', String),
+    column('learning_paths', Integer), column('videos', Integer), column('started_learners', Integer),
+)
+path_stats = table(
+    'admin_path_stats',
+    column('learning_path_id', Integer), column('name', String), column('skill_id', Integer),
+    column('videos', Integer), column('started_learners', Integer), column('halfway_learners', Integer),
+    column('finishing_learners', Integer), column('completed_videos', Integer),
+)
+
+def summary_query(name: str, dialect: str) -> str:
+    return SUMMARIES[name][0].format(now=CURRENT_UTC[dialect])
+
+def is_summary_object(type_: str, name: str) -> bool:
+    """Whether a database object is one of the admin summaries rather than a model (for Alembic autogenerate)."""
+    return type_ == 'table' and name in SUMMARIES
+
+def refresh_summaries(db: Session) -> None:
+    """Recompute every summary from the live tables; readers keep seeing the previous contents until commit."""
+    dialect = db.get_bind().dialect.name
+    for name in SUMMARIES:
+        if dialect == 'postgresql':
+            # CONCURRENTLY uses the unique index and doesn't block readers
+            db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {name}"))
+        elif dialect == 'sqlite':
+            db.execute(text(f"DELETE FROM {name}"))
+            db.execute(text(f"INSERT INTO {name} {summary_query(name, dialect)}"))
+        else:
+            raise NotImplementedError(f"Admin statistics are not supported on {dialect}")
+
+def refreshed_at(db: Session) -> Optional[datetime]:
+    return db.scalar(select(totals.c.refreshed_at))
+
+def admin_stats(db: Session, top: int) -> dict:
+    """Totals, per-skill counts, the overall completion funnel and the most started paths, from the summaries only."""
+    row = db.execute(select(totals)).one()
+    skills = db.execute(select(skill_stats).order_by(skill_stats.c.name, skill_stats.c.skill_id)).all()
+    paths = db.execute(
+        select(path_stats)
+        .order_by(path_stats.c.started_learners.desc(), path_stats.c.finishing_learners.desc(), path_stats.c.learning_path_id)
+        .limit(top)
+    ).all()
+    return {
+        'totals': {
+            'users': row.users,
+            'skills': row.skills,
+            'learning_paths': row.learning_paths,
+            'videos': row.videos,
+            'completed_videos': row.completed_videos,
+        },
+        'funnel': [
+            {'step': 'registered', 'users': row.users},
+            {'step': 'started_a_path', 'users': row.started_learners},
+            {'step': 'completed_a_video', 'users': row.completing_learners},
+            {'step': 'finished_a_path', 'users': row.finishing_learners},
+        ],
+        'skills': [skill._asdict() for skill in skills],
+        'top_paths': [path._asdict() for path in paths],
+        'refreshed_at': row.refreshed_at,
+    }
+
+
+class SummaryRefresher:
+    """Background task keeping the admin summaries at most `refresh_seconds` old."""
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.refreshes = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self, force: bool = False) -> None:
+        try:
+            if await asyncio.to_thread(self._refresh_if_stale, force):
+                self.refreshes += 1
+        except SQLAlchemyError as e:
+            print(f"[WARN] Could not refresh the admin statistics: {e}")
+
+    def _refresh_if_stale(self, force: bool) -> bool:
+        with Session(engine) as db:
+            # Every worker runs this loop; only the first to see stale summaries refreshes them
+            last = refreshed_at(db)
+            if not force and last is not None and datetime.utcnow() - last < timedelta(seconds=self.refresh_seconds):
+                return False
+            refresh_summaries(db)
+            db.commit()
+            return True
+
+    async def start(self) -> None:
+        if self.refresh_seconds > 0 and self._task is None:
+            self._task = asyncio.create_task(self._refresh())
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _refresh(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_seconds)
+
+    def stats(self) -> dict:
+        return {'refreshes': self.refreshes, 'refresh_seconds': self.refresh_seconds}
+
+
+summary_refresher = SummaryRefresher(ADMIN_STATS_REFRESH_SECONDS)
@@ -33,6 +33,15 @@ if config.config_file_name is not None:
 from models import Base
 target_metadata = Base.metadata
 
+from search import is_search_object
+from admin_stats import is_summary_object
+
+def include_object(object, name, type_, reflected, compare_to):
+    # The full-text search columns, indexes and FTS5 tables and the admin
+    # summaries are managed by migrations only, they have no counterpart in
+    # the models
+    return not (reflected and compare_to is None and (is_search_object(type_, name) or is_summary_object(type_, name)))
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -57,6 +66,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -78,7 +88,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,156 @@
+"""Full schema and lookup indexes
+
+Revision ID: 5c2e8f1a9b3d
+Revises: 41a9b73e8294
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e8f1a9b3d'
+down_revision: Union[str, Sequence[str], None] = '41a9b73e8294'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, index name, columns, unique)
+INDEXES = [
+    ('learning_paths', 'ix_learning_paths_skill_id', ['skill_id'], False),
+    ('learning_paths', 'ix_learning_paths_created_by', ['created_by'], False),
+    ('videos', 'ix_videos_skill_id', ['skill_id'], False),
+    ('learning_path_videos', 'ix_learning_path_videos_path_order', ['learning_path_id', 'order'], False),
+    ('learning_path_videos', 'uq_learning_path_videos_path_video', ['learning_path_id', 'video_id'], True),
+    ('user_progress', 'uq_user_progress_user_path_video', ['user_id', 'learning_path_id', 'video_id'], True),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Databases bootstrapped with Base.metadata.create_all (seed_data.py) already
+    have some of these tables, so every table and index is only created when
+    it is missing.
+    """
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'users' not in tables:
+        op.create_table('users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('password_hash', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email')
+        )
+    if 'skills' not in tables:
+        op.create_table('skills',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('category', sa.String(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+    if 'videos' not in tables:
+        op.create_table('videos',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('youtube_id', sa.String(), nullable=False),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('duration_seconds', sa.Integer(), nullable=True),
+        sa.Column('quality_score', sa.String(), nullable=True),
+        sa.Column('skill_id', sa.Integer(), nullable=True),
+        sa.Column('difficulty', sa.String(), nullable=True),
+        sa.Column('published_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('youtube_id')
+        )
+    if 'learning_paths' not in tables:
+        op.create_table('learning_paths',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('skill_id', sa.Integer(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'learning_path_videos' not in tables:
+        op.create_table('learning_path_videos',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('learning_path_id', sa.Integer(), nullable=True),
+        sa.Column('video_id', sa.Integer(), nullable=True),
+        sa.Column('order', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['learning_path_id'], ['learning_paths.id'], ),
+        sa.ForeignKeyConstraint(['video_id'], ['videos.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'user_progress' not in tables:
+        op.create_table('user_progress',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('learning_path_id', sa.Integer(), nullable=True),
+        sa.Column('video_id', sa.Integer(), nullable=True),
+        sa.Column('completed', sa.Boolean(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['learning_path_id'], ['learning_paths.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['video_id'], ['videos.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'jobs' not in tables:
+        op.create_table('jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=True),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('created_count', sa.Integer(), nullable=False),
+        sa.Column('existing_count', sa.Integer(), nullable=False),
+        sa.Column('not_found_count', sa.Integer(), nullable=False),
+        sa.Column('failed_count', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'video_metadata_cache' not in tables:
+        op.create_table('video_metadata_cache',
+        sa.Column('youtube_id', sa.String(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('youtube_id')
+        )
+
+    # Unique indexes rather than constraints: same guarantee, usable as ON CONFLICT
+    # targets, and SQLite can add them without rebuilding the table
+    inspector = sa.inspect(op.get_bind())
+    for table, name, columns, unique in INDEXES:
+        if name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, name, columns, unique in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_table('video_metadata_cache')
+    op.drop_table('jobs')
+    op.drop_table('user_progress')
+    op.drop_table('learning_path_videos')
+    op.drop_table('learning_paths')
+    op.drop_table('videos')
+    op.drop_table('skills')
+    op.drop_table('users')
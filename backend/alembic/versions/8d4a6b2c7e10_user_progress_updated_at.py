@@ -0,0 +1,31 @@
+"""Add user_progress.updated_at for last-writer-wins sync
+
+Revision ID: 8d4a6b2c7e10
+Revises: 5c2e8f1a9b3d
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4a6b2c7e10'
+down_revision: Union[str, Sequence[str], None] = '5c2e8f1a9b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user_progress', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    # Best known change time for existing rows
+    op.execute("UPDATE user_progress SET updated_at = completed_at")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('user_progress') as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,37 @@
+"""Precompute video count and total duration of learning paths
+
+Revision ID: a8c1e3f5b7d9
+Revises: f2b4d6e8a1c3
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c1e3f5b7d9'
+down_revision: Union[str, Sequence[str], None] = 'f2b4d6e8a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('learning_paths', sa.Column('video_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('learning_paths', sa.Column('total_duration_seconds', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE learning_paths SET "
+        "video_count = (SELECT count(*) FROM learning_path_videos lpv WHERE lpv.learning_path_id = learning_paths.id), "
+        "total_duration_seconds = (SELECT coalesce(sum(v.duration_seconds), 0) FROM learning_path_videos lpv "
+        "JOIN videos v ON v.id = lpv.video_id WHERE lpv.learning_path_id = learning_paths.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('learning_paths') as batch_op:
+        batch_op.drop_column('total_duration_seconds')
+        batch_op.drop_column('video_count')
@@ -0,0 +1,37 @@
+"""Add catalog_revisions for HTTP caching of catalog endpoints
+
+Revision ID: b7e2d4f6a8c1
+Revises: a3f1c9d2e4b5
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d4f6a8c1'
+down_revision: Union[str, Sequence[str], None] = 'a3f1c9d2e4b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    table = op.create_table('catalog_revisions',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('revision', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(table, [
+        {'name': 'skills', 'revision': 0},
+        {'name': 'learning_paths', 'revision': 0},
+        {'name': 'learning_path_videos', 'revision': 0},
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('catalog_revisions')
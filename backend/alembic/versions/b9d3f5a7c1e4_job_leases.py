@@ -0,0 +1,32 @@
+"""Lease running import jobs to the process running them
+
+Revision ID: b9d3f5a7c1e4
+Revises: a8c1e3f5b7d9
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9d3f5a7c1e4'
+down_revision: Union[str, Sequence[str], None] = 'a8c1e3f5b7d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Jobs left running without a lease are claimable, so they are picked up again after the upgrade
+    op.add_column('jobs', sa.Column('lease_token', sa.String(), nullable=True))
+    op.add_column('jobs', sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.drop_column('lease_expires_at')
+        batch_op.drop_column('lease_token')
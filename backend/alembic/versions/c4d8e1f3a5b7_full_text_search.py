@@ -0,0 +1,70 @@
+"""Full-text search indexes for videos, skills and learning paths
+
+Revision ID: c4d8e1f3a5b7
+Revises: b7e2d4f6a8c1
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e1f3a5b7'
+down_revision: Union[str, Sequence[str], None] = 'b7e2d4f6a8c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, title column); every table is also searched on its description
+SEARCHABLE = [
+    ('videos', 'title'),
+    ('skills', 'name'),
+    ('learning_paths', 'name'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for table, title in SEARCHABLE:
+        if dialect == 'postgresql':
+            # Titles weigh more than descriptions in the ranking
+            op.execute(
+                f"ALTER TABLE {table} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+                f"setweight(to_tsvector('english', coalesce({title}, '')), 'A') || "
+                f"setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED"
+            )
+            op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], postgresql_using='gin')
+        elif dialect == 'sqlite':
+            # External content table: the text stays in the base table, the triggers keep the index in step
+            fts = f'{table}_fts'
+            op.execute(f"CREATE VIRTUAL TABLE {fts} USING fts5({title}, description, content='{table}', content_rowid='id', tokenize='porter unicode61')")
+            op.execute(
+                f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {title}, description) VALUES (new.id, new.{title}, new.description); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {title}, description) VALUES ('delete', old.id, old.{title}, old.description); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {fts}_update AFTER UPDATE OF {title}, description ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {title}, description) VALUES ('delete', old.id, old.{title}, old.description); "
+                f"INSERT INTO {fts}(rowid, {title}, description) VALUES (new.id, new.{title}, new.description); END"
+            )
+            op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for table, _ in SEARCHABLE:
+        if dialect == 'postgresql':
+            op.drop_index(f'ix_{table}_search_vector', table_name=table)
+            op.drop_column(table, 'search_vector')
+        elif dialect == 'sqlite':
+            fts = f'{table}_fts'
+            for trigger in ('insert', 'delete', 'update'):
+                op.execute(f"DROP TRIGGER IF EXISTS {fts}_{trigger}")
+            op.execute(f"DROP TABLE IF EXISTS {fts}")
@@ -0,0 +1,49 @@
+"""Add per-user achievement counters
+
+Revision ID: d5e9f2a4b6c8
+Revises: c4d8e1f3a5b7
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e9f2a4b6c8'
+down_revision: Union[str, Sequence[str], None] = 'c4d8e1f3a5b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows are created from the progress history on each user's next progress change
+    op.create_table('user_achievement_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('videos_completed', sa.Integer(), nullable=False),
+    sa.Column('paths_completed', sa.Integer(), nullable=False),
+    sa.Column('skills_covered', sa.Integer(), nullable=False),
+    sa.Column('current_streak', sa.Integer(), nullable=False),
+    sa.Column('longest_streak', sa.Integer(), nullable=False),
+    sa.Column('last_active_on', sa.Date(), nullable=True),
+    sa.Column('earned', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('user_skill_progress',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.Column('completed_videos', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'skill_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_skill_progress')
+    op.drop_table('user_achievement_stats')
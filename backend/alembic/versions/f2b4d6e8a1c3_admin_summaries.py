@@ -0,0 +1,88 @@
+"""Admin statistics summaries
+
+Revision ID: f2b4d6e8a1c3
+Revises: e7a3c5d9f1b2
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b4d6e8a1c3'
+down_revision: Union[str, Sequence[str], None] = 'e7a3c5d9f1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PATH_VIDEOS = "SELECT learning_path_id, count(*) AS videos FROM learning_path_videos GROUP BY learning_path_id"
+USER_PATHS = (
+    "SELECT up.user_id, up.learning_path_id, sum(CASE WHEN up.completed THEN 1 ELSE 0 END) AS done, max(v.videos) AS videos "
+    f"FROM user_progress up JOIN ({PATH_VIDEOS}) v ON v.learning_path_id = up.learning_path_id "
+    "GROUP BY up.user_id, up.learning_path_id"
+)
+# (summary, defining query, unique key), as in admin_stats.SUMMARIES at this revision
+SUMMARIES = [
+    ('admin_totals',
+     "SELECT 1 AS id, "
+     "(SELECT count(*) FROM users) AS users, "
+     "(SELECT count(*) FROM skills) AS skills, "
+     "(SELECT count(*) FROM learning_paths) AS learning_paths, "
+     "(SELECT count(*) FROM videos) AS videos, "
+     "(SELECT count(*) FROM user_progress WHERE completed) AS completed_videos, "
+     "(SELECT count(DISTINCT user_id) FROM user_progress) AS started_learners, "
+     "(SELECT count(DISTINCT user_id) FROM user_progress WHERE completed) AS completing_learners, "
+     f"(SELECT count(DISTINCT p.user_id) FROM ({USER_PATHS}) p WHERE p.done >= p.videos) AS finishing_learners, "
+     "{now} AS refreshed_at",
+     'id'),
+    ('admin_skill_stats',
+     "SELECT s.id AS skill_id, s.name AS name, "
+     "count(DISTINCT lp.id) AS learning_paths, "
+     "count(DISTINCT lpv.video_id) AS videos, "
+     "(SELECT count(DISTINCT up.user_id) FROM user_progress up JOIN learning_paths sp ON sp.id = up.learning_path_id "
+     "WHERE sp.skill_id = s.id) AS started_learners "
+     "FROM skills s "
+     "LEFT JOIN learning_paths lp ON lp.skill_id = s.id "
+     "LEFT JOIN learning_path_videos lpv ON lpv.learning_path_id = lp.id "
+     "GROUP BY s.id, s.name",
+     'skill_id'),
+    ('admin_path_stats',
+     "SELECT lp.id AS learning_path_id, lp.name AS name, lp.skill_id AS skill_id, "
+     "coalesce(v.videos, 0) AS videos, "
+     "count(p.user_id) AS started_learners, "
+     "coalesce(sum(CASE WHEN p.done * 2 >= p.videos THEN 1 ELSE 0 END), 0) AS halfway_learners, "
+     "coalesce(sum(CASE WHEN p.done >= p.videos THEN 1 ELSE 0 END), 0) AS finishing_learners, "
+     "coalesce(sum(p.done), 0) AS completed_videos "
+     "FROM learning_paths lp "
+     f"LEFT JOIN ({PATH_VIDEOS}) v ON v.learning_path_id = lp.id "
+     f"LEFT JOIN ({USER_PATHS}) p ON p.learning_path_id = lp.id "
+     "GROUP BY lp.id, lp.name, lp.skill_id, v.videos",
+     'learning_path_id'),
+]
+CURRENT_UTC = {
+    'postgresql': "(now() AT TIME ZONE 'utc')",
+    'sqlite': "CURRENT_TIMESTAMP",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for name, query, key in SUMMARIES:
+        if dialect == 'postgresql':
+            op.execute(f"CREATE MATERIALIZED VIEW {name} AS {query.format(now=CURRENT_UTC[dialect])}")
+            # Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+            op.execute(f"CREATE UNIQUE INDEX ix_{name}_{key} ON {name} ({key})")
+        elif dialect == 'sqlite':
+            op.execute(f"CREATE TABLE {name} AS {query.format(now=CURRENT_UTC[dialect])}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for name, _, _ in SUMMARIES:
+        if dialect == 'postgresql':
+            op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {name}")
+        elif dialect == 'sqlite':
+            op.execute(f"DROP TABLE IF EXISTS {name}")
@@ -1,27 +1,41 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from models import User
 from database import get_db
+from cache import cache
+from hashing import password_hasher, pwd_context
 import os
 
 SECRET_KEY = os.getenv('SECRET_KEY', 'changeme')
 ALGORITHM = 'HS256'
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Authenticated users are kept briefly so each request doesn't reload its User row
+USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 60))
+# Users allowed on the admin routes, as comma-separated ids; nobody when unset
+ADMIN_USER_IDS = frozenset(int(user_id) for user_id in os.getenv('ADMIN_USER_IDS', '').split(',') if user_id.strip())
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token", auto_error=False)
+user_cache = cache.namespace('users', USER_CACHE_TTL)
 
+# Blocking variants for scripts; request handlers go through password_hasher
 def verify_password(plain_password, hashed_password):
-    print("Vergleiche:", plain_password, hashed_password)
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+def user_claims(user: User) -> dict:
+    """Token claims for a user; `sub` is all that's needed to authorize a request."""
+    return {"sub": str(user.id), "email": user.email, "name": user.name}
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -31,26 +45,77 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = get_user_by_email(db, email)
-    if not user or not verify_password(password, user.password_hash):
+def _store_password_hash(db: Session, user: User, password_hash: str) -> None:
+    user.password_hash = password_hash
+    db.commit()
+    db.refresh(user)
+
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    user = await db.run_sync(get_user_by_email, email)
+    if not user:
+        return None
+    verified, new_hash = await password_hasher.verify_and_update(password, user.password_hash)
+    if not verified:
         return None
+    if new_hash:
+        # Stored hash used outdated parameters (e.g. a lower BCRYPT_ROUNDS)
+        await db.run_sync(_store_password_hash, user, new_hash)
     return user
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def invalidate_cached_user(user_id: int) -> None:
+    user_cache.delete_soon(int(user_id))
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _evict_changed_user(mapper, connection, target):
+    # Any ORM write to a user drops the cached copy
+    invalidate_cached_user(target.id)
+
+def _credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def decode_access_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise credentials_exception
-    return user 
\ No newline at end of file
+        if payload.get("sub") is None:
+            raise _credentials_exception()
+        int(payload["sub"])
+    except (JWTError, ValueError):
+        raise _credentials_exception()
+    return payload
+
+async def get_current_user_id(token: str = Depends(oauth2_scheme)) -> int:
+    """Stateless fast path for routes that only need the caller's id: no database access."""
+    return int(decode_access_token(token)["sub"])
+
+async def get_optional_user_id(token: Optional[str] = Depends(optional_oauth2_scheme)) -> Optional[int]:
+    """Caller's id on routes that also serve anonymous requests; a bad token counts as anonymous."""
+    if not token:
+        return None
+    try:
+        return int(decode_access_token(token)["sub"])
+    except HTTPException:
+        return None
+
+async def get_admin_user_id(user_id: int = Depends(get_current_user_id)) -> int:
+    """Caller's id on admin routes; 403 unless it is listed in ADMIN_USER_IDS."""
+    if user_id not in ADMIN_USER_IDS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return user_id
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
+    user_id = int(decode_access_token(token)["sub"])
+
+    async def load():
+        user = await db.get(User, user_id)
+        if user is None:
+            raise _credentials_exception()
+        return {"id": user.id, "email": user.email, "name": user.name}
+
+    # Cached as plain columns so it can be shared between workers; the
+    # returned User is transient and not attached to any session
+    return User(**await user_cache.get_or_load(user_id, load))
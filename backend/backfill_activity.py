@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Script to build the daily activity rollup (user_daily_activity) from the
+existing progress history, a batch of users per transaction.
+"""
+import argparse
+from datetime import date, datetime
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from database import engine
+from models import User
+from activity import backfill_users
+
+def backfill(batch_size: int, until: date) -> None:
+    last_id = 0
+    users = rows = 0
+    while True:
+        with Session(engine) as db:
+            ids = db.scalars(select(User.id).where(User.id > last_id).order_by(User.id).limit(batch_size)).all()
+            if not ids:
+                break
+            rows += backfill_users(db, ids[0], ids[-1], until)
+            db.commit()
+        users += len(ids)
+        last_id = ids[-1]
+        print(f"Backfilled {users} users ({rows} daily rows)...")
+    print(f"Done: {users} users, {rows} daily rows before {until.isoformat()}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--batch-size', type=int, default=500, help="users per transaction (default 500)")
+    parser.add_argument(
+        '--until', type=date.fromisoformat, default=datetime.utcnow().date(),
+        help="rebuild the days before this UTC date, YYYY-MM-DD (default today); later days are kept as recorded",
+    )
+    args = parser.parse_args()
+    backfill(args.batch_size, args.until)
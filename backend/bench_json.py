@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the list response paths on 10k-row lists: ORM objects validated
+against the response model (what response_model does, and the TypeAdapter
+dump_json variant) against column tuples encoded with orjson (fast_json.py).
+
+Runs against a throwaway in-memory SQLite database:
+
+    python bench_json.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import List
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session, joinedload
+from models import Base, LearningPath, LearningPathVideo, Skill, User, Video
+from fast_json import dumps, row_dicts, schema_columns
+from main import LearningPathOut, LearningPathVideoOut, VideoOut
+
+def seed(engine, rows: int) -> None:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    with Session(engine) as db:
+        db.execute(insert(User), [{'id': 1, 'email': 'bench@example.com', 'password_hash': 'x'}])
+        db.execute(insert(Skill), [{'id': 1, 'name': 'Benchmarking'}])
+        db.execute(insert(LearningPath), [
+            {'id': i, 'name': f'Path {i}', 'description': f'Learning path number {i}', 'skill_id': 1,
+             'created_by': 1, 'created_at': now + timedelta(seconds=i), 'video_count': 1, 'total_duration_seconds': 600}
+            for i in range(1, rows + 1)
+        ])
+        db.execute(insert(Video), [
+            {'id': i, 'youtube_id': f'yt{i:08d}', 'title': f'Video {i}', 'description': f'Description of video {i}',
+             'duration_seconds': 600, 'published_at': now - timedelta(days=i % 365)}
+            for i in range(1, rows + 1)
+        ])
+        db.execute(insert(LearningPathVideo), [
+            {'learning_path_id': 1, 'video_id': i, 'order': i} for i in range(1, rows + 1)
+        ])
+        db.commit()
+
+def response_model_path(objects, adapter: TypeAdapter) -> bytes:
+    # What FastAPI does with response_model: validate, serialize to JSON-able objects, json.dumps
+    content = adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode='json')
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(',', ':')).encode()
+
+def dump_json_path(objects, adapter: TypeAdapter) -> bytes:
+    return adapter.dump_json(adapter.validate_python(objects, from_attributes=True))
+
+def cases():
+    paths = TypeAdapter(List[LearningPathOut])
+    path_videos = TypeAdapter(List[LearningPathVideoOut])
+    orm_paths = lambda db: db.scalars(select(LearningPath).order_by(LearningPath.id)).all()
+    orm_videos = lambda db: db.scalars(
+        select(LearningPathVideo).options(joinedload(LearningPathVideo.video))
+        .where(LearningPathVideo.learning_path_id == 1).order_by(LearningPathVideo.order)
+    ).all()
+    return {
+        'learning paths': {
+            'response_model': lambda db: response_model_path(orm_paths(db), paths),
+            'TypeAdapter.dump_json': lambda db: dump_json_path(orm_paths(db), paths),
+            'columns + orjson': lambda db: dumps(row_dicts(db.execute(
+                select(*schema_columns(LearningPath, LearningPathOut)).order_by(LearningPath.id)
+            ))),
+        },
+        'videos of a path': {
+            'response_model': lambda db: response_model_path(orm_videos(db), path_videos),
+            'TypeAdapter.dump_json': lambda db: dump_json_path(orm_videos(db), path_videos),
+            'columns + orjson': lambda db: dumps(row_dicts(db.execute(
+                select(*schema_columns(LearningPathVideo, LearningPathVideoOut), *schema_columns(Video, VideoOut, nested='video'))
+                .join(Video, Video.id == LearningPathVideo.video_id)
+                .where(LearningPathVideo.learning_path_id == 1).order_by(LearningPathVideo.order)
+            ))),
+        },
+    }
+
+def timed(engine, render, repeat: int):
+    best, body = None, None
+    for _ in range(repeat):
+        # A new session each time so no run reuses ORM objects from the identity map
+        with Session(engine) as db:
+            start = time.perf_counter()
+            body = render(db)
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, body
+
+def main(rows: int, repeat: int) -> None:
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    seed(engine, rows)
+    print(f"{rows} rows, best of {repeat} runs (query + serialization)")
+    for name, paths in cases().items():
+        print(f"\n{name}")
+        results = {label: timed(engine, render, repeat) for label, render in paths.items()}
+        bodies = [json.loads(body) for _, body in results.values()]
+        assert all(body == bodies[0] for body in bodies), f"{name}: the paths produced different JSON"
+        baseline = results['response_model'][0]
+        for label, (seconds, body) in results.items():
+            print(f"  {label:<22} {seconds * 1000:8.1f} ms  {len(body) / 1024:7.0f} KiB  {baseline / seconds:5.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
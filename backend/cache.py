@@ -0,0 +1,313 @@
+import asyncio
+import json
+import os
+import secrets
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+from ttl_cache import TTLCache
+
+# memory: per-process LRU, fine for a single worker.
+# redis: shared between workers and hosts; also works against fakeredis
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+CACHE_PREFIX = os.getenv('CACHE_PREFIX', 'skillcrawler')
+# Entries per namespace kept in process (the whole cache for memory, the near cache for redis)
+CACHE_LOCAL_SIZE = int(os.getenv('CACHE_LOCAL_SIZE', 10000))
+# Upper bound on how long the redis backend trusts its near cache, should an
+# invalidation message get lost while the subscriber reconnects
+CACHE_NEAR_TTL = float(os.getenv('CACHE_NEAR_TTL', 30))
+# How long a single-flight loader may hold a key before others load it themselves
+CACHE_LOCK_TIMEOUT = float(os.getenv('CACHE_LOCK_TIMEOUT', 10))
+
+MISSING = object()
+
+
+class MemoryBackend:
+    """One TTL'd LRU per namespace, local to this process."""
+
+    name = 'memory'
+    lock_timeout = 0
+
+    def __init__(self, local_size: int):
+        self.local_size = local_size
+        self._namespaces: Dict[str, TTLCache] = {}
+
+    def _ns(self, namespace: str, ttl: float) -> TTLCache:
+        if namespace not in self._namespaces:
+            self._namespaces[namespace] = TTLCache(maxsize=self.local_size, ttl=ttl)
+        return self._namespaces[namespace]
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def get_many(self, namespace: str, keys: List[str], ttl: float) -> Dict[str, Any]:
+        entries = self._ns(namespace, ttl)
+        hits = {}
+        for key in keys:
+            value = entries.get(key, MISSING)
+            if value is not MISSING:
+                hits[key] = value
+        return hits
+
+    async def set_many(self, namespace: str, values: Dict[str, Any], ttl: float) -> None:
+        entries = self._ns(namespace, ttl)
+        for key, value in values.items():
+            entries.set(key, value, ttl=ttl)
+
+    async def delete(self, namespace: str, keys: List[str]) -> None:
+        self.drop_local(namespace, keys)
+
+    def drop_local(self, namespace: str, keys: List[str]) -> None:
+        entries = self._namespaces.get(namespace)
+        if entries is not None:
+            for key in keys:
+                entries.delete(key)
+
+    async def acquire(self, namespace: str, key: str) -> Optional[str]:
+        # Within one process the in-flight futures in Namespace already single-flight
+        return 'local'
+
+    async def release(self, namespace: str, key: str, token: str) -> None:
+        pass
+
+
+class RedisBackend(MemoryBackend):
+    """Values live in Redis, shared by every worker.
+
+    Hits are also kept in a short-lived near cache per process. Deletes are
+    published on a channel that every process subscribes to, so their near
+    caches drop the key as well. The near cache is only used while that
+    subscription is running.
+    """
+
+    name = 'redis'
+
+    def __init__(self, client, prefix: str, local_size: int, near_ttl: float, lock_timeout: float):
+        super().__init__(local_size)
+        self.client = client
+        self.prefix = prefix
+        self.near_ttl = near_ttl
+        self.lock_timeout = lock_timeout
+        self.channel = f'{prefix}:invalidate'
+        self._subscriber: Optional[asyncio.Task] = None
+        self._listening = False
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f'{self.prefix}:{namespace}:{key}'
+
+    async def start(self) -> None:
+        if self._subscriber is None:
+            ready = asyncio.Event()
+            self._subscriber = asyncio.create_task(self._listen(ready))
+            await ready.wait()
+
+    async def close(self) -> None:
+        if self._subscriber is not None:
+            self._subscriber.cancel()
+            await asyncio.gather(self._subscriber, return_exceptions=True)
+            self._subscriber = None
+        await self.client.aclose()
+
+    async def _listen(self, ready: asyncio.Event) -> None:
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                self._listening = True
+                ready.set()
+                async for message in pubsub.listen():
+                    if message.get('type') == 'message':
+                        payload = json.loads(message['data'])
+                        self.drop_local(payload['namespace'], payload['keys'])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Anything cached locally may have missed invalidations meanwhile
+                print(f"[WARN] Cache invalidation subscriber failed, retrying: {e}")
+                self._listening = False
+                self._namespaces.clear()
+                ready.set()
+                await asyncio.sleep(1)
+            finally:
+                self._listening = False
+                await pubsub.aclose()
+
+    async def get_many(self, namespace: str, keys: List[str], ttl: float) -> Dict[str, Any]:
+        near_ttl = min(ttl, self.near_ttl)
+        hits = await super().get_many(namespace, keys, near_ttl) if self._listening else {}
+        remote_keys = [key for key in keys if key not in hits]
+        if remote_keys:
+            raw = await self.client.mget([self._key(namespace, key) for key in remote_keys])
+            found = {key: json.loads(value) for key, value in zip(remote_keys, raw) if value is not None}
+            if found and self._listening:
+                await super().set_many(namespace, found, near_ttl)
+            hits.update(found)
+        return hits
+
+    async def set_many(self, namespace: str, values: Dict[str, Any], ttl: float) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in values.items():
+                pipe.set(self._key(namespace, key), json.dumps(value), px=int(ttl * 1000))
+            await pipe.execute()
+        if self._listening:
+            await super().set_many(namespace, values, min(ttl, self.near_ttl))
+
+    async def delete(self, namespace: str, keys: List[str]) -> None:
+        self.drop_local(namespace, keys)
+        await self.client.delete(*[self._key(namespace, key) for key in keys])
+        await self.client.publish(self.channel, json.dumps({'namespace': namespace, 'keys': keys}))
+
+    async def acquire(self, namespace: str, key: str) -> Optional[str]:
+        token = secrets.token_hex(8)
+        acquired = await self.client.set(f'{self._key(namespace, key)}:lock', token, nx=True, px=int(self.lock_timeout * 1000))
+        return token if acquired else None
+
+    async def release(self, namespace: str, key: str, token: str) -> None:
+        lock_key = f'{self._key(namespace, key)}:lock'
+        if (await self.client.get(lock_key)) == token:
+            await self.client.delete(lock_key)
+
+
+class Namespace:
+    """A named slice of the cache with its own TTL.
+
+    Values must be JSON serializable (they may be stored in Redis); None is
+    a valid value, misses are reported as MISSING.
+    """
+
+    def __init__(self, cache: 'Cache', name: str, ttl: float):
+        self.cache = cache
+        self.name = name
+        self.ttl = ttl
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._stats = {'hits': 0, 'misses': 0, 'loads': 0, 'coalesced': 0}
+
+    async def get(self, key: Hashable) -> Any:
+        return (await self.get_many([key])).get(str(key), MISSING)
+
+    async def get_many(self, keys: Iterable[Hashable]) -> Dict[str, Any]:
+        """Cached values by (stringified) key; missing keys are left out."""
+        keys = [str(key) for key in keys]
+        hits = await self.cache.backend.get_many(self.name, keys, self.ttl)
+        self._stats['hits'] += len(hits)
+        self._stats['misses'] += len(keys) - len(hits)
+        return hits
+
+    async def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        await self.set_many({key: value}, ttl)
+
+    async def set_many(self, values: Dict[Hashable, Any], ttl: Optional[float] = None) -> None:
+        if values:
+            await self.cache.backend.set_many(self.name, {str(k): v for k, v in values.items()}, ttl or self.ttl)
+
+    async def delete(self, *keys: Hashable) -> None:
+        """Remove keys here and, with the redis backend, from every worker's near cache."""
+        await self.cache.backend.delete(self.name, [str(key) for key in keys])
+
+    def delete_soon(self, *keys: Hashable) -> None:
+        """delete() for sync code, e.g. ORM event handlers; the local copy goes at once."""
+        keys = [str(key) for key in keys]
+        self.cache.backend.drop_local(self.name, keys)
+        loop = self.cache.loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(lambda: asyncio.ensure_future(self.cache.backend.delete(self.name, keys)))
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Any:
+        """Cached value, or the loader's result cached.
+
+        Concurrent misses for one key in a process share a single loader
+        call; with the redis backend, a lock also keeps other processes
+        from loading the same key at the same time (they wait for the
+        value instead, up to CACHE_LOCK_TIMEOUT). A loader that raises
+        caches nothing.
+        """
+        key = str(key)
+        value = await self.get(key)
+        if value is not MISSING:
+            return value
+        if key in self._in_flight:
+            self._stats['coalesced'] += 1
+            return await asyncio.shield(self._in_flight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await self._load(key, loader, ttl)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the exception; don't also report it as never retrieved
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def _load(self, key: str, loader, ttl: Optional[float]) -> Any:
+        backend = self.cache.backend
+        deadline = time.monotonic() + backend.lock_timeout
+        token = await backend.acquire(self.name, key)
+        while token is None and time.monotonic() < deadline:
+            # Another process is loading this key
+            await asyncio.sleep(0.05)
+            value = await self.get(key)
+            if value is not MISSING:
+                self._stats['coalesced'] += 1
+                return value
+            token = await backend.acquire(self.name, key)
+        try:
+            self._stats['loads'] += 1
+            value = await loader()
+            await self.set(key, value, ttl)
+            return value
+        finally:
+            if token is not None:
+                await backend.release(self.name, key, token)
+
+    def stats(self) -> dict:
+        return {'ttl': self.ttl, **self._stats}
+
+
+class Cache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.namespaces: Dict[str, Namespace] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def namespace(self, name: str, ttl: float) -> Namespace:
+        if name not in self.namespaces:
+            self.namespaces[name] = Namespace(self, name, ttl)
+        return self.namespaces[name]
+
+    async def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        await self.backend.start()
+
+    async def close(self) -> None:
+        await self.backend.close()
+        self.loop = None
+
+    def stats(self) -> dict:
+        return {
+            'backend': self.backend.name,
+            'namespaces': {name: namespace.stats() for name, namespace in self.namespaces.items()},
+        }
+
+
+def create_backend(kind: str = CACHE_BACKEND):
+    if kind == 'redis':
+        import redis.asyncio as redis
+        client = redis.from_url(REDIS_URL, decode_responses=True)
+        return RedisBackend(client, CACHE_PREFIX, CACHE_LOCAL_SIZE, CACHE_NEAR_TTL, CACHE_LOCK_TIMEOUT)
+    if kind == 'memory':
+        return MemoryBackend(CACHE_LOCAL_SIZE)
+    raise ValueError(f"Unknown CACHE_BACKEND {kind!r}, expected 'memory' or 'redis'")
+
+
+cache = Cache(create_backend())
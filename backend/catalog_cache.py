@@ -0,0 +1,90 @@
+import hashlib
+import os
+from typing import Awaitable, Callable, Dict, Iterable, Tuple
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from database import ENGINES
+from models import CatalogRevision
+from progress import dialect_insert
+from cache import cache
+
+# Serialized catalog responses. A write through the API bumps a revision, which
+# changes the cache key; the TTL only bounds staleness from writes that bypass
+# the API (seed scripts, manual SQL)
+CATALOG_CACHE_TTL = int(os.getenv('CATALOG_CACHE_TTL', 300))
+# How long the revisions read from the database are reused. Writes delete them
+# from the shared cache right away; with the memory backend other workers only
+# notice after this long
+CATALOG_REVISION_TTL = float(os.getenv('CATALOG_REVISION_TTL', 1))
+
+def bump_revisions(db: Session, tables: Iterable[str]) -> None:
+    """Increment the revision of each table, inside the caller's transaction."""
+    table = CatalogRevision.__table__
+    stmt = dialect_insert(db, table).values([{'name': name, 'revision': 1} for name in tables])
+    stmt = stmt.on_conflict_do_update(index_elements=['name'], set_={'revision': table.c.revision + 1})
+    db.execute(stmt)
+
+
+class CatalogCache:
+    """ETags and cached response bodies for rarely changing catalog reads.
+
+    A response is keyed by its URL plus the revisions of the tables it was
+    built from, and its ETag is derived from that key. The revisions are
+    read from the database the body is rendered from, so a lagging replica
+    never stores its older rows under the primary's newer revisions. A
+    conditional request
+    whose ETag still matches gets a 304 without the handler running, and a
+    repeated one is answered from the stored body. Either way the only
+    database access is reading the revision counters, which are cached too.
+    """
+
+    def __init__(self, ttl: int, revision_ttl: float):
+        self.responses = cache.namespace('catalog', ttl)
+        self.revision_cache = cache.namespace('catalog_revisions', revision_ttl)
+        self.not_modified = 0
+
+    async def revisions(self, db: AsyncSession) -> Dict[str, int]:
+        async def load():
+            rows = (await db.execute(select(CatalogRevision.name, CatalogRevision.revision))).all()
+            return {name: revision for name, revision in rows}
+        # Cached per database: the primary and a replica can be at different revisions
+        return await self.revision_cache.get_or_load(_database_key(db.bind), load)
+
+    async def invalidate_revisions(self) -> None:
+        """Drop the cached revisions everywhere; called after a write bumped them."""
+        for key in {_database_key(engine_) for engine_ in ENGINES.values() if engine_ is not None}:
+            await self.revision_cache.delete(key)
+
+    async def respond(self, request: Request, db: AsyncSession, tables: Tuple[str, ...], render: Callable[[], Awaitable[bytes]]) -> Response:
+        revisions = await self.revisions(db)
+        key = (request.url.path, str(sorted(request.query_params.multi_items())), tuple(revisions.get(name, 0) for name in tables))
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:20]
+        etag = f'"{digest}"'
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+
+        if etag in _parse_if_none_match(request.headers.get('if-none-match')):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        async def load():
+            return (await render()).decode()
+        body = await self.responses.get_or_load(digest, load)
+        return Response(content=body, media_type='application/json', headers=headers)
+
+    def stats(self) -> dict:
+        return {'not_modified': self.not_modified}
+
+
+def _database_key(engine_) -> str:
+    return engine_.url.render_as_string(hide_password=True)
+
+def _parse_if_none_match(value) -> set:
+    if not value:
+        return set()
+    # Weak and strong validators compare the same for GET
+    return {tag.strip().removeprefix('W/') for tag in value.split(',')}
+
+
+catalog_cache = CatalogCache(ttl=CATALOG_CACHE_TTL, revision_ttl=CATALOG_REVISION_TTL)
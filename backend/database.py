@@ -1,15 +1,158 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from pool_metrics import PoolMetrics, timed_pool_class
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
 import os
 
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///./test.db')
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if DATABASE_URL.startswith('sqlite') else {})
-SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+def async_database_url(url: str) -> str:
+    """Same database, reached through the asyncio driver (asyncpg / aiosqlite)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == 'postgresql':
+        parsed = parsed.set(drivername='postgresql+asyncpg')
+    elif backend == 'sqlite':
+        parsed = parsed.set(drivername='sqlite+aiosqlite')
+    return parsed.render_as_string(hide_password=False)
 
-def get_db():
-    db = SessionLocal()
+# Request handlers use the async engine. DATABASE_ASYNC=0 switches them back to
+# the sync engine (run in the threadpool) while the async drivers are rolled out.
+DATABASE_ASYNC = os.getenv('DATABASE_ASYNC', '1').lower() not in ('0', 'false', 'no')
+DATABASE_ASYNC_URL = os.getenv('DATABASE_ASYNC_URL') or async_database_url(DATABASE_URL)
+
+# Connection pool, per engine and per uvicorn worker: size + overflow connections
+# at most, pre-ping so connections killed by a failover are replaced instead of
+# failing the request, recycle to stay under server/proxy idle timeouts
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', '1').lower() not in ('0', 'false', 'no')
+
+def pool_options(url: str, pool_class, metrics: PoolMetrics) -> dict:
+    if make_url(url).database in (None, '', ':memory:'):
+        # In-memory SQLite keeps its single shared connection
+        return {}
+    return {
+        'poolclass': timed_pool_class(pool_class, metrics),
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+    }
+
+def make_engine(url: str, metrics: PoolMetrics):
+    sync_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False} if url.startswith('sqlite') else {},
+        **pool_options(url, QueuePool, metrics),
+    )
+    metrics.watch(sync_engine.pool)
+    return sync_engine
+
+def make_async_engine(url: str, metrics: PoolMetrics):
+    engine_ = create_async_engine(url, **pool_options(url, AsyncAdaptedQueuePool, metrics))
+    metrics.watch(engine_.sync_engine.pool)
+    return engine_
+
+# Optional read replica for read-only routes (see get_read_db in replica.py);
+# without it they use the primary
+DATABASE_READ_URL = os.getenv('DATABASE_READ_URL')
+DATABASE_ASYNC_READ_URL = os.getenv('DATABASE_ASYNC_READ_URL') or (async_database_url(DATABASE_READ_URL) if DATABASE_READ_URL else None)
+
+pool_metrics = {name: PoolMetrics() for name in ('sync', 'async', 'read', 'async_read')}
+
+# The sync engine stays for Alembic, scripts and the background jobs
+engine = make_engine(DATABASE_URL, pool_metrics['sync'])
+# Objects stay loaded after commit so responses can be serialized without going back to the database
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+async_engine = make_async_engine(DATABASE_ASYNC_URL, pool_metrics['async']) if DATABASE_ASYNC else None
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False) if DATABASE_ASYNC else None
+
+read_engine = make_engine(DATABASE_READ_URL, pool_metrics['read']) if DATABASE_READ_URL and not DATABASE_ASYNC else None
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine) if read_engine else SessionLocal
+async_read_engine = make_async_engine(DATABASE_ASYNC_READ_URL, pool_metrics['async_read']) if DATABASE_READ_URL and DATABASE_ASYNC else None
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False) if async_read_engine else AsyncSessionLocal
+
+ENGINES = {'sync': engine, 'async': async_engine, 'read': read_engine, 'async_read': async_read_engine}
+
+def pool_stats() -> dict:
+    stats = {}
+    for name, engine_ in ENGINES.items():
+        if engine_ is not None:
+            pool = engine_.sync_engine.pool if name.startswith('async') else engine_.pool
+            stats[name] = pool_metrics[name].stats(pool)
+    return stats
+
+
+class SyncSessionAdapter:
+    """Gives a sync Session the awaitable interface of AsyncSession.
+
+    Only used when DATABASE_ASYNC is off; every call that touches the
+    database runs in the threadpool, so handlers are written once against
+    the AsyncSession API.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    @property
+    def bind(self):
+        return self.sync_session.bind
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    def expunge(self, instance) -> None:
+        self.sync_session.expunge(instance)
+
+    async def execute(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def refresh(self, instance, *args, **kwargs) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, *args, **kwargs)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+
+@asynccontextmanager
+async def open_session(replica: bool = False):
+    """Session on the primary, or on the read replica when `replica` is set and one is configured."""
+    if DATABASE_ASYNC:
+        async with (AsyncReadSessionLocal if replica else AsyncSessionLocal)() as db:
+            yield db
+        return
+    db = SyncSessionAdapter((ReadSessionLocal if replica else SessionLocal)())
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        await db.close()
+
+async def get_db():
+    async with open_session() as db:
+        yield db
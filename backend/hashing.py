@@ -0,0 +1,125 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+# bcrypt cost; raising it makes existing hashes rehash on their next login
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+# Hash/verify calls allowed to wait for a worker before /token and /register answer 503
+PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', PASSWORD_HASH_WORKERS * 8))
+
+# Latency samples kept per operation for the percentiles in /metrics
+LATENCY_SAMPLES = 1000
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+# Worker functions run in the pool processes; they return the CPU time spent
+# so the parent can tell queueing delay from hashing cost.
+
+def _hash(password: str) -> Tuple[str, float]:
+    started = time.perf_counter()
+    return pwd_context.hash(password), time.perf_counter() - started
+
+def _verify_and_update(password: str, password_hash: str) -> Tuple[Tuple[bool, Optional[str]], float]:
+    started = time.perf_counter()
+    return pwd_context.verify_and_update(password, password_hash), time.perf_counter() - started
+
+
+class PasswordHasher:
+    """Runs bcrypt in a dedicated process pool instead of on the event loop
+    or the request threadpool.
+
+    At most `max_pending` calls may be queued or running; further calls are
+    rejected with 503 straight away instead of piling up behind the pool.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._rejected = 0
+        self._latencies = {'hash': deque(maxlen=LATENCY_SAMPLES), 'verify': deque(maxlen=LATENCY_SAMPLES)}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+
+    async def _submit(self, operation: str, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail='Authentication is busy, please retry shortly',
+                    headers={'Retry-After': '1'},
+                )
+            self._pending += 1
+            executor = self._get_executor()
+        started = time.perf_counter()
+        try:
+            result, service_time = await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+        total = time.perf_counter() - started
+        with self._lock:
+            self._latencies[operation].append((total, total - service_time))
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._submit('hash', _hash, password)
+
+    async def verify_and_update(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """Check a password; also returns a new hash when the stored one uses outdated parameters."""
+        return await self._submit('verify', _verify_and_update, password, password_hash)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                'workers': self.workers,
+                'pending': self._pending,
+                'max_pending': self.max_pending,
+                'rejected': self._rejected,
+            }
+            for operation, samples in self._latencies.items():
+                stats[operation] = _latency_summary(list(samples))
+        return stats
+
+
+def _latency_summary(samples) -> dict:
+    if not samples:
+        return {'count': 0}
+    totals = sorted(total for total, wait in samples)
+    waits = sorted(wait for total, wait in samples)
+    def pick(values, q):
+        return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 1)
+    return {
+        'count': len(samples),
+        'p50_ms': pick(totals, 0.5),
+        'p95_ms': pick(totals, 0.95),
+        'max_ms': pick(totals, 1.0),
+        'queue_p95_ms': pick(waits, 0.95),
+    }
+
+
+password_hasher = PasswordHasher(workers=PASSWORD_HASH_WORKERS, max_pending=PASSWORD_HASH_MAX_PENDING)
@@ -0,0 +1,31 @@
+from typing import Dict, List
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models import Video
+from suggest import suggest_index
+from youtube import parse_duration, parse_published_at
+
+def video_from_metadata(meta: dict) -> Video:
+    return Video(
+        youtube_id=meta['youtube_id'],
+        title=meta['title'],
+        description=meta['description'],
+        duration_seconds=parse_duration(meta['duration']),
+        published_at=parse_published_at(meta['published_at'])
+    )
+
+def find_videos(db: Session, youtube_ids: List[str]) -> Dict[str, Video]:
+    # One IN query tells us which ids we already have
+    return {v.youtube_id: v for v in db.query(Video).filter(Video.youtube_id.in_(youtube_ids)).all()}
+
+def store_videos(db: Session, metas: List[dict]) -> Dict[str, Video]:
+    db.add_all([video_from_metadata(meta) for meta in metas])
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise
+    # Reload all inserted rows in one query instead of refreshing them one by one
+    created = find_videos(db, [meta['youtube_id'] for meta in metas])
+    suggest_index.add_many('video', [(video.id, video.title) for video in created.values()])
+    return created
@@ -0,0 +1,270 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+from uuid import uuid4
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+from database import engine
+from ingestion import find_videos, store_videos
+from models import Job
+from youtube import fetch_videos_metadata, youtube_client
+
+VIDEO_IMPORT = 'video_import'
+
+# Progress is written back to the jobs table once per chunk
+JOB_CHUNK_SIZE = 50
+# A running job is leased to the process running it, which renews the lease
+# three times per period; every process looks for pending jobs and expired
+# leases (their process died) once per period
+JOB_LEASE_SECONDS = float(os.getenv('JOB_LEASE_SECONDS', 60))
+
+# Per-id import status -> Job counter column
+STATUS_COLUMNS = {
+    'created': 'created_count',
+    'exists': 'existing_count',
+    'not_found': 'not_found_count',
+    'error': 'failed_count',
+}
+
+def create_video_import_job(db: Session, youtube_ids: List[str], playlist_id: Optional[str], user_id: int) -> Job:
+    youtube_ids = list(dict.fromkeys(youtube_ids))
+    job = Job(
+        kind=VIDEO_IMPORT,
+        payload=json.dumps({'youtube_ids': youtube_ids, 'playlist_id': playlist_id}),
+        total=len(youtube_ids),
+        created_by=user_id,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+class JobRunner:
+    """Runs import jobs as asyncio tasks inside the API process.
+
+    Every worker process has one; a job runs in the process that claimed it
+    with an atomic UPDATE, so it never runs twice at once. Ids currently being imported are tracked in `_in_flight`, so when two
+    jobs ask for the same video only one of them fetches and stores it and
+    the other waits for that result.
+    """
+
+    def __init__(self):
+        self._tasks: Set[asyncio.Task] = set()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def submit(self, job_id: int) -> None:
+        task = asyncio.create_task(self._run(job_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def resume(self) -> None:
+        """Pick up pending jobs and jobs whose process stopped, now and then every JOB_LEASE_SECONDS."""
+        if self._sweeper is None:
+            # The first sweep is done before the app starts serving requests
+            await self._submit_claimable()
+            self._sweeper = asyncio.create_task(self._sweep())
+
+    async def shutdown(self) -> None:
+        # Cancelled jobs are handed back as pending and picked up by the next sweep of any process
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(JOB_LEASE_SECONDS)
+            await self._submit_claimable()
+
+    async def _submit_claimable(self) -> None:
+        try:
+            job_ids = await asyncio.to_thread(_claimable_job_ids)
+        except SQLAlchemyError as e:
+            print(f"[WARN] Could not resume import jobs: {e}")
+            return
+        # Other processes sweep too; the claim in _run lets only one of them run each job
+        for job_id in job_ids:
+            self.submit(job_id)
+
+    async def _run(self, job_id: int) -> None:
+        token = uuid4().hex
+        try:
+            payload = await asyncio.to_thread(_claim_job, job_id, token)
+        except SQLAlchemyError as e:
+            print(f"[WARN] Could not claim import job {job_id}: {e}")
+            return
+        if payload is None:
+            # Running elsewhere, already finished or deleted
+            return
+        lease = asyncio.create_task(self._keep_lease(job_id, token, asyncio.current_task()))
+        try:
+            youtube_ids = payload.get('youtube_ids') or []
+            if payload.get('playlist_id'):
+                playlist_ids = await youtube_client.fetch_playlist_video_ids(payload['playlist_id'])
+                if playlist_ids is None:
+                    raise RuntimeError('Could not load playlist from YouTube')
+                youtube_ids = list(dict.fromkeys(youtube_ids + playlist_ids))
+                await asyncio.to_thread(_set_total, job_id, token, len(youtube_ids))
+            for start in range(0, len(youtube_ids), JOB_CHUNK_SIZE):
+                statuses = await self.import_videos(youtube_ids[start:start + JOB_CHUNK_SIZE])
+                await asyncio.to_thread(_record_progress, job_id, token, statuses)
+            await asyncio.to_thread(_finish_job, job_id, token, 'completed')
+        except asyncio.CancelledError:
+            await asyncio.to_thread(_release_job, job_id, token)
+            raise
+        except Exception as e:
+            print(f"[ERROR] Import job {job_id} failed: {e}")
+            await asyncio.to_thread(_finish_job, job_id, token, 'failed', str(e))
+        finally:
+            lease.cancel()
+
+    async def _keep_lease(self, job_id: int, token: str, run: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+            try:
+                renewed = await asyncio.to_thread(_renew_lease, job_id, token)
+            except SQLAlchemyError as e:
+                print(f"[WARN] Could not renew the lease of import job {job_id}: {e}")
+                continue
+            if not renewed:
+                # The lease ran out and another process took the job over
+                print(f"[WARN] Import job {job_id} was taken over by another process")
+                run.cancel()
+                return
+
+    async def import_videos(self, youtube_ids: List[str]) -> Dict[str, str]:
+        """Import ids and return a status per id, sharing work with other running jobs."""
+        waiting = {youtube_id: self._in_flight[youtube_id] for youtube_id in youtube_ids if youtube_id in self._in_flight}
+        owned = [youtube_id for youtube_id in youtube_ids if youtube_id not in waiting]
+        loop = asyncio.get_running_loop()
+        futures = {youtube_id: loop.create_future() for youtube_id in owned}
+        self._in_flight.update(futures)
+        statuses: Dict[str, str] = {}
+        try:
+            if owned:
+                statuses = await _import_videos(owned)
+        finally:
+            for youtube_id, future in futures.items():
+                if not future.done():
+                    future.set_result(statuses.get(youtube_id, 'error'))
+                self._in_flight.pop(youtube_id, None)
+
+        for youtube_id, future in waiting.items():
+            status = await asyncio.shield(future)
+            # The other job stored it, from this job's point of view it already existed
+            statuses[youtube_id] = 'exists' if status == 'created' else status
+        return statuses
+
+
+async def _import_videos(youtube_ids: List[str]) -> Dict[str, str]:
+    existing = await asyncio.to_thread(_existing_youtube_ids, youtube_ids)
+    missing = [youtube_id for youtube_id in youtube_ids if youtube_id not in existing]
+    metadata = await fetch_videos_metadata(missing) if missing else {}
+    new_metas = [metadata[youtube_id] for youtube_id in missing if metadata.get(youtube_id)]
+    created = await asyncio.to_thread(_store, new_metas) if new_metas else set()
+
+    statuses = {}
+    for youtube_id in youtube_ids:
+        if youtube_id in created:
+            statuses[youtube_id] = 'created'
+        elif youtube_id in existing or metadata.get(youtube_id):
+            statuses[youtube_id] = 'exists'
+        elif youtube_id in metadata:
+            statuses[youtube_id] = 'not_found'
+        else:
+            statuses[youtube_id] = 'error'
+    return statuses
+
+def _existing_youtube_ids(youtube_ids: List[str]) -> Set[str]:
+    with Session(engine) as db:
+        return set(find_videos(db, youtube_ids))
+
+def _store(metas: List[dict]) -> Set[str]:
+    with Session(engine) as db:
+        try:
+            return set(store_videos(db, metas))
+        except IntegrityError:
+            # A request outside the job runner stored some of these meanwhile; keep the rest
+            existing = find_videos(db, [meta['youtube_id'] for meta in metas])
+            remaining = [meta for meta in metas if meta['youtube_id'] not in existing]
+            return set(store_videos(db, remaining)) if remaining else set()
+
+def _claimable(now: datetime):
+    return or_(
+        Job.status == 'pending',
+        and_(Job.status == 'running', or_(Job.lease_expires_at.is_(None), Job.lease_expires_at < now)),
+    )
+
+def _leased(job_id: int, token: str) -> tuple:
+    return (Job.id == job_id, Job.lease_token == token, Job.status == 'running')
+
+def _claimable_job_ids() -> List[int]:
+    with Session(engine) as db:
+        return [job_id for (job_id,) in db.query(Job.id).filter(_claimable(datetime.utcnow())).order_by(Job.id).all()]
+
+def _claim_job(job_id: int, token: str) -> Optional[dict]:
+    """Lease the job to `token` and return its payload; None when it can't be claimed."""
+    now = datetime.utcnow()
+    with Session(engine) as db:
+        # The WHERE is re-checked on the locked row, so of two processes claiming at once only one updates it
+        claimed = db.query(Job).filter(Job.id == job_id, _claimable(now)).update({
+            Job.status: 'running',
+            Job.started_at: now,
+            Job.lease_token: token,
+            Job.lease_expires_at: now + timedelta(seconds=JOB_LEASE_SECONDS),
+            # Re-importing is idempotent, so a resumed job simply counts again from zero
+            **{getattr(Job, column): 0 for column in STATUS_COLUMNS.values()},
+        }, synchronize_session=False)
+        payload = db.query(Job.payload).filter(Job.id == job_id).scalar() if claimed else None
+        db.commit()
+        return json.loads(payload or '{}') if claimed else None
+
+def _renew_lease(job_id: int, token: str) -> bool:
+    with Session(engine) as db:
+        renewed = db.query(Job).filter(*_leased(job_id, token)).update(
+            {Job.lease_expires_at: datetime.utcnow() + timedelta(seconds=JOB_LEASE_SECONDS)}, synchronize_session=False
+        )
+        db.commit()
+        return bool(renewed)
+
+def _release_job(job_id: int, token: str) -> None:
+    with Session(engine) as db:
+        db.query(Job).filter(*_leased(job_id, token)).update(
+            {Job.status: 'pending', Job.lease_token: None, Job.lease_expires_at: None}, synchronize_session=False
+        )
+        db.commit()
+
+# Writes of a job's progress only apply while the writer still holds its lease
+
+def _set_total(job_id: int, token: str, total: int) -> None:
+    with Session(engine) as db:
+        db.query(Job).filter(*_leased(job_id, token)).update({Job.total: total})
+        db.commit()
+
+def _record_progress(job_id: int, token: str, statuses: Dict[str, str]) -> None:
+    increments = {}
+    for status in statuses.values():
+        column = getattr(Job, STATUS_COLUMNS[status])
+        increments[column] = increments.get(column, 0) + 1
+    if not increments:
+        return
+    with Session(engine) as db:
+        db.query(Job).filter(*_leased(job_id, token)).update({column: column + n for column, n in increments.items()})
+        db.commit()
+
+def _finish_job(job_id: int, token: str, status: str, error: Optional[str] = None) -> None:
+    with Session(engine) as db:
+        db.query(Job).filter(*_leased(job_id, token)).update({
+            Job.status: status, Job.error: error, Job.finished_at: datetime.utcnow(),
+            Job.lease_token: None, Job.lease_expires_at: None,
+        })
+        db.commit()
+
+job_runner = JobRunner()
@@ -0,0 +1,76 @@
+from typing import List, Optional
+from fastapi import HTTPException
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session, joinedload
+from models import LearningPath, LearningPathVideo, UserProgress, Video
+
+# Related data GET /learning-paths/{id} can embed with ?include=
+PATH_INCLUDES = ('skill', 'videos', 'progress')
+
+def parse_include(include: Optional[str]) -> List[str]:
+    """Parse a comma separated `include=` list; nothing is embedded when empty."""
+    if not include:
+        return []
+    requested = [name.strip() for name in include.split(',') if name.strip()]
+    unknown = sorted(set(requested) - set(PATH_INCLUDES))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(unknown)}")
+    return list(dict.fromkeys(requested))
+
+def add_to_totals(path: LearningPath, video: Video) -> None:
+    """Count a newly added video in the path's totals, as an atomic increment flushed with the association."""
+    path.video_count = LearningPath.video_count + 1
+    path.total_duration_seconds = LearningPath.total_duration_seconds + (video.duration_seconds or 0)
+
+def refresh_totals(db: Session, learning_path_ids: Optional[List[int]] = None) -> None:
+    """Recompute video_count and total_duration_seconds, for all paths by default.
+
+    For videos added without going through the API, e.g. by the seed
+    scripts.
+    """
+    video_count = (
+        select(func.count()).where(LearningPathVideo.learning_path_id == LearningPath.id).scalar_subquery()
+    )
+    total_duration = (
+        select(func.coalesce(func.sum(Video.duration_seconds), 0))
+        .select_from(LearningPathVideo)
+        .join(Video, Video.id == LearningPathVideo.video_id)
+        .where(LearningPathVideo.learning_path_id == LearningPath.id)
+        .scalar_subquery()
+    )
+    stmt = update(LearningPath).values(video_count=video_count, total_duration_seconds=total_duration)
+    if learning_path_ids is not None:
+        stmt = stmt.where(LearningPath.id.in_(learning_path_ids))
+    db.execute(stmt.execution_options(synchronize_session=False))
+
+def path_detail(db: Session, learning_path_id: int, include: List[str], user_id: Optional[int]) -> Optional[dict]:
+    """A learning path with the requested related data, one indexed query per part.
+
+    The path and its skill come from one primary key lookup with a join,
+    the videos from the (learning_path_id, order) index and the progress
+    from the user's rows in the path. Returns None when the path doesn't
+    exist.
+    """
+    stmt = select(LearningPath).where(LearningPath.id == learning_path_id)
+    if 'skill' in include:
+        stmt = stmt.options(joinedload(LearningPath.skill))
+    path = db.scalar(stmt)
+    if path is None:
+        return None
+    detail = {
+        column.name: getattr(path, column.name) for column in LearningPath.__table__.columns
+    }
+    if 'skill' in include:
+        detail['skill'] = path.skill
+    if 'videos' in include:
+        detail['videos'] = db.scalars(
+            select(LearningPathVideo)
+            .options(joinedload(LearningPathVideo.video))
+            .where(LearningPathVideo.learning_path_id == learning_path_id)
+            .order_by(LearningPathVideo.order)
+        ).all()
+    if 'progress' in include:
+        detail['progress'] = db.scalars(
+            select(UserProgress).where(UserProgress.user_id == user_id, UserProgress.learning_path_id == learning_path_id)
+        ).all()
+    return detail
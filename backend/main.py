@@ -8,26 +8,64 @@ print("DATABASE_URL:", os.getenv("DATABASE_URL"))
 from fastapi import FastAPI, Depends, HTTPException, status, Query, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from models import Base, User, Video, Skill, LearningPath, UserProgress, LearningPathVideo
-from database import engine, get_db
-from auth import get_password_hash, authenticate_user, create_access_token, get_current_user
-from pydantic import BaseModel, Field, field_validator
+from contextlib import asynccontextmanager
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import case, func, select
+from models import Base, User, Video, Skill, LearningPath, UserProgress, LearningPathVideo, Job, UserAchievementStats
+from database import async_engine, async_read_engine, engine, get_db, open_session, pool_stats
+from replica import get_read_db, mark_write, routing_stats
+from catalog_cache import bump_revisions, catalog_cache
+from auth import authenticate_user, get_user_by_email, create_access_token, get_current_user, get_current_user_id, get_admin_user_id, get_optional_user_id, user_claims
+from pydantic import BaseModel, Field
 from typing import Optional, List, Any
-from datetime import datetime
-from youtube import fetch_video_metadata
+from datetime import date, datetime
+from hashing import password_hasher
+from refresh_tokens import issue_refresh_token, revoke_refresh_token, rotate_refresh_token
+from youtube import fetch_video_metadata, fetch_videos_metadata, youtube_client
+from ingestion import find_videos, store_videos
+from jobs import create_video_import_job, job_runner
+from metadata_cache import metadata_cache
+from cache import cache
+from progress import sync_progress, upsert_progress
+from achievements import achievements_summary, rebuild_stats, record_progress_change
+from activity import DEFAULT_ACTIVITY_DAYS, MAX_ACTIVITY_DAYS, completion_days, recent_activity, record_completions
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate, parse_fields, parse_ids
+from fast_json import ORJSONResponse, dumps, row_dicts, schema_columns
+from search import DEFAULT_SEARCH_PAGE_SIZE, parse_types, search_catalog
+from suggest import DEFAULT_SUGGEST_LIMIT, MAX_SUGGEST_LIMIT, suggest_index
+from learning_paths import add_to_totals, parse_include, path_detail
+from admin_stats import DEFAULT_TOP_PATHS, MAX_TOP_PATHS, admin_stats, summary_refresher
 from sqlalchemy.exc import IntegrityError
 import os
 
 # Use Alembic migrations instead of direct schema creation
 # Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await cache.start()
+    await job_runner.resume()
+    await suggest_index.start()
+    await summary_refresher.start()
+    yield
+    await summary_refresher.shutdown()
+    await suggest_index.shutdown()
+    await job_runner.shutdown()
+    password_hasher.shutdown()
+    # Release pooled YouTube API connections on shutdown
+    await youtube_client.aclose()
+    await cache.close()
+    for db_engine in (async_engine, async_read_engine):
+        if db_engine is not None:
+            await db_engine.dispose()
+
 app = FastAPI(title="SkillCrawler API", 
               description="AI-powered skill learning aggregator that organizes video content into structured learning paths",
               version="0.1.0",
               docs_url="/docs",
-              redoc_url="/redoc")
+              redoc_url="/redoc",
+              lifespan=lifespan)
 
 # Configure CORS
 # For development, allow both localhost origins
@@ -93,7 +131,10 @@ class UserOut(BaseModel):
     email: str
     name: Optional[str]
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+class RefreshTokenIn(BaseModel):
+    refresh_token: str
 
 class VideoIn(BaseModel):
     youtube_id: str
@@ -104,9 +145,44 @@ class VideoOut(BaseModel):
     title: str
     description: str
     duration_seconds: int | None = None
-    published_at: str | None = None
+    published_at: datetime | None = None
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+# The batch fetch answers within the request, fetching 50 ids per videos.list
+# call; bigger imports such as whole playlists go to /jobs/video-imports
+MAX_BATCH_FETCH_IDS = 1000
+
+class VideoBatchIn(BaseModel):
+    youtube_ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_FETCH_IDS)
+
+class VideoFetchResult(BaseModel):
+    youtube_id: str
+    status: str  # created, exists, not_found or error
+    video: Optional[VideoOut] = None
+
+class VideoBatchOut(BaseModel):
+    results: List[VideoFetchResult]
+
+class VideoImportJobIn(BaseModel):
+    youtube_ids: List[str] = []
+    playlist_id: Optional[str] = None
+
+class JobOut(BaseModel):
+    id: int
+    kind: str
+    status: str
+    total: int
+    created_count: int
+    existing_count: int
+    not_found_count: int
+    failed_count: int
+    error: Optional[str] = None
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    class Config:
+        from_attributes = True
 
 class SkillIn(BaseModel):
     name: str
@@ -121,6 +197,10 @@ class SkillOut(BaseModel):
     class Config:
         from_attributes = True
 
+class SkillPage(BaseModel):
+    items: List[SkillOut]
+    next_cursor: Optional[int] = None
+
 class LearningPathIn(BaseModel):
     name: str
     description: str | None = None
@@ -132,21 +212,36 @@ class LearningPathOut(BaseModel):
     description: str | None = None
     skill_id: int
     created_by: int
-    created_at: str | datetime
-    
-    @field_validator('created_at')
-    def validate_created_at(cls, v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return v
+    created_at: datetime | None = None
+    video_count: int = 0
+    total_duration_seconds: int = 0
         
     class Config:
         from_attributes = True
+
+class LearningPathPage(BaseModel):
+    items: List[LearningPathOut]
+    next_cursor: Optional[int] = None
         
 class ProgressUpdate(BaseModel):
     video_id: int
     completed: bool = True
     
+class ProgressSyncItem(BaseModel):
+    learning_path_id: int
+    video_id: int
+    completed: bool = True
+    client_timestamp: datetime
+
+class ProgressBatchIn(BaseModel):
+    items: List[ProgressSyncItem] = Field(..., min_length=1, max_length=1000)
+
+class ProgressBatchOut(BaseModel):
+    applied: int
+    unchanged: int  # newer than the stored row but the same state
+    stale: int
+    rejected: List[List[int]]  # [learning_path_id, video_id] pairs that aren't in the path
+    
 class UserProgressOut(BaseModel):
     id: int
     user_id: int
@@ -157,6 +252,82 @@ class UserProgressOut(BaseModel):
     class Config:
         from_attributes = True
         
+class DashboardPathOut(BaseModel):
+    learning_path_id: int
+    name: str
+    description: str | None = None
+    skill_id: int | None = None
+    completed_videos: int
+    total_videos: int
+    percent_complete: int
+    last_activity: datetime | None = None
+
+class DashboardOut(BaseModel):
+    completed_videos: int
+    total_videos: int
+    percent_complete: int
+    paths: List[DashboardPathOut]
+
+class AchievementOut(BaseModel):
+    code: str
+    name: str
+    description: str
+    earned_at: datetime | None = None
+    current: int
+    total: int
+
+class AchievementsOut(BaseModel):
+    videos_completed: int
+    paths_completed: int
+    skills_covered: int
+    current_streak: int
+    longest_streak: int
+    achievements: List[AchievementOut]
+
+class ActivityDayOut(BaseModel):
+    day: date
+    completed_videos: int
+
+class ActivityOut(BaseModel):
+    completed_videos: int
+    active_days: int
+    days: List[ActivityDayOut]
+
+class AdminTotalsOut(BaseModel):
+    users: int
+    skills: int
+    learning_paths: int
+    videos: int
+    completed_videos: int
+
+class FunnelStepOut(BaseModel):
+    step: str
+    users: int
+
+class SkillStatsOut(BaseModel):
+    skill_id: int
+    name: str
+    learning_paths: int
+    videos: int
+    started_learners: int
+
+class PathStatsOut(BaseModel):
+    learning_path_id: int
+    name: str
+    skill_id: int | None = None
+    videos: int
+    started_learners: int
+    halfway_learners: int
+    finishing_learners: int
+    completed_videos: int
+
+class AdminStatsOut(BaseModel):
+    totals: AdminTotalsOut
+    funnel: List[FunnelStepOut]
+    skills: List[SkillStatsOut]
+    top_paths: List[PathStatsOut]
+    refreshed_at: datetime
+        
 class LearningPathVideoIn(BaseModel):
     video_id: int
     order: int
@@ -170,115 +341,325 @@ class LearningPathVideoOut(BaseModel):
     class Config:
         from_attributes = True
 
+class LearningPathDetailOut(LearningPathOut):
+    # Only present when requested with ?include=
+    skill: SkillOut | None = None
+    videos: List[LearningPathVideoOut] | None = None
+    progress: List[UserProgressOut] | None = None
+
+class SearchResultOut(BaseModel):
+    type: str  # video, skill or learning_path
+    id: int
+    title: str | None = None
+    snippet: str | None = None  # HTML-escaped description excerpt, matches wrapped in <mark>
+    rank: float
+
+class SearchPage(BaseModel):
+    items: List[SearchResultOut]
+    next_cursor: Optional[int] = None
+
+class SuggestionOut(BaseModel):
+    type: str
+    id: int
+    label: str
+
 @app.post('/register', response_model=UserOut, tags=['Authentication'], summary="Register a new user")
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     print(f"[DEBUG] Registration attempt with email: {user.email}")
     
     try:
         # Check if email already exists
-        existing_user = db.query(User).filter(User.email == user.email).first()
+        existing_user = await db.run_sync(get_user_by_email, user.email)
         if existing_user:
             print(f"[DEBUG] Registration failed: Email {user.email} already registered")
             raise HTTPException(status_code=400, detail='Email already registered')
         
         # Create new user
-        hashed_pw = get_password_hash(user.password)
+        hashed_pw = await password_hasher.hash(user.password)
         db_user = User(email=user.email, password_hash=hashed_pw, name=user.name)
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
         
         print(f"[DEBUG] Registration successful for user: {db_user.id} ({db_user.email})")
         return db_user
     except Exception as e:
         print(f"[ERROR] Registration exception: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise
 
 @app.post('/token', tags=['Authentication'], summary="Login and get access token")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=401, detail='Incorrect email or password')
-    access_token = create_access_token(data={"sub": str(user.id)})
-    return {"access_token": access_token, "token_type": "bearer"}
+    access_token = create_access_token(data=user_claims(user))
+    refresh_token = await db.run_sync(issue_refresh_token, user.id)
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+@app.post('/token/refresh', tags=['Authentication'], summary="Exchange a refresh token for a new access token")
+async def refresh_access_token(body: RefreshTokenIn, db: AsyncSession = Depends(get_db)):
+    user, refresh_token = await db.run_sync(rotate_refresh_token, body.refresh_token)
+    access_token = create_access_token(data=user_claims(user))
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+@app.post('/token/revoke', status_code=204, tags=['Authentication'], summary="Revoke a refresh token (logout)")
+async def revoke_token(body: RefreshTokenIn, db: AsyncSession = Depends(get_db)):
+    await db.run_sync(revoke_refresh_token, body.refresh_token)
+    return Response(status_code=204)
 
 @app.get('/me', response_model=UserOut, tags=['Authentication'], summary="Get current user profile")
-def read_users_me(current_user: User = Depends(get_current_user)):
+async def read_users_me(current_user: User = Depends(get_current_user)):
     return current_user
 
+def percent(completed: int, total: int) -> int:
+    return round(completed * 100 / total) if total else 0
+
+@app.get('/me/dashboard', response_model=DashboardOut, tags=['Progress'], summary="Progress across every learning path the current user has started")
+async def get_dashboard(db: AsyncSession = Depends(get_read_db), user_id: int = Depends(get_current_user_id)):
+    # Per-path progress for this user, aggregated once
+    progress = (
+        select(
+            UserProgress.learning_path_id,
+            func.sum(case((UserProgress.completed.is_(True), 1), else_=0)).label('completed'),
+            func.max(UserProgress.completed_at).label('last_activity'),
+        )
+        .where(UserProgress.user_id == user_id)
+        .group_by(UserProgress.learning_path_id)
+        .subquery()
+    )
+    # Counted only for the paths the user touched
+    total_videos = (
+        select(func.count(LearningPathVideo.id))
+        .where(LearningPathVideo.learning_path_id == LearningPath.id)
+        .correlate(LearningPath)
+        .scalar_subquery()
+    )
+    rows = (await db.execute(
+        select(
+            LearningPath.id,
+            LearningPath.name,
+            LearningPath.description,
+            LearningPath.skill_id,
+            progress.c.completed,
+            total_videos.label('total'),
+            progress.c.last_activity,
+        )
+        .join(progress, progress.c.learning_path_id == LearningPath.id)
+        .order_by(progress.c.last_activity.desc().nullslast(), LearningPath.id)
+    )).all()
+
+    paths = [
+        {
+            'learning_path_id': row.id,
+            'name': row.name,
+            'description': row.description,
+            'skill_id': row.skill_id,
+            'completed_videos': row.completed or 0,
+            'total_videos': row.total,
+            'percent_complete': percent(row.completed or 0, row.total),
+            'last_activity': row.last_activity,
+        }
+        for row in rows
+    ]
+    completed_videos = sum(path['completed_videos'] for path in paths)
+    total_videos = sum(path['total_videos'] for path in paths)
+    return {
+        'completed_videos': completed_videos,
+        'total_videos': total_videos,
+        'percent_complete': percent(completed_videos, total_videos),
+        'paths': paths,
+    }
+
+@app.get('/me/achievements', response_model=AchievementsOut, tags=['Progress'], summary="Achievements of the current user and progress towards the rest")
+async def get_achievements(db: AsyncSession = Depends(get_read_db), user_id: int = Depends(get_current_user_id)):
+    # One primary key lookup; the counters are maintained as progress changes
+    stats = await db.get(UserAchievementStats, user_id)
+    if stats is None:
+        # Users whose progress predates the counters get them built from their history, once
+        async with open_session() as primary:
+            stats = await primary.run_sync(rebuild_stats, user_id)
+            await primary.commit()
+    return achievements_summary(stats, datetime.utcnow().date())
+
+@app.get('/me/activity', response_model=ActivityOut, tags=['Progress'], summary="Videos completed per day over the current user's last days")
+async def get_activity(
+    days: int = Query(DEFAULT_ACTIVITY_DAYS, ge=1, le=MAX_ACTIVITY_DAYS, description="Number of days up to and including today (UTC)"),
+    db: AsyncSession = Depends(get_read_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    # Served from the daily rollup maintained by the progress endpoints
+    return await db.run_sync(recent_activity, user_id, days, datetime.utcnow().date())
+
 @app.post('/videos/fetch', response_model=VideoOut, tags=['Videos'], summary="Fetch and store video metadata from YouTube")
-def fetch_and_store_video(video_in: VideoIn, db: Session = Depends(get_db)):
+async def fetch_and_store_video(video_in: VideoIn, db: AsyncSession = Depends(get_db)):
     # Check if video already exists
-    db_video = db.query(Video).filter(Video.youtube_id == video_in.youtube_id).first()
-    if db_video:
-        return db_video
+    existing = await db.run_sync(find_videos, [video_in.youtube_id])
+    if existing:
+        return existing[video_in.youtube_id]
     # Fetch from YouTube
-    meta = fetch_video_metadata(video_in.youtube_id)
+    meta = await fetch_video_metadata(video_in.youtube_id)
     if not meta:
         raise HTTPException(status_code=404, detail='Video not found or API error')
-    # Parse ISO 8601 duration to seconds
-    import isodate
     try:
-        duration_seconds = int(isodate.parse_duration(meta['duration']).total_seconds())
-    except Exception:
-        duration_seconds = None
-    db_video = Video(
-        youtube_id=meta['youtube_id'],
-        title=meta['title'],
-        description=meta['description'],
-        duration_seconds=duration_seconds,
-        published_at=meta['published_at']
-    )
-    db.add(db_video)
-    try:
-        db.commit()
+        created = await db.run_sync(store_videos, [meta])
     except IntegrityError:
-        db.rollback()
         raise HTTPException(status_code=400, detail='Video already exists')
-    db.refresh(db_video)
-    return db_video
+    return created[video_in.youtube_id]
+
+@app.post('/videos/fetch/batch', response_model=VideoBatchOut, tags=['Videos'], summary="Fetch and store metadata for many YouTube videos")
+async def fetch_and_store_videos(batch: VideoBatchIn, db: AsyncSession = Depends(get_db), user_id: int = Depends(get_current_user_id)):
+    """Import up to 1000 videos in one request, 50 ids per YouTube call.
+
+    More ids are rejected with 422; queue them with POST /jobs/video-imports
+    instead, which also takes a playlist id and reports progress.
+    """
+    youtube_ids = list(dict.fromkeys(batch.youtube_ids))
+    existing = await db.run_sync(find_videos, youtube_ids)
+    missing = [youtube_id for youtube_id in youtube_ids if youtube_id not in existing]
+    metadata = await fetch_videos_metadata(missing) if missing else {}
+    new_metas = [metadata[youtube_id] for youtube_id in missing if metadata.get(youtube_id)]
+    created = {}
+    if new_metas:
+        try:
+            created = await db.run_sync(store_videos, new_metas)
+        except IntegrityError:
+            raise HTTPException(status_code=409, detail='Some videos were imported concurrently, please retry')
+        await mark_write(user_id)
+
+    results = []
+    for youtube_id in youtube_ids:
+        if youtube_id in existing:
+            results.append({'youtube_id': youtube_id, 'status': 'exists', 'video': existing[youtube_id]})
+        elif youtube_id in created:
+            results.append({'youtube_id': youtube_id, 'status': 'created', 'video': created[youtube_id]})
+        elif youtube_id in metadata:
+            results.append({'youtube_id': youtube_id, 'status': 'not_found'})
+        else:
+            results.append({'youtube_id': youtube_id, 'status': 'error'})
+    return {'results': results}
+
+@app.post('/jobs/video-imports', response_model=JobOut, status_code=status.HTTP_202_ACCEPTED, tags=['Jobs'], summary="Queue a background import of YouTube videos or a playlist")
+async def create_video_import(job_in: VideoImportJobIn, db: AsyncSession = Depends(get_db), user_id: int = Depends(get_current_user_id)):
+    if not job_in.youtube_ids and not job_in.playlist_id:
+        raise HTTPException(status_code=400, detail='Provide youtube_ids or a playlist_id')
+    job = await db.run_sync(create_video_import_job, job_in.youtube_ids, job_in.playlist_id, user_id)
+    job_runner.submit(job.id)
+    return job
 
-@app.get('/skills', response_model=list[SkillOut], tags=['Skills'], summary="List all available skills")
-def list_skills(db: Session = Depends(get_db)):
-    return db.query(Skill).all()
+@app.get('/jobs/{job_id}', response_model=JobOut, tags=['Jobs'], summary="Get the status and progress of a background job")
+async def get_job(job_id: int, db: AsyncSession = Depends(get_db), user_id: int = Depends(get_current_user_id)):
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.created_by != user_id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this job")
+    return job
+
+def page_json(rows, next_cursor: Optional[int]) -> bytes:
+    # Column tuples straight to orjson, no ORM objects or per-row validation (see fast_json.py)
+    return dumps({'items': row_dicts(rows), 'next_cursor': next_cursor})
+
+@app.get('/skills', response_model=SkillPage, tags=['Skills'], summary="List skills, one page at a time")
+async def list_skills(
+    request: Request,
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    category: Optional[str] = None,
+    ids: Optional[str] = Query(None, description="Comma separated ids to return, e.g. the matches of a search"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. id,name"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    async def render() -> bytes:
+        columns = parse_fields(fields, SkillOut.model_fields)
+        skill_ids = parse_ids(ids)
+        stmt = select(*[getattr(Skill, c) for c in columns]) if columns else select(*schema_columns(Skill, SkillOut))
+        if category is not None:
+            stmt = stmt.where(Skill.category == category)
+        if skill_ids is not None:
+            stmt = stmt.where(Skill.id.in_(skill_ids))
+        rows, next_cursor = await paginate(db, stmt, Skill.id, cursor, limit, scalars=False)
+        return page_json(rows, next_cursor)
+    return await catalog_cache.respond(request, db, ('skills',), render)
+
+@app.get('/skills/categories', response_model=List[str], tags=['Skills'], summary="Distinct skill categories, for filters")
+async def list_skill_categories(request: Request, db: AsyncSession = Depends(get_read_db)):
+    async def render() -> bytes:
+        categories = (await db.execute(
+            select(Skill.category).where(Skill.category.is_not(None)).distinct().order_by(Skill.category)
+        )).scalars().all()
+        return dumps(categories)
+    return await catalog_cache.respond(request, db, ('skills',), render)
 
 @app.post('/skills', response_model=SkillOut, tags=['Skills'], summary="Create a new skill")
-def create_skill(skill: SkillIn, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+async def create_skill(skill: SkillIn, db: AsyncSession = Depends(get_db), user_id: int = Depends(get_current_user_id)):
     db_skill = Skill(name=skill.name, category=skill.category, description=skill.description)
     db.add(db_skill)
-    db.commit()
-    db.refresh(db_skill)
+    await db.run_sync(bump_revisions, ['skills'])
+    await db.commit()
+    await db.refresh(db_skill)
+    await catalog_cache.invalidate_revisions()
+    suggest_index.add('skill', db_skill.id, db_skill.name)
+    await mark_write(user_id)
     return db_skill
 
-@app.get('/learning-paths', response_model=list[LearningPathOut], tags=['Learning Paths'], summary="List all learning paths")
-def list_learning_paths(db: Session = Depends(get_db)):
-    return db.query(LearningPath).all()
+@app.get('/learning-paths', response_model=LearningPathPage, tags=['Learning Paths'], summary="List learning paths, one page at a time")
+async def list_learning_paths(
+    request: Request,
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    skill_id: Optional[int] = None,
+    created_by: Optional[int] = None,
+    category: Optional[str] = Query(None, description="Category of the path's skill"),
+    ids: Optional[str] = Query(None, description="Comma separated ids to return, e.g. the matches of a search"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. id,name"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    async def render() -> bytes:
+        columns = parse_fields(fields, LearningPathOut.model_fields)
+        path_ids = parse_ids(ids)
+        stmt = select(*[getattr(LearningPath, c) for c in columns]) if columns else select(*schema_columns(LearningPath, LearningPathOut))
+        if skill_id is not None:
+            stmt = stmt.where(LearningPath.skill_id == skill_id)
+        if created_by is not None:
+            stmt = stmt.where(LearningPath.created_by == created_by)
+        if category is not None:
+            stmt = stmt.join(Skill, Skill.id == LearningPath.skill_id).where(Skill.category == category)
+        if path_ids is not None:
+            stmt = stmt.where(LearningPath.id.in_(path_ids))
+        rows, next_cursor = await paginate(db, stmt, LearningPath.id, cursor, limit, scalars=False)
+        return page_json(rows, next_cursor)
+    # The category filter reads skills too
+    return await catalog_cache.respond(request, db, ('learning_paths', 'skills'), render)
 
 @app.post('/learning-paths', response_model=LearningPathOut, tags=['Learning Paths'], summary="Create a new learning path")
-def create_learning_path(lp: LearningPathIn, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    db_lp = LearningPath(name=lp.name, description=lp.description, skill_id=lp.skill_id, created_by=user.id)
+async def create_learning_path(lp: LearningPathIn, db: AsyncSession = Depends(get_db), user_id: int = Depends(get_current_user_id)):
+    db_lp = LearningPath(name=lp.name, description=lp.description, skill_id=lp.skill_id, created_by=user_id)
     db.add(db_lp)
-    db.commit()
-    db.refresh(db_lp)
+    await db.run_sync(bump_revisions, ['learning_paths'])
+    await db.commit()
+    await db.refresh(db_lp)
+    await catalog_cache.invalidate_revisions()
+    suggest_index.add('learning_path', db_lp.id, db_lp.name)
+    await mark_write(user_id)
     return db_lp
 
 @app.post('/learning-paths/{learning_path_id}/videos', response_model=LearningPathVideoOut, tags=['Learning Paths'], summary="Add video to learning path")
-def add_video_to_learning_path(
+async def add_video_to_learning_path(
     learning_path_id: int, 
     video_data: LearningPathVideoIn, 
-    db: Session = Depends(get_db), 
-    user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db), 
+    user_id: int = Depends(get_current_user_id)
 ):
     # Check if learning path exists and belongs to user
-    learning_path = db.query(LearningPath).filter(LearningPath.id == learning_path_id).first()
+    learning_path = await db.get(LearningPath, learning_path_id)
     if not learning_path:
         raise HTTPException(status_code=404, detail="Learning path not found")
-    if learning_path.created_by != user.id:
+    if learning_path.created_by != user_id:
         raise HTTPException(status_code=403, detail="Not authorized to modify this learning path")
     
     # Check if video exists
-    video = db.query(Video).filter(Video.id == video_data.video_id).first()
+    video = await db.get(Video, video_data.video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     
@@ -289,85 +670,162 @@ def add_video_to_learning_path(
         order=video_data.order
     )
     db.add(db_lp_video)
+    add_to_totals(learning_path, video)
     try:
-        db.commit()
-        db.refresh(db_lp_video)
+        await db.run_sync(bump_revisions, ['learning_path_videos', 'learning_paths'])
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail="Video already exists in this learning path")
+    await catalog_cache.invalidate_revisions()
+    await mark_write(user_id)
     
-    # Return with video data included
-    return db_lp_video
+    # Reload with the video joined in, rather than refresh plus a lazy load of .video
+    return (await db.execute(
+        select(LearningPathVideo).options(joinedload(LearningPathVideo.video)).where(LearningPathVideo.id == db_lp_video.id)
+    )).scalar_one()
+
+@app.get('/learning-paths/{learning_path_id}', response_model=LearningPathDetailOut, tags=['Learning Paths'], summary="Get a learning path with its skill, videos and the user's progress")
+async def get_learning_path(
+    learning_path_id: int,
+    request: Request,
+    include: Optional[str] = Query(None, description="Comma separated related data to embed: skill, videos, progress"),
+    db: AsyncSession = Depends(get_read_db),
+    user_id: Optional[int] = Depends(get_optional_user_id)
+):
+    parts = parse_include(include)
+    if 'progress' in parts and user_id is None:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+
+    async def render() -> bytes:
+        detail = await db.run_sync(path_detail, learning_path_id, parts, user_id)
+        if detail is None:
+            raise HTTPException(status_code=404, detail="Learning path not found")
+        # Parts that weren't asked for are left out rather than sent as null
+        return LearningPathDetailOut.model_validate(detail, from_attributes=True).model_dump_json(exclude_unset=True).encode()
+    if 'progress' in parts:
+        # Per user, so it bypasses the shared catalog cache
+        return Response(content=await render(), media_type='application/json')
+    return await catalog_cache.respond(request, db, ('learning_paths', 'skills', 'learning_path_videos'), render)
 
 @app.get('/learning-paths/{learning_path_id}/videos', response_model=List[LearningPathVideoOut], tags=['Learning Paths'], summary="Get videos in a learning path")
-def get_learning_path_videos(learning_path_id: int, db: Session = Depends(get_db)):
-    videos = db.query(LearningPathVideo).filter(LearningPathVideo.learning_path_id == learning_path_id).order_by(LearningPathVideo.order).all()
-    return videos
+async def get_learning_path_videos(learning_path_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    async def render() -> bytes:
+        # One join, with the video's columns nested under "video" by row_dicts
+        rows = (await db.execute(
+            select(*schema_columns(LearningPathVideo, LearningPathVideoOut), *schema_columns(Video, VideoOut, nested='video'))
+            .join(Video, Video.id == LearningPathVideo.video_id)
+            .where(LearningPathVideo.learning_path_id == learning_path_id)
+            .order_by(LearningPathVideo.order)
+        )).all()
+        return dumps(row_dicts(rows))
+    return await catalog_cache.respond(request, db, ('learning_path_videos',), render)
 
 @app.post('/progress', response_model=UserProgressOut, tags=['Progress'], summary="Update user progress on a video")
-def update_progress(
+async def update_progress(
     progress: ProgressUpdate, 
     learning_path_id: int = Query(..., description="ID of the learning path"),
-    db: Session = Depends(get_db), 
-    user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db), 
+    user_id: int = Depends(get_current_user_id)
 ):
-    # Check if learning path exists
-    learning_path = db.query(LearningPath).filter(LearningPath.id == learning_path_id).first()
-    if not learning_path:
-        raise HTTPException(status_code=404, detail="Learning path not found")
-        
-    # Check if video exists and is part of learning path
-    learning_path_video = db.query(LearningPathVideo).filter(
-        LearningPathVideo.learning_path_id == learning_path_id,
-        LearningPathVideo.video_id == progress.video_id
-    ).first()
-    if not learning_path_video:
-        raise HTTPException(status_code=404, detail="Video not found in this learning path")
-    
-    # Update or create progress record
-    user_progress = db.query(UserProgress).filter(
-        UserProgress.user_id == user.id,
+    # Membership check, insert and update happen in one INSERT ... ON CONFLICT statement;
+    # un-completing first tries an UPDATE of a completed row, so a new row is not counted as a change
+    user_progress, changed = await db.run_sync(upsert_progress, user_id, learning_path_id, progress.video_id, progress.completed)
+    if changed:
+        await db.run_sync(record_progress_change, user_id, learning_path_id, user_progress.completed, user_progress.updated_at)
+        if user_progress.completed:
+            await db.run_sync(record_completions, user_id, completion_days([user_progress.completed_at]))
+    await db.commit()
+    await mark_write(user_id)
+    if user_progress:
+        return user_progress
+
+    # Nothing written: either the state didn't change or the video isn't in this path
+    user_progress = await db.scalar(select(UserProgress).where(
+        UserProgress.user_id == user_id,
         UserProgress.learning_path_id == learning_path_id,
         UserProgress.video_id == progress.video_id
-    ).first()
-    
+    ))
     if user_progress:
-        # Update existing progress
-        user_progress.completed = progress.completed
-        if progress.completed:
-            user_progress.completed_at = datetime.utcnow()
-        else:
-            user_progress.completed_at = None
-    else:
-        # Create new progress record
-        user_progress = UserProgress(
-            user_id=user.id,
-            learning_path_id=learning_path_id,
-            video_id=progress.video_id,
-            completed=progress.completed,
-            completed_at=datetime.utcnow() if progress.completed else None
-        )
-        db.add(user_progress)
-    
-    db.commit()
-    db.refresh(user_progress)
-    return user_progress
+        return user_progress
+    if not await db.scalar(select(LearningPath.id).where(LearningPath.id == learning_path_id)):
+        raise HTTPException(status_code=404, detail="Learning path not found")
+    raise HTTPException(status_code=404, detail="Video not found in this learning path")
+
+@app.post('/progress/batch', response_model=ProgressBatchOut, tags=['Progress'], summary="Apply many progress changes at once, newest client change wins")
+async def sync_progress_batch(
+    batch: ProgressBatchIn,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    result = await db.run_sync(sync_progress, user_id, [item.model_dump() for item in batch.items])
+    completed_at = result.pop('completed_at')
+    if result['applied']:
+        # Synced changes can be backdated anywhere in the history, so recount instead of adjusting
+        await db.run_sync(rebuild_stats, user_id)
+        await db.run_sync(record_completions, user_id, completion_days(completed_at))
+    await db.commit()
+    await mark_write(user_id)
+    return result
 
 @app.get('/progress/{learning_path_id}', response_model=List[UserProgressOut], tags=['Progress'], summary="Get user progress for a learning path")
-def get_progress(
+async def get_progress(
     learning_path_id: int,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    user_id: int = Depends(get_current_user_id)
 ):
     # Check if learning path exists
-    learning_path = db.query(LearningPath).filter(LearningPath.id == learning_path_id).first()
+    learning_path = await db.get(LearningPath, learning_path_id)
     if not learning_path:
         raise HTTPException(status_code=404, detail="Learning path not found")
         
     # Get all progress records for this user and learning path
-    progress = db.query(UserProgress).filter(
-        UserProgress.user_id == user.id,
+    progress = (await db.execute(select(*schema_columns(UserProgress, UserProgressOut)).where(
+        UserProgress.user_id == user_id,
         UserProgress.learning_path_id == learning_path_id
-    ).all()
+    ))).all()
     
-    return progress 
\ No newline at end of file
+    return ORJSONResponse(row_dicts(progress))
+
+@app.get('/search', response_model=SearchPage, tags=['Search'], summary="Ranked full-text search over videos, skills and learning paths")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[str] = Query(None, description="Comma separated result types, e.g. skill,learning_path"),
+    cursor: Optional[int] = Query(None, ge=0, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_SEARCH_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db)
+):
+    kinds = parse_types(types)
+    items, next_cursor = await db.run_sync(search_catalog, q, kinds, cursor, limit)
+    return {'items': items, 'next_cursor': next_cursor}
+
+@app.get('/search/suggest', response_model=List[SuggestionOut], tags=['Search'], summary="Autocomplete skill, learning path and video names by prefix")
+async def suggest(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    types: Optional[str] = Query(None, description="Comma separated result types, e.g. skill,learning_path"),
+    limit: int = Query(DEFAULT_SUGGEST_LIMIT, ge=1, le=MAX_SUGGEST_LIMIT),
+):
+    # Answered from the in-process index, no database access
+    return suggest_index.suggest(prefix, parse_types(types), limit)
+
+@app.get('/admin/stats', response_model=AdminStatsOut, tags=['Admin'], summary="Catalog totals, completion funnel and the most started learning paths")
+async def get_admin_stats(
+    top: int = Query(DEFAULT_TOP_PATHS, ge=1, le=MAX_TOP_PATHS, description="Number of learning paths in top_paths"),
+    db: AsyncSession = Depends(get_read_db),
+    user_id: int = Depends(get_admin_user_id)
+):
+    # Read from the precomputed summaries, as of refreshed_at; the live tables are not scanned
+    return await db.run_sync(admin_stats, top)
+
+@app.get('/metrics', tags=['Monitoring'], summary="In-process cache and pool statistics")
+async def get_metrics():
+    return {
+        'cache': cache.stats(),
+        'youtube_metadata_store': metadata_cache.stats(),
+        'password_hashing': password_hasher.stats(),
+        'database_pools': pool_stats(),
+        'read_routing': routing_stats(),
+        'catalog_cache': catalog_cache.stats(),
+        'search_suggestions': suggest_index.stats(),
+        'admin_stats': summary_refresher.stats(),
+    }
@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from database import engine
+from models import VideoMetadataCache
+
+# Positive entries expire after a week, "not found" answers after a day
+YOUTUBE_CACHE_TTL = int(os.getenv('YOUTUBE_CACHE_TTL', 7 * 24 * 3600))
+YOUTUBE_NEGATIVE_CACHE_TTL = int(os.getenv('YOUTUBE_NEGATIVE_CACHE_TTL', 24 * 3600))
+
+
+class MetadataCache:
+    """Persistent tier of the YouTube metadata cache, the video_metadata_cache table.
+
+    The shared cache (cache.py, namespace 'youtube') sits in front of it;
+    this tier survives restarts and cache flushes so quota is never spent
+    twice on the same answer. A stored value of None is a negative entry:
+    YouTube answered but did not know the id (deleted, private or
+    mistyped), so it is not asked again until the negative TTL runs out.
+    """
+
+    def __init__(self, ttl: int, negative_ttl: int):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._stats = {'db_hits': 0, 'negative_hits': 0, 'misses': 0}
+
+    def ttl_for(self, payload: Optional[dict]) -> int:
+        return self.ttl if payload is not None else self.negative_ttl
+
+    def get_many(self, youtube_ids: List[str]) -> Tuple[Dict[str, Tuple[Optional[dict], float]], List[str]]:
+        """Split ids into stored values, with their seconds left to live, and ids that still need an API call."""
+        loaded = self._load(youtube_ids) if youtube_ids else {}
+        misses = [youtube_id for youtube_id in youtube_ids if youtube_id not in loaded]
+        with self._lock:
+            self._stats['db_hits'] += len(loaded)
+            self._stats['negative_hits'] += sum(1 for payload, _ in loaded.values() if payload is None)
+            self._stats['misses'] += len(misses)
+        return loaded, misses
+
+    def set_many(self, results: Dict[str, Optional[dict]]) -> None:
+        """Store API answers; None values are stored as negative entries."""
+        if not results:
+            return
+        now = time.time()
+        rows = []
+        for youtube_id, payload in results.items():
+            expires_at = now + self.ttl_for(payload)
+            rows.append({
+                'youtube_id': youtube_id,
+                'payload': json.dumps(payload) if payload is not None else None,
+                'fetched_at': datetime.utcfromtimestamp(now),
+                'expires_at': datetime.utcfromtimestamp(expires_at),
+            })
+        try:
+            with Session(engine) as session, session.begin():
+                session.execute(delete(VideoMetadataCache).where(VideoMetadataCache.youtube_id.in_(list(results))))
+                session.execute(insert(VideoMetadataCache), rows)
+        except SQLAlchemyError as e:
+            print(f"[WARN] Could not persist YouTube metadata cache: {e}")
+
+    def invalidate(self, youtube_ids: List[str]) -> None:
+        try:
+            with Session(engine) as session, session.begin():
+                session.execute(delete(VideoMetadataCache).where(VideoMetadataCache.youtube_id.in_(youtube_ids)))
+        except SQLAlchemyError as e:
+            print(f"[WARN] Could not invalidate YouTube metadata cache: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def _load(self, youtube_ids: List[str]) -> Dict[str, Tuple[Optional[dict], float]]:
+        now = datetime.utcnow()
+        try:
+            with Session(engine) as session:
+                rows = session.execute(
+                    select(VideoMetadataCache).where(
+                        VideoMetadataCache.youtube_id.in_(youtube_ids),
+                        VideoMetadataCache.expires_at > now,
+                    )
+                ).scalars().all()
+        except SQLAlchemyError as e:
+            print(f"[WARN] Could not read YouTube metadata cache: {e}")
+            return {}
+        return {
+            row.youtube_id: (
+                json.loads(row.payload) if row.payload is not None else None,
+                (row.expires_at - now).total_seconds(),
+            )
+            for row in rows
+        }
+
+
+metadata_cache = MetadataCache(YOUTUBE_CACHE_TTL, YOUTUBE_NEGATIVE_CACHE_TTL)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Date, DateTime, Text, Index
 from sqlalchemy.orm import declarative_base, relationship
 from sqlalchemy.sql import func
 
@@ -31,7 +31,7 @@ class Video(Base):
     description = Column(Text)
     duration_seconds = Column(Integer)
     quality_score = Column(String)
-    skill_id = Column(Integer, ForeignKey('skills.id'))
+    skill_id = Column(Integer, ForeignKey('skills.id'), index=True)
     difficulty = Column(String)
     published_at = Column(DateTime)
     skill = relationship('Skill', back_populates='videos')
@@ -43,9 +43,12 @@ class LearningPath(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
     description = Column(Text)
-    skill_id = Column(Integer, ForeignKey('skills.id'))
-    created_by = Column(Integer, ForeignKey('users.id'))
+    skill_id = Column(Integer, ForeignKey('skills.id'), index=True)
+    created_by = Column(Integer, ForeignKey('users.id'), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Kept up to date as videos are added (see learning_paths.py)
+    video_count = Column(Integer, nullable=False, default=0, server_default='0')
+    total_duration_seconds = Column(Integer, nullable=False, default=0, server_default='0')
     skill = relationship('Skill', back_populates='learning_paths')
     creator = relationship('User', back_populates='learning_paths')
     videos = relationship('LearningPathVideo', back_populates='learning_path')
@@ -53,6 +56,10 @@ class LearningPath(Base):
 
 class LearningPathVideo(Base):
     __tablename__ = 'learning_path_videos'
+    __table_args__ = (
+        Index('uq_learning_path_videos_path_video', 'learning_path_id', 'video_id', unique=True),
+        Index('ix_learning_path_videos_path_order', 'learning_path_id', 'order'),
+    )
     id = Column(Integer, primary_key=True)
     learning_path_id = Column(Integer, ForeignKey('learning_paths.id'))
     video_id = Column(Integer, ForeignKey('videos.id'))
@@ -62,12 +69,84 @@ class LearningPathVideo(Base):
 
 class UserProgress(Base):
     __tablename__ = 'user_progress'
+    __table_args__ = (
+        # Also serves lookups by user_id and by (user_id, learning_path_id)
+        Index('uq_user_progress_user_path_video', 'user_id', 'learning_path_id', 'video_id', unique=True),
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'))
     learning_path_id = Column(Integer, ForeignKey('learning_paths.id'))
     video_id = Column(Integer, ForeignKey('videos.id'))
     completed = Column(Boolean, default=False)
     completed_at = Column(DateTime)
+    updated_at = Column(DateTime)  # when the client made the change, used for last-writer-wins
     user = relationship('User', back_populates='progress')
     learning_path = relationship('LearningPath', back_populates='progress')
-    video = relationship('Video', back_populates='progress') 
\ No newline at end of file
+    video = relationship('Video', back_populates='progress') 
+
+class Job(Base):
+    __tablename__ = 'jobs'
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    status = Column(String, nullable=False, default='pending')  # pending, running, completed, failed
+    payload = Column(Text)  # JSON job input, e.g. youtube ids or a playlist id
+    total = Column(Integer, nullable=False, default=0)
+    created_count = Column(Integer, nullable=False, default=0)
+    existing_count = Column(Integer, nullable=False, default=0)
+    not_found_count = Column(Integer, nullable=False, default=0)
+    failed_count = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    created_by = Column(Integer, ForeignKey('users.id'))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    # The process running the job holds a lease it renews; once it expires another process may take over
+    lease_token = Column(String)
+    lease_expires_at = Column(DateTime)
+
+class VideoMetadataCache(Base):
+    __tablename__ = 'video_metadata_cache'
+    youtube_id = Column(String, primary_key=True)
+    payload = Column(Text)  # JSON metadata, NULL marks a negative entry
+    fetched_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+class RefreshToken(Base):
+    __tablename__ = 'refresh_tokens'
+    id = Column(Integer, primary_key=True)
+    token_hash = Column(String, unique=True, nullable=False)  # SHA-256 of the token, the token itself is never stored
+    family_id = Column(String, nullable=False, index=True)  # shared by all tokens rotated from one login
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime)
+
+class CatalogRevision(Base):
+    __tablename__ = 'catalog_revisions'
+    name = Column(String, primary_key=True)  # table whose contents the revision tracks
+    revision = Column(Integer, nullable=False, default=0)
+
+class UserAchievementStats(Base):
+    __tablename__ = 'user_achievement_stats'
+    # Running counters per user, updated with every progress change (see achievements.py)
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    videos_completed = Column(Integer, nullable=False, default=0)
+    paths_completed = Column(Integer, nullable=False, default=0)
+    skills_covered = Column(Integer, nullable=False, default=0)
+    current_streak = Column(Integer, nullable=False, default=0)  # consecutive days ending on last_active_on
+    longest_streak = Column(Integer, nullable=False, default=0)
+    last_active_on = Column(Date)  # UTC day of the latest completion
+    earned = Column(Text, nullable=False, default='{}')  # JSON {achievement code: ISO time it was earned}
+
+class UserSkillProgress(Base):
+    __tablename__ = 'user_skill_progress'
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    skill_id = Column(Integer, ForeignKey('skills.id'), primary_key=True)
+    completed_videos = Column(Integer, nullable=False, default=0)
+
+class UserDailyActivity(Base):
+    __tablename__ = 'user_daily_activity'
+    # Completions per user and UTC day, added to as progress is written (see activity.py)
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    day = Column(Date, primary_key=True)
+    completed_videos = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,46 @@
+from typing import Any, Iterable, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+async def paginate(db: AsyncSession, stmt: Select, id_column, cursor: Optional[int], limit: int, scalars: bool = True) -> Tuple[List[Any], Optional[int]]:
+    """Keyset pagination on an ascending integer id.
+
+    `cursor` is the last id of the previous page. One extra row is fetched to
+    know whether another page exists, so no COUNT query is needed and the cost
+    of a page does not grow with how deep into the table it is. With
+    `scalars=False` the rows are returned as-is, for column projections.
+    """
+    if cursor is not None:
+        stmt = stmt.where(id_column > cursor)
+    result = await db.execute(stmt.order_by(id_column).limit(limit + 1))
+    rows = list(result.scalars() if scalars else result.all())
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1].id
+    return rows, None
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """Parse a comma separated `fields=` projection; `id` is always included."""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(['id'] + requested))
+
+def parse_ids(ids: Optional[str]) -> Optional[List[int]]:
+    """Parse a comma separated `ids=` filter, at most one page's worth."""
+    if not ids:
+        return None
+    try:
+        parsed = list(dict.fromkeys(int(value) for value in ids.split(',') if value.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma separated integers")
+    if len(parsed) > MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_PAGE_SIZE} ids")
+    return parsed
@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import deque
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Checkout wait samples kept per pool for the percentiles in /metrics
+WAIT_SAMPLES = 1000
+
+
+class PoolMetrics:
+    """Checkout wait times and connection churn for one engine's pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._waits.append(seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def watch(self, pool) -> None:
+        @event.listens_for(pool, 'connect')
+        def _connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connects += 1
+
+        # Also fires when pre-ping finds a connection the server already closed
+        @event.listens_for(pool, 'invalidate')
+        def _invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+    def stats(self, pool) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            stats = {'timeouts': self.timeouts, 'connects': self.connects, 'invalidations': self.invalidations}
+        if isinstance(pool, QueuePool):
+            stats.update({
+                'size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'idle': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0),
+                'max_overflow': pool._max_overflow,
+            })
+        if waits:
+            def pick(q):
+                return round(waits[min(len(waits) - 1, int(q * len(waits)))] * 1000, 2)
+            stats['wait'] = {'count': len(waits), 'p50_ms': pick(0.5), 'p95_ms': pick(0.95), 'max_ms': pick(1.0)}
+        else:
+            stats['wait'] = {'count': 0}
+        return stats
+
+
+class _TimedCheckoutMixin:
+    """Times every checkout, including waiting for a free slot and pre-ping."""
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - started)
+
+
+def timed_pool_class(base, metrics: PoolMetrics):
+    """A QueuePool / AsyncAdaptedQueuePool subclass reporting into `metrics`."""
+    return type(f'Timed{base.__name__}', (_TimedCheckoutMixin, base), {'metrics': metrics})
+
@@ -0,0 +1,147 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import DateTime, Boolean, Integer, and_, exists, literal, or_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from models import LearningPathVideo, UserProgress
+
+PROGRESS_KEY = ['user_id', 'learning_path_id', 'video_id']
+
+def dialect_insert(db: Session, table):
+    """INSERT construct with ON CONFLICT support for the session's database."""
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert(table)
+    if dialect == 'sqlite':
+        return sqlite.insert(table)
+    raise NotImplementedError(f"Upserts are not supported on {dialect}")
+
+def upsert_progress(db: Session, user_id: int, learning_path_id: int, video_id: int, completed: bool) -> Tuple[Optional[Row], bool]:
+    """Insert or update one progress row.
+
+    The row is only inserted when the video belongs to the learning path
+    (checked with EXISTS in the same INSERT ... SELECT), and an existing row
+    is only rewritten when `completed` actually changes. Returns the written
+    row, or None when nothing was written because the video is not part of
+    the path or the progress already had this state, and whether the
+    video's completion flipped. A new row that isn't completed is written
+    without being a change, so un-completing goes through an UPDATE of a
+    completed row first and only inserts when there is none.
+    """
+    table = UserProgress.__table__
+    now = datetime.utcnow()
+    key = (table.c.user_id == user_id, table.c.learning_path_id == learning_path_id, table.c.video_id == video_id)
+    if not completed:
+        row = db.execute(
+            update(table).where(*key, table.c.completed.is_(True))
+            .values(completed=False, completed_at=None, updated_at=now)
+            .returning(*table.c)
+        ).first()
+        if row is not None:
+            return row, True
+    values = select(
+        literal(user_id, Integer),
+        literal(learning_path_id, Integer),
+        literal(video_id, Integer),
+        literal(completed, Boolean),
+        literal(now if completed else None, DateTime),
+        literal(now, DateTime),
+    ).where(
+        exists().where(
+            LearningPathVideo.learning_path_id == learning_path_id,
+            LearningPathVideo.video_id == video_id,
+        )
+    )
+    stmt = dialect_insert(db, table).from_select(PROGRESS_KEY + ['completed', 'completed_at', 'updated_at'], values)
+    if completed:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=PROGRESS_KEY,
+            set_={'completed': stmt.excluded.completed, 'completed_at': stmt.excluded.completed_at, 'updated_at': stmt.excluded.updated_at},
+            where=table.c.completed.is_distinct_from(stmt.excluded.completed),
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=PROGRESS_KEY)
+    row = db.execute(stmt.returning(*table.c)).first()
+    # Completing always flips; an un-completed row that was only inserted doesn't
+    return row, row is not None and completed
+
+def sync_progress(db: Session, user_id: int, items: List[dict]) -> dict:
+    """Apply a batch of client progress changes with last-writer-wins.
+
+    `items` hold learning_path_id, video_id, completed and client_timestamp.
+    Several changes to the same video collapse to the newest one, membership
+    of every pair is checked with one query, and the survivors are written
+    with multi-row upserts that only overwrite rows whose stored updated_at
+    is older than the client's timestamp. Newer changes that repeat the
+    stored state count as `unchanged` rather than `applied` and keep the
+    row's completed_at. The result also lists the completed_at of every
+    video whose completion went from false to true.
+    """
+    now = datetime.utcnow()
+    latest: Dict[Tuple[int, int], dict] = {}
+    for item in items:
+        timestamp = item['client_timestamp']
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        # A client clock running ahead must not pin rows against later writes
+        timestamp = min(timestamp, now)
+        key = (item['learning_path_id'], item['video_id'])
+        if key not in latest or timestamp >= latest[key]['updated_at']:
+            latest[key] = {
+                'user_id': user_id,
+                'learning_path_id': key[0],
+                'video_id': key[1],
+                'completed': item['completed'],
+                'completed_at': timestamp if item['completed'] else None,
+                'updated_at': timestamp,
+            }
+
+    members = {
+        tuple(row) for row in
+        db.query(LearningPathVideo.learning_path_id, LearningPathVideo.video_id)
+        .filter(tuple_(LearningPathVideo.learning_path_id, LearningPathVideo.video_id).in_(list(latest)))
+        .all()
+    }
+    rows = [row for key, row in latest.items() if key in members]
+    rejected = [list(key) for key in latest if key not in members]
+
+    applied = unchanged = 0
+    completed_at = []
+    if rows:
+        table = UserProgress.__table__
+
+        def newer(stmt):
+            return or_(table.c.updated_at.is_(None), table.c.updated_at < stmt.excluded.updated_at)
+
+        # Rows that are new or whose completion flips: the only completions to count
+        stmt = dialect_insert(db, table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=PROGRESS_KEY,
+            set_={
+                'completed': stmt.excluded.completed,
+                'completed_at': stmt.excluded.completed_at,
+                'updated_at': stmt.excluded.updated_at,
+            },
+            where=and_(newer(stmt), table.c.completed.is_distinct_from(stmt.excluded.completed)),
+        ).returning(table.c.completed, table.c.completed_at)
+        written = db.execute(stmt).all()
+        # Newer writes repeating the stored state only move updated_at, so older
+        # writes arriving later still lose; completed_at keeps the first completion
+        refresh = dialect_insert(db, table).values(rows)
+        refresh = refresh.on_conflict_do_update(
+            index_elements=PROGRESS_KEY,
+            set_={'updated_at': refresh.excluded.updated_at},
+            where=newer(refresh),
+        ).returning(table.c.id)
+        applied = len(written)
+        unchanged = len(db.execute(refresh).all())
+        completed_at = [row.completed_at for row in written if row.completed]
+
+    return {
+        'applied': applied,
+        'unchanged': unchanged,
+        'stale': len(rows) - applied - unchanged,
+        'rejected': rejected,
+        'completed_at': completed_at,
+    }
@@ -0,0 +1,80 @@
+import hashlib
+import os
+import secrets
+from datetime import datetime, timedelta
+from typing import Tuple
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from models import RefreshToken, User
+
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv('REFRESH_TOKEN_EXPIRE_DAYS', 30))
+
+def _hash_token(token: str) -> str:
+    # Tokens are 256 random bits, so a fast hash is enough; bcrypt would defeat the point
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def _invalid_refresh_token():
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired refresh token")
+
+def _add_token(db: Session, user_id: int, family_id: str, now: datetime) -> str:
+    token = secrets.token_urlsafe(32)
+    db.add(RefreshToken(
+        token_hash=_hash_token(token),
+        family_id=family_id,
+        user_id=user_id,
+        created_at=now,
+        expires_at=now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return token
+
+def issue_refresh_token(db: Session, user_id: int) -> str:
+    """Start a new token family for a password login."""
+    now = datetime.utcnow()
+    # Expired tokens of this user are no longer useful, even for reuse detection
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == user_id, RefreshToken.expires_at < now
+    ).delete(synchronize_session=False)
+    token = _add_token(db, user_id, secrets.token_hex(16), now)
+    db.commit()
+    return token
+
+def rotate_refresh_token(db: Session, token: str) -> Tuple[User, str]:
+    """Exchange a refresh token for the user it belongs to and its successor.
+
+    Every token can be used once. Presenting one that was already rotated
+    means it leaked (or the client is replaying it), so the whole family is
+    revoked and the user has to log in with their password again.
+    """
+    now = datetime.utcnow()
+    row = db.query(RefreshToken).filter(RefreshToken.token_hash == _hash_token(token)).first()
+    if row is None or row.expires_at <= now:
+        raise _invalid_refresh_token()
+    if row.revoked_at is not None:
+        print(f"[WARN] Refresh token reuse for user {row.user_id}, revoking token family {row.family_id}")
+        _revoke_family(db, row.family_id, now)
+        raise _invalid_refresh_token()
+
+    # Conditional update so two concurrent refreshes can't both rotate the same token
+    claimed = db.query(RefreshToken).filter(
+        RefreshToken.id == row.id, RefreshToken.revoked_at.is_(None)
+    ).update({'revoked_at': now}, synchronize_session=False)
+    user = db.get(User, row.user_id) if claimed else None
+    if user is None:
+        db.rollback()
+        raise _invalid_refresh_token()
+    new_token = _add_token(db, user.id, row.family_id, now)
+    db.commit()
+    db.refresh(user)
+    return user, new_token
+
+def revoke_refresh_token(db: Session, token: str) -> None:
+    """Log out: revoke the token's family so none of its tokens can be used again."""
+    row = db.query(RefreshToken).filter(RefreshToken.token_hash == _hash_token(token)).first()
+    if row is not None:
+        _revoke_family(db, row.family_id, datetime.utcnow())
+
+def _revoke_family(db: Session, family_id: str, now: datetime) -> None:
+    db.query(RefreshToken).filter(
+        RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None)
+    ).update({'revoked_at': now}, synchronize_session=False)
+    db.commit()
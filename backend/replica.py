@@ -0,0 +1,30 @@
+import os
+from typing import Optional
+from fastapi import Depends
+from auth import get_optional_user_id
+from cache import MISSING, cache
+from database import DATABASE_READ_URL, open_session
+
+# After a write, that user's reads stay on the primary for this long, which
+# should comfortably cover replication lag
+READ_AFTER_WRITE_SECONDS = float(os.getenv('READ_AFTER_WRITE_SECONDS', 5))
+
+# Kept in the shared cache so that with the redis backend the window holds
+# whichever worker serves the user's next request
+recent_writers = cache.namespace('recent_writes', READ_AFTER_WRITE_SECONDS)
+_routing = {'replica': 0, 'primary': 0}
+
+async def mark_write(user_id: int) -> None:
+    """Pin the user's reads to the primary for READ_AFTER_WRITE_SECONDS."""
+    if DATABASE_READ_URL:
+        await recent_writers.set(user_id, True)
+
+async def get_read_db(user_id: Optional[int] = Depends(get_optional_user_id)):
+    """Session for read-only routes: the replica, unless the caller wrote recently."""
+    replica = bool(DATABASE_READ_URL) and not (user_id is not None and await recent_writers.get(user_id) is not MISSING)
+    _routing['replica' if replica else 'primary'] += 1
+    async with open_session(replica=replica) as db:
+        yield db
+
+def routing_stats() -> dict:
+    return {'replica_configured': bool(DATABASE_READ_URL), 'replica_reads': _routing['replica'], 'primary_reads': _routing['primary']}
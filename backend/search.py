@@ -0,0 +1,142 @@
+import html
+import re
+from typing import List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import cast, column, func, literal, literal_column, select, table, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from models import LearningPath, Skill, Video
+
+# Result type -> (model, title column). Every model is searched on its title
+# and description; the index structures are created by the migration
+# c4d8e1f3a5b7: a generated tsvector column with a GIN index on PostgreSQL,
+# an FTS5 table kept in sync by triggers on SQLite
+SEARCH_SOURCES = {
+    'video': (Video, Video.title),
+    'skill': (Skill, Skill.name),
+    'learning_path': (LearningPath, LearningPath.name),
+}
+# Must match the configuration the tsvector columns were generated with
+SEARCH_LANGUAGE = 'english'
+DEFAULT_SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_TERMS = 10
+SNIPPET_START, SNIPPET_STOP = '<mark>', '</mark>'
+# FTS5 counterpart of the 'A' / 'B' weights of the tsvector columns
+SQLITE_TITLE_WEIGHT = 2.5
+
+def fts_table_name(model) -> str:
+    return f'{model.__tablename__}_fts'
+
+FTS_TABLES = [fts_table_name(model) for model, _ in SEARCH_SOURCES.values()]
+
+def is_search_object(type_: str, name: str) -> bool:
+    """Whether a database object belongs to the search index rather than the models (for Alembic autogenerate)."""
+    if type_ == 'table':
+        # The FTS5 table and its shadow tables, e.g. videos_fts_data
+        return any(name == fts or name.startswith(f'{fts}_') for fts in FTS_TABLES)
+    if type_ == 'column':
+        return name == 'search_vector'
+    if type_ == 'index':
+        return name is not None and name.endswith('_search_vector')
+    return False
+
+def parse_types(types: Optional[str]) -> List[str]:
+    """Parse a comma separated `types=` filter; all result types when empty."""
+    if not types:
+        return list(SEARCH_SOURCES)
+    requested = [kind.strip() for kind in types.split(',') if kind.strip()]
+    unknown = sorted(set(requested) - set(SEARCH_SOURCES))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown types: {', '.join(unknown)}")
+    return list(dict.fromkeys(requested))
+
+def search_terms(query: str) -> List[str]:
+    """Words of the user's query. Operators and quotes are dropped so any input is a valid query."""
+    return re.findall(r'[^\W_]+', query.lower())[:MAX_SEARCH_TERMS]
+
+def search_catalog(db: Session, query: str, kinds: List[str], cursor: Optional[int], limit: int) -> Tuple[List[dict], Optional[int]]:
+    """One page of videos, skills and learning paths matching every word of `query`, best match first.
+
+    The last word also matches as a prefix, so results show up while the
+    user is still typing. Results are ordered by rank rather than id, so
+    the cursor is an offset into the ranking. Snippets are excerpts of the
+    description, HTML-escaped, with the matched words wrapped in <mark>
+    tags.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return [], None
+    offset = cursor or 0
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        stmt = _postgres_search(terms, kinds, offset, limit + 1)
+    elif dialect == 'sqlite':
+        stmt = _sqlite_search(terms, kinds, offset, limit + 1)
+    else:
+        raise NotImplementedError(f"Search is not supported on {dialect}")
+    rows = [_result(row) for row in db.execute(stmt)]
+    if len(rows) > limit:
+        return rows[:limit], offset + limit
+    return rows, None
+
+def _result(row: Row) -> dict:
+    result = row._asdict()
+    result['rank'] = round(float(result['rank']), 6)
+    if result['snippet']:
+        escaped = html.escape(result['snippet'], quote=False)
+        result['snippet'] = escaped.replace(html.escape(SNIPPET_START), SNIPPET_START).replace(html.escape(SNIPPET_STOP), SNIPPET_STOP)
+    else:
+        result['snippet'] = None
+    return result
+
+def _ranked_page(branches, offset: int, limit: int):
+    matches = union_all(*branches).subquery('matches')
+    return select(matches).order_by(matches.c.rank.desc(), matches.c.type, matches.c.id).offset(offset).limit(limit).subquery('page')
+
+def _postgres_search(terms: List[str], kinds: List[str], offset: int, limit: int):
+    config = cast(SEARCH_LANGUAGE, REGCONFIG)
+    tsquery = func.to_tsquery(config, ' & '.join(terms[:-1] + [f'{terms[-1]}:*']))
+    branches = []
+    for kind in kinds:
+        model, title = SEARCH_SOURCES[kind]
+        vector = literal_column(f'{model.__tablename__}.search_vector')
+        branches.append(
+            select(
+                literal(kind).label('type'),
+                model.id.label('id'),
+                title.label('title'),
+                func.ts_rank_cd(vector, tsquery).label('rank'),
+                model.description.label('description'),
+            ).where(vector.op('@@')(tsquery))
+        )
+    page = _ranked_page(branches, offset, limit)
+    # ts_headline re-parses the text, so it only runs for the rows on the page
+    options = f'StartSel={SNIPPET_START}, StopSel={SNIPPET_STOP}, MaxWords=30, MinWords=10, MaxFragments=2, FragmentDelimiter=" … "'
+    return select(
+        page.c.type,
+        page.c.id,
+        page.c.title,
+        page.c.rank,
+        func.ts_headline(config, page.c.description, tsquery, options).label('snippet'),
+    ).order_by(page.c.rank.desc(), page.c.type, page.c.id)
+
+def _sqlite_search(terms: List[str], kinds: List[str], offset: int, limit: int):
+    match = ' '.join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+    branches = []
+    for kind in kinds:
+        model, title = SEARCH_SOURCES[kind]
+        fts = table(fts_table_name(model), column('rowid'))
+        fts_ref = literal_column(fts.name)
+        branches.append(
+            select(
+                literal(kind).label('type'),
+                model.id.label('id'),
+                title.label('title'),
+                # bm25 is lower-is-better
+                (-func.bm25(fts_ref, SQLITE_TITLE_WEIGHT, 1.0)).label('rank'),
+                func.snippet(fts_ref, 1, SNIPPET_START, SNIPPET_STOP, '…', 24).label('snippet'),
+            ).select_from(fts.join(model, model.id == fts.c.rowid)).where(fts_ref.op('MATCH')(match))
+        )
+    page = _ranked_page(branches, offset, limit)
+    return select(page).order_by(page.c.rank.desc(), page.c.type, page.c.id)
@@ -3,9 +3,12 @@
 Script to seed the database with 10 well-researched skills and learning paths
 with comprehensive videos and detailed content.
 """
+from alembic import command
+from alembic.config import Config
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
-from models import Base, Skill, LearningPath, LearningPathVideo, Video, User, UserProgress
+from models import Skill, LearningPath, LearningPathVideo, Video, User, UserProgress
+from learning_paths import refresh_totals
 import os
 from dotenv import load_dotenv
 from datetime import datetime
@@ -33,6 +36,15 @@ SKILLS_DATA = {
     "DevOps": "A set of practices that combines software development and IT operations to shorten the systems development life cycle."
 }
 
+def migrate_database():
+    """Create or upgrade the schema with the Alembic migrations, as `alembic upgrade head` does.
+
+    Base.metadata.create_all would leave out the objects only the migrations
+    create (the search index, the admin summaries) and an unversioned
+    database that `alembic upgrade head` can't be run against later.
+    """
+    command.upgrade(Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'alembic.ini')), 'head')
+
 def clear_database():
     """Clear all data from the database tables in correct order to avoid constraint violations."""
     db = SessionLocal()
@@ -40,6 +52,10 @@ def clear_database():
         print("Clearing existing data from database...")
         # Delete in reverse order of dependencies
         db.execute(text("DELETE FROM user_progress"))
+        # Achievement counters and the activity rollup are derived from the progress
+        db.execute(text("DELETE FROM user_skill_progress"))
+        db.execute(text("DELETE FROM user_achievement_stats"))
+        db.execute(text("DELETE FROM user_daily_activity"))
         db.execute(text("DELETE FROM learning_path_videos"))
         db.execute(text("DELETE FROM videos"))
         db.execute(text("DELETE FROM learning_paths"))
@@ -922,6 +938,8 @@ def seed_database():
         for assoc in path_video_associations:
             db.add(assoc)
         
+        db.commit()
+        refresh_totals(db)
         db.commit()
         print(f"Added {len(path_video_associations)} video associations to learning paths")
         
@@ -936,7 +954,6 @@ def seed_database():
 
 
 if __name__ == "__main__":
-    # Create tables if they don't exist
-    Base.metadata.create_all(bind=engine)
+    migrate_database()
     seed_database()
     print("Seed script completed successfully!")
@@ -0,0 +1,172 @@
+import asyncio
+import os
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import distinct, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from database import engine
+from models import LearningPath, Skill, UserProgress, Video
+
+# The index is per process; a periodic rebuild picks up entries created
+# through other workers and refreshes the popularity weights
+SUGGEST_REFRESH_SECONDS = float(os.getenv('SUGGEST_REFRESH_SECONDS', 300))
+DEFAULT_SUGGEST_LIMIT = 8
+MAX_SUGGEST_LIMIT = 20
+# Results for prefixes up to this long are memoized until the index changes;
+# they match so many entries that ranking them on every keystroke adds up
+SHORT_PREFIX = 2
+
+Ref = Tuple[str, int]  # (type, id)
+
+def normalize(text: str) -> str:
+    """Lowercased words without accents, separated by single spaces."""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(re.findall(r'[^\W_]+', text.casefold()))
+
+def index_keys(label: str) -> List[str]:
+    """The label from each of its words on, so a prefix can match any word."""
+    words = normalize(label).split(' ')
+    return [' '.join(words[i:]) for i in range(len(words)) if words[i]]
+
+
+class SuggestIndex:
+    """In-memory prefix index over skill names, learning path names and video titles.
+
+    Every suffix of a label starting at a word boundary is kept in one
+    sorted list, so the entries matching a prefix are a contiguous range
+    found with two binary searches. Matches are ranked by popularity (the
+    number of distinct learners with progress on the entry), then by
+    whether the prefix matched the start of the label.
+    """
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._keys: List[str] = []
+        self._refs: List[Tuple[str, int, bool]] = []  # (type, id, key is the whole label)
+        self._entries: Dict[Ref, Tuple[str, int]] = {}  # ref -> (label, popularity)
+        # Entries added while a rebuild is loading, which its snapshot may miss
+        self._added_during_rebuild: Dict[Ref, Tuple[str, int]] = {}
+        self._short: Dict[Tuple[str, Tuple[str, ...]], List[dict]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, kind: str, id: int, label: Optional[str], popularity: int = 0) -> None:
+        """Index a newly committed entry; entries already indexed are left alone."""
+        if not label:
+            return
+        ref = (kind, id)
+        with self._lock:
+            if ref in self._entries:
+                return
+            self._entries[ref] = (label, popularity)
+            self._added_during_rebuild[ref] = (label, popularity)
+            for i, key in enumerate(index_keys(label)):
+                position = bisect_right(self._keys, key)
+                self._keys.insert(position, key)
+                self._refs.insert(position, (kind, id, i == 0))
+            self._short.clear()
+
+    def add_many(self, kind: str, rows: Iterable[Tuple[int, Optional[str]]]) -> None:
+        for id, label in rows:
+            self.add(kind, id, label)
+
+    def replace(self, entries: Dict[Ref, Tuple[str, int]]) -> None:
+        """Swap in a freshly built index."""
+        with self._lock:
+            for ref, entry in self._added_during_rebuild.items():
+                entries.setdefault(ref, entry)
+            self._added_during_rebuild = {}
+        pairs = sorted(
+            (key, (kind, id, i == 0))
+            for (kind, id), (label, _) in entries.items()
+            for i, key in enumerate(index_keys(label))
+        )
+        with self._lock:
+            self._keys = [key for key, _ in pairs]
+            self._refs = [ref for _, ref in pairs]
+            self._entries = entries
+            self._short.clear()
+
+    def suggest(self, prefix: str, kinds: Iterable[str], limit: int) -> List[dict]:
+        key = normalize(prefix)
+        if not key:
+            return []
+        kinds = tuple(sorted(kinds))
+        memo = (key, kinds)
+        with self._lock:
+            if memo in self._short:
+                return self._short[memo][:limit]
+            start = bisect_left(self._keys, key)
+            # Sorts after any character a matching key can continue with
+            end = bisect_left(self._keys, key + '\uffff', lo=start)
+            matches: Dict[Ref, bool] = {}
+            for kind, id, whole_label in self._refs[start:end]:
+                if kind in kinds:
+                    matches[(kind, id)] = matches.get((kind, id), False) or whole_label
+            entries = self._entries
+            ranked = sorted(matches, key=lambda ref: (-entries[ref][1], not matches[ref], entries[ref][0]))
+            results = [{'type': kind, 'id': id, 'label': entries[(kind, id)][0]} for kind, id in ranked[:MAX_SUGGEST_LIMIT]]
+            if len(key) <= SHORT_PREFIX:
+                self._short[memo] = results
+        return results[:limit]
+
+    async def rebuild(self) -> None:
+        with self._lock:
+            self._added_during_rebuild = {}
+        try:
+            entries = await asyncio.to_thread(_load_entries)
+        except SQLAlchemyError as e:
+            print(f"[WARN] Could not build the search suggestion index: {e}")
+            return
+        self.replace(entries)
+
+    async def start(self) -> None:
+        await self.rebuild()
+        if self.refresh_seconds > 0 and self._task is None:
+            self._task = asyncio.create_task(self._refresh())
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _refresh(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            await self.rebuild()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'keys': len(self._keys)}
+
+
+def _load_entries() -> Dict[Ref, Tuple[str, int]]:
+    learners = func.count(distinct(UserProgress.user_id))
+    queries = {
+        'skill': select(Skill.id, Skill.name, learners)
+            .outerjoin(LearningPath, LearningPath.skill_id == Skill.id)
+            .outerjoin(UserProgress, UserProgress.learning_path_id == LearningPath.id)
+            .group_by(Skill.id, Skill.name),
+        'learning_path': select(LearningPath.id, LearningPath.name, learners)
+            .outerjoin(UserProgress, UserProgress.learning_path_id == LearningPath.id)
+            .group_by(LearningPath.id, LearningPath.name),
+        'video': select(Video.id, Video.title, learners)
+            .outerjoin(UserProgress, UserProgress.video_id == Video.id)
+            .group_by(Video.id, Video.title),
+    }
+    entries = {}
+    with Session(engine) as db:
+        for kind, stmt in queries.items():
+            for id, label, popularity in db.execute(stmt):
+                if label:
+                    entries[(kind, id)] = (label, popularity)
+    return entries
+
+
+suggest_index = SuggestIndex(SUGGEST_REFRESH_SECONDS)
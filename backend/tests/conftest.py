@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Configure a throwaway SQLite database before the app modules read their settings
+_db_dir = tempfile.mkdtemp(prefix='skillcrawler-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ['CACHE_BACKEND'] = 'memory'
+os.environ['SUGGEST_REFRESH_SECONDS'] = '0'
+os.environ['ADMIN_STATS_REFRESH_SECONDS'] = '0'
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+import database  # noqa: E402
+import replica as replica_routing  # noqa: E402
+from admin_stats import SUMMARIES  # noqa: E402
+from auth import create_access_token, user_claims  # noqa: E402
+from cache import cache  # noqa: E402
+from database import SessionLocal, async_database_url, engine  # noqa: E402
+from main import app  # noqa: E402
+from models import Base, LearningPath, LearningPathVideo, Skill, User, Video  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def schema():
+    """The schema built by the migrations, as in production, including the search index and admin summaries."""
+    command.upgrade(Config(os.path.join(BACKEND_DIR, 'alembic.ini')), 'head')
+
+
+@pytest.fixture
+def client(schema):
+    """The app on empty tables, with nothing left in the in-process caches."""
+    with engine.begin() as connection:
+        # Deleting through the tables also empties the search index, which triggers keep in sync
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+        for name in SUMMARIES:
+            connection.execute(text(f"DELETE FROM {name}"))
+    cache.backend._namespaces.clear()
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def replica(client, monkeypatch):
+    """A second SQLite database configured as the read replica; returns a sync engine for "replicating" rows to it."""
+    path = os.path.join(_db_dir, 'replica.db')
+    if os.path.exists(path):
+        os.remove(path)
+    url = f"sqlite:///{path}"
+    monkeypatch.setenv('DATABASE_URL', url)
+    command.upgrade(Config(os.path.join(BACKEND_DIR, 'alembic.ini')), 'head')
+    async_read_engine = create_async_engine(async_database_url(url))
+    monkeypatch.setattr(replica_routing, 'DATABASE_READ_URL', url)
+    monkeypatch.setattr(database, 'AsyncReadSessionLocal', async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False))
+    monkeypatch.setitem(database.ENGINES, 'async_read', async_read_engine)
+    replica_engine = create_engine(url)
+    yield replica_engine
+    replica_engine.dispose()
+
+
+@pytest.fixture
+def db(client):
+    with SessionLocal() as session:
+        yield session
+
+
+def auth_headers(user: User) -> dict:
+    return {'Authorization': f"Bearer {create_access_token(data=user_claims(user))}"}
+
+
+def make_user(db, email: str = 'learner@example.com') -> User:
+    # Inserted directly, so the tests don't pay for bcrypt
+    user = User(email=email, password_hash='x', name='Learner')
+    db.add(user)
+    db.commit()
+    return user
+
+
+def make_path(db, user: User, videos: int, name: str = 'Path') -> LearningPath:
+    """A learning path in a new skill, with `videos` new videos in order."""
+    skill = Skill(name=f'{name} skill')
+    db.add(skill)
+    db.flush()
+    path = LearningPath(name=name, skill_id=skill.id, created_by=user.id, video_count=videos)
+    db.add(path)
+    db.flush()
+    for order in range(videos):
+        video = Video(youtube_id=f'{name}-{order}', title=f'{name} video {order}', description='', duration_seconds=60)
+        db.add(video)
+        db.flush()
+        db.add(LearningPathVideo(learning_path_id=path.id, video_id=video.id, order=order))
+    db.commit()
+    return path
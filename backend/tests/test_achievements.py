@@ -0,0 +1,55 @@
+from sqlalchemy import select
+from conftest import auth_headers, make_path, make_user
+from models import LearningPathVideo, UserAchievementStats, UserSkillProgress
+
+
+def set_progress(client, user, path_id: int, video_id: int, completed: bool):
+    response = client.post(
+        f'/progress?learning_path_id={path_id}',
+        json={'video_id': video_id, 'completed': completed},
+        headers=auth_headers(user),
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def path_video_ids(db, path_id: int) -> list:
+    return db.scalars(
+        select(LearningPathVideo.video_id).where(LearningPathVideo.learning_path_id == path_id).order_by(LearningPathVideo.order)
+    ).all()
+
+
+def test_uncompleting_an_untouched_video_leaves_counters_alone(client, db):
+    user = make_user(db)
+    path = make_path(db, user, videos=3)
+    first, second, third = path_video_ids(db, path.id)
+    set_progress(client, user, path.id, first, True)
+    set_progress(client, user, path.id, second, True)
+
+    # A new row that isn't completed is not an un-completion
+    progress = set_progress(client, user, path.id, third, False)
+    assert progress['completed'] is False
+
+    db.expire_all()
+    stats = db.get(UserAchievementStats, user.id)
+    assert stats.videos_completed == 2
+    assert db.scalar(select(UserSkillProgress.completed_videos).where(UserSkillProgress.user_id == user.id)) == 2
+    assert client.get('/me/achievements', headers=auth_headers(user)).json()['videos_completed'] == 2
+
+
+def test_uncompleting_a_completed_video_is_counted(client, db):
+    user = make_user(db)
+    path = make_path(db, user, videos=2)
+    first, second = path_video_ids(db, path.id)
+    set_progress(client, user, path.id, first, True)
+    set_progress(client, user, path.id, second, True)
+    assert client.get('/me/achievements', headers=auth_headers(user)).json()['paths_completed'] == 1
+
+    set_progress(client, user, path.id, second, False)
+    # Repeating the same state is not a second change
+    set_progress(client, user, path.id, second, False)
+
+    summary = client.get('/me/achievements', headers=auth_headers(user)).json()
+    assert summary['videos_completed'] == 1
+    assert summary['paths_completed'] == 0
+    assert summary['skills_covered'] == 1
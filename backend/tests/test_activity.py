@@ -0,0 +1,21 @@
+from datetime import datetime, timedelta
+from conftest import auth_headers, make_path, make_user
+from test_achievements import path_video_ids, set_progress
+
+
+def test_replayed_completion_is_counted_once(client, db):
+    user = make_user(db)
+    path = make_path(db, user, videos=1)
+    video_id, = path_video_ids(db, path.id)
+    set_progress(client, user, path.id, video_id, True)
+
+    # Each replay is newer than the stored row, so last-writer-wins lets it through
+    for minutes in (1, 2, 3):
+        timestamp = datetime.utcnow() + timedelta(minutes=minutes)
+        response = client.post('/progress/batch', json={'items': [{
+            'learning_path_id': path.id, 'video_id': video_id, 'completed': True, 'client_timestamp': timestamp.isoformat(),
+        }]}, headers=auth_headers(user))
+        assert response.status_code == 200
+
+    assert client.get('/me/activity', headers=auth_headers(user)).json()['completed_videos'] == 1
+    assert client.get('/me/achievements', headers=auth_headers(user)).json()['videos_completed'] == 1
@@ -0,0 +1,26 @@
+import asyncio
+import auth
+from admin_stats import summary_refresher
+from conftest import auth_headers, make_path, make_user
+from test_achievements import path_video_ids, set_progress
+
+
+def test_admin_stats_need_a_listed_user(client, db, monkeypatch):
+    admin = make_user(db, 'admin@example.com')
+    learner = make_user(db, 'learner@example.com')
+    monkeypatch.setattr(auth, 'ADMIN_USER_IDS', frozenset({admin.id}))
+    path = make_path(db, admin, videos=2)
+    first, _ = path_video_ids(db, path.id)
+    set_progress(client, learner, path.id, first, True)
+    asyncio.run(summary_refresher.refresh(force=True))
+
+    assert client.get('/admin/stats').status_code == 401
+    assert client.get('/admin/stats', headers=auth_headers(learner)).status_code == 403
+    response = client.get('/admin/stats', headers=auth_headers(admin))
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats['totals'] == {'users': 2, 'skills': 1, 'learning_paths': 1, 'videos': 2, 'completed_videos': 1}
+    assert [step['users'] for step in stats['funnel']] == [2, 1, 1, 0]
+    assert stats['top_paths'][0]['learning_path_id'] == path.id
+    assert stats['top_paths'][0]['started_learners'] == 1
+    assert stats['refreshed_at'] is not None
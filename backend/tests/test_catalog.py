@@ -0,0 +1,20 @@
+from conftest import make_path, make_user
+from models import Skill
+
+
+def test_lists_filter_by_ids(client, db):
+    user = make_user(db)
+    paths = [make_path(db, user, videos=0, name=f'Path {i}') for i in range(3)]
+    wanted = [paths[2].id, paths[0].id]
+
+    response = client.get('/learning-paths', params={'ids': ','.join(map(str, wanted))})
+    assert [path['id'] for path in response.json()['items']] == sorted(wanted)
+    response = client.get('/skills', params={'ids': str(paths[1].skill_id)})
+    assert [skill['name'] for skill in response.json()['items']] == ['Path 1 skill']
+    assert client.get('/skills', params={'ids': '1,x'}).status_code == 400
+
+
+def test_skill_categories(client, db):
+    db.add_all([Skill(name='Pandas', category='Data'), Skill(name='React', category='Web'), Skill(name='SQL', category='Data'), Skill(name='Misc')])
+    db.commit()
+    assert client.get('/skills/categories').json() == ['Data', 'Web']
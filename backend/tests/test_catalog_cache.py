@@ -0,0 +1,28 @@
+import asyncio
+from sqlalchemy import insert, update
+from catalog_cache import catalog_cache
+from conftest import auth_headers, make_user
+from models import CatalogRevision, Skill
+
+
+def skill_names(response) -> list:
+    assert response.status_code == 200
+    return [skill['name'] for skill in response.json()['items']]
+
+
+def test_lagging_replica_is_not_cached_under_primary_revisions(client, db, replica):
+    user = make_user(db)
+    created = client.post('/skills', json={'name': 'Rust'}, headers=auth_headers(user)).json()
+
+    # The writer's next read goes to the primary and loads its revisions; an
+    # anonymous reader then hits the replica, which hasn't caught up yet
+    assert client.get('/learning-paths', headers=auth_headers(user)).status_code == 200
+    assert skill_names(client.get('/skills')) == []
+
+    revision = db.get(CatalogRevision, 'skills').revision
+    with replica.begin() as connection:
+        connection.execute(insert(Skill).values(id=created['id'], name='Rust'))
+        connection.execute(update(CatalogRevision).where(CatalogRevision.name == 'skills').values(revision=revision))
+    # Once the revisions are read again the replica serves the new rows
+    asyncio.run(catalog_cache.invalidate_revisions())
+    assert skill_names(client.get('/skills')) == ['Rust']
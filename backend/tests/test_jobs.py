@@ -0,0 +1,50 @@
+import asyncio
+from datetime import datetime, timedelta
+import jobs
+from conftest import make_user
+from jobs import JobRunner, create_video_import_job
+from models import Job
+
+
+def finished_job(db, job_id: int) -> Job:
+    db.expire_all()
+    return db.get(Job, job_id)
+
+
+async def stub_import(youtube_ids):
+    await asyncio.sleep(0)
+    return {youtube_id: 'created' for youtube_id in youtube_ids}
+
+
+def test_job_runs_once_when_two_processes_pick_it_up(client, db, monkeypatch):
+    monkeypatch.setattr(jobs, '_import_videos', stub_import)
+    job = create_video_import_job(db, ['a', 'b', 'c'], None, make_user(db).id)
+
+    async def both():
+        # Two runners stand in for two worker processes resuming the same job
+        await asyncio.gather(JobRunner()._run(job.id), JobRunner()._run(job.id))
+    asyncio.run(both())
+
+    job = finished_job(db, job.id)
+    assert job.status == 'completed'
+    assert job.created_count == 3
+    assert job.lease_token is None
+
+
+def test_expired_lease_is_taken_over(client, db):
+    job = create_video_import_job(db, ['a'], None, make_user(db).id)
+    assert jobs._claim_job(job.id, 'first') == {'youtube_ids': ['a'], 'playlist_id': None}
+    assert jobs._claim_job(job.id, 'second') is None
+
+    db.query(Job).filter(Job.id == job.id).update({Job.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+    assert job.id in jobs._claimable_job_ids()
+    assert jobs._claim_job(job.id, 'second') is not None
+    # The first process lost the lease: its writes no longer count
+    assert jobs._renew_lease(job.id, 'first') is False
+    jobs._record_progress(job.id, 'first', {'a': 'created'})
+    assert finished_job(db, job.id).created_count == 0
+
+
+def test_deleted_job_is_skipped(client):
+    asyncio.run(JobRunner()._run(12345))
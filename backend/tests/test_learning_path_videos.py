@@ -0,0 +1,33 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from conftest import make_path, make_user
+from database import async_engine
+
+
+@contextmanager
+def recorded_statements():
+    """The SQL statements the request handlers run while the block executes."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def test_path_videos_are_listed_with_one_query(client, db):
+    user = make_user(db)
+    short = make_path(db, user, videos=1, name='Short')
+    long = make_path(db, user, videos=25, name='Long')
+    for path, videos in ((short, 1), (long, 25)):
+        with recorded_statements() as statements:
+            response = client.get(f'/learning-paths/{path.id}/videos')
+        assert response.status_code == 200
+        assert len(response.json()) == videos
+        # Everything but the catalog cache's revision lookup is the listing itself
+        listing = [statement for statement in statements if 'catalog_revisions' not in statement]
+        assert len(listing) == 1, listing
@@ -0,0 +1,53 @@
+from sqlalchemy import func, select
+from conftest import auth_headers, make_path, make_user
+from models import UserProgress
+from progress import upsert_progress
+from test_achievements import path_video_ids
+
+
+def progress_rows(db, user) -> int:
+    return db.scalar(select(func.count()).select_from(UserProgress).where(UserProgress.user_id == user.id))
+
+
+def test_repeated_completes_write_one_row(client, db):
+    user = make_user(db)
+    path = make_path(db, user, videos=1)
+    video_id, = path_video_ids(db, path.id)
+
+    row, changed = upsert_progress(db, user.id, path.id, video_id, True)
+    assert changed and row.completed and row.completed_at is not None
+    first_completed_at = row.completed_at
+    row, changed = upsert_progress(db, user.id, path.id, video_id, True)
+    assert row is None and not changed
+    db.commit()
+    assert progress_rows(db, user) == 1
+    assert db.scalar(select(UserProgress.completed_at)) == first_completed_at
+
+
+def test_uncompleting(client, db):
+    user = make_user(db)
+    path = make_path(db, user, videos=1)
+    video_id, = path_video_ids(db, path.id)
+    upsert_progress(db, user.id, path.id, video_id, True)
+
+    row, changed = upsert_progress(db, user.id, path.id, video_id, False)
+    assert changed and row.completed is False and row.completed_at is None
+    row, changed = upsert_progress(db, user.id, path.id, video_id, False)
+    assert not changed
+    db.commit()
+    assert progress_rows(db, user) == 1
+
+
+def test_video_outside_the_path_is_rejected(client, db):
+    user = make_user(db)
+    path = make_path(db, user, videos=1, name='Mine')
+    outside, = path_video_ids(db, make_path(db, user, videos=1, name='Other').id)
+
+    for completed in (True, False):
+        row, changed = upsert_progress(db, user.id, path.id, outside, completed)
+        assert row is None and not changed
+    db.commit()
+    assert progress_rows(db, user) == 0
+    response = client.post(f'/progress?learning_path_id={path.id}', json={'video_id': outside, 'completed': True}, headers=auth_headers(user))
+    assert response.status_code == 404
+    assert progress_rows(db, user) == 0
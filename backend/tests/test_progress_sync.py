@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from conftest import auth_headers, make_path, make_user
+from models import UserProgress
+from test_achievements import path_video_ids
+
+NOW = datetime.utcnow()
+
+
+def sync(client, user, *items):
+    response = client.post('/progress/batch', json={'items': [
+        {'learning_path_id': path_id, 'video_id': video_id, 'completed': completed, 'client_timestamp': timestamp.isoformat()}
+        for path_id, video_id, completed, timestamp in items
+    ]}, headers=auth_headers(user))
+    assert response.status_code == 200
+    return response.json()
+
+
+def stored(db, user, video_id: int) -> UserProgress:
+    db.expire_all()
+    return db.scalar(select(UserProgress).where(UserProgress.user_id == user.id, UserProgress.video_id == video_id))
+
+
+def test_newer_write_wins(client, db):
+    user = make_user(db)
+    path = make_path(db, user, videos=1)
+    video_id, = path_video_ids(db, path.id)
+    sync(client, user, (path.id, video_id, True, NOW - timedelta(hours=2)))
+
+    result = sync(client, user, (path.id, video_id, False, NOW - timedelta(hours=1)))
+    assert result == {'applied': 1, 'unchanged': 0, 'stale': 0, 'rejected': []}
+    assert stored(db, user, video_id).completed is False
+
+
+def test_stale_write_is_ignored(client, db):
+    user = make_user(db)
+    path = make_path(db, user, videos=1)
+    video_id, = path_video_ids(db, path.id)
+    sync(client, user, (path.id, video_id, True, NOW - timedelta(hours=1)))
+
+    result = sync(client, user, (path.id, video_id, False, NOW - timedelta(hours=2)))
+    assert result == {'applied': 0, 'unchanged': 0, 'stale': 1, 'rejected': []}
+    assert stored(db, user, video_id).completed is True
+
+
+def test_newer_write_of_the_same_state_keeps_completed_at(client, db):
+    user = make_user(db)
+    path = make_path(db, user, videos=1)
+    video_id, = path_video_ids(db, path.id)
+    first = NOW - timedelta(hours=2)
+    sync(client, user, (path.id, video_id, True, first))
+
+    result = sync(client, user, (path.id, video_id, True, NOW - timedelta(hours=1)))
+    assert result == {'applied': 0, 'unchanged': 1, 'stale': 0, 'rejected': []}
+    progress = stored(db, user, video_id)
+    assert progress.completed_at == first
+    assert progress.updated_at == NOW - timedelta(hours=1)
+
+    # The replay still counts for ordering: a write between the two loses
+    result = sync(client, user, (path.id, video_id, False, NOW - timedelta(minutes=90)))
+    assert result['stale'] == 1
+
+
+def test_video_outside_the_path_is_rejected(client, db):
+    user = make_user(db)
+    path = make_path(db, user, videos=1, name='Mine')
+    other = make_path(db, user, videos=1, name='Other')
+    outside, = path_video_ids(db, other.id)
+
+    result = sync(client, user, (path.id, outside, True, NOW))
+    assert result == {'applied': 0, 'unchanged': 0, 'stale': 0, 'rejected': [[path.id, outside]]}
+    assert stored(db, user, outside) is None
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+from conftest import make_user
+from models import RefreshToken
+from refresh_tokens import _hash_token, issue_refresh_token
+
+
+def refresh(client, token: str):
+    return client.post('/token/refresh', json={'refresh_token': token})
+
+
+def test_rotation_issues_a_new_token_and_retires_the_old_one(client, db):
+    token = issue_refresh_token(db, make_user(db).id)
+
+    response = refresh(client, token)
+    assert response.status_code == 200
+    body = response.json()
+    assert body['access_token']
+    assert body['refresh_token'] != token
+    assert refresh(client, body['refresh_token']).status_code == 200
+    assert refresh(client, token).status_code == 401
+
+
+def test_reusing_a_rotated_token_revokes_the_family(client, db):
+    user = make_user(db)
+    stolen = issue_refresh_token(db, user.id)
+    rotated = refresh(client, stolen).json()['refresh_token']
+    other_login = issue_refresh_token(db, user.id)
+
+    assert refresh(client, stolen).status_code == 401
+    # The legitimate successor of the reused token is revoked with it, other logins are not
+    assert refresh(client, rotated).status_code == 401
+    assert refresh(client, other_login).status_code == 200
+
+
+def test_expired_revoked_and_unknown_tokens_are_rejected(client, db):
+    user = make_user(db)
+    expired = issue_refresh_token(db, user.id)
+    db.query(RefreshToken).filter(RefreshToken.token_hash == _hash_token(expired)).update(
+        {RefreshToken.expires_at: datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+    assert refresh(client, expired).status_code == 401
+
+    logged_out = issue_refresh_token(db, user.id)
+    assert client.post('/token/revoke', json={'refresh_token': logged_out}).status_code == 204
+    assert refresh(client, logged_out).status_code == 401
+
+    assert refresh(client, 'not-a-token').status_code == 401
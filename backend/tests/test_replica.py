@@ -0,0 +1,55 @@
+import asyncio
+from sqlalchemy import insert
+from conftest import auth_headers, make_user
+from models import Skill
+from replica import recent_writers, routing_stats
+
+
+def skill_names(response) -> list:
+    assert response.status_code == 200
+    return [skill['name'] for skill in response.json()['items']]
+
+
+def routed(request) -> tuple:
+    """The response to `request` and which database served it, from the routing counters."""
+    before = routing_stats()
+    response = request()
+    after = routing_stats()
+    return response, 'replica' if after['replica_reads'] > before['replica_reads'] else 'primary'
+
+
+def test_reads_go_to_the_replica(client, db, replica):
+    with replica.begin() as connection:
+        connection.execute(insert(Skill).values(name='Only on the replica'))
+
+    response, database = routed(lambda: client.get('/skills'))
+    assert database == 'replica'
+    assert skill_names(response) == ['Only on the replica']
+
+
+def test_writer_is_pinned_to_the_primary_after_a_write(client, db, replica):
+    writer = make_user(db, 'writer@example.com')
+    other = make_user(db, 'other@example.com')
+    assert client.post('/skills', json={'name': 'Rust'}, headers=auth_headers(writer)).status_code == 200
+
+    response, database = routed(lambda: client.get('/skills', headers=auth_headers(writer)))
+    assert database == 'primary'
+    assert skill_names(response) == ['Rust']
+    # Only the writer is pinned; the replica hasn't caught up for anyone else
+    response, database = routed(lambda: client.get('/skills', headers=auth_headers(other)))
+    assert database == 'replica'
+    assert skill_names(response) == []
+
+    # Once the read-after-write window is over the writer reads from the replica again
+    asyncio.run(recent_writers.delete(writer.id))
+    assert routed(lambda: client.get('/skills', headers=auth_headers(writer)))[1] == 'replica'
+
+
+def test_reads_use_the_primary_without_a_replica(client, db):
+    user = make_user(db)
+    assert client.post('/skills', json={'name': 'Rust'}, headers=auth_headers(user)).status_code == 200
+    assert routing_stats()['replica_configured'] is False
+
+    response, database = routed(lambda: client.get('/skills'))
+    assert database == 'primary'
+    assert skill_names(response) == ['Rust']
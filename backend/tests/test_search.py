@@ -0,0 +1,20 @@
+from conftest import make_path, make_user
+from models import Video
+
+
+def test_search_ranks_across_types(client, db):
+    user = make_user(db)
+    path = make_path(db, user, videos=1, name='Kubernetes basics')
+    db.add(Video(youtube_id='k8s', title='Deploying to Kubernetes', description='Pods and services', duration_seconds=60))
+    db.commit()
+
+    response = client.get('/search', params={'q': 'kubernetes'})
+    assert response.status_code == 200
+    found = {(item['type'], item['title']) for item in response.json()['items']}
+    assert ('learning_path', 'Kubernetes basics') in found
+    assert ('video', 'Deploying to Kubernetes') in found
+
+    only_paths = client.get('/search', params={'q': 'kubernetes', 'types': 'learning_path'}).json()['items']
+    assert [item['id'] for item in only_paths] == [path.id]
+
+    assert client.get('/search', params={'q': 'nothingmatches'}).json()['items'] == []
@@ -0,0 +1,65 @@
+import httpx
+import youtube
+from conftest import auth_headers, make_user
+from models import VideoMetadataCache
+from youtube import YouTubeClient
+
+
+def stub_item(youtube_id: str) -> dict:
+    return {
+        'id': youtube_id,
+        'snippet': {'title': f'Video {youtube_id}', 'description': '', 'publishedAt': '2024-01-01T00:00:00Z'},
+        'contentDetails': {'duration': 'PT1M'},
+    }
+
+
+def stub_youtube(monkeypatch, fail_first: dict) -> list:
+    """Point the importer at a stub of videos.list; returns the ids of every request made.
+
+    `fail_first` maps the first id of a chunk to the status its first request gets.
+    """
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ids = request.url.params['id'].split(',')
+        requests.append(ids)
+        if ids[0] in fail_first and sum(1 for seen in requests if seen[0] == ids[0]) == 1:
+            return httpx.Response(fail_first[ids[0]])
+        return httpx.Response(200, json={'items': [stub_item(i) for i in ids if not i.startswith('missing')]})
+
+    monkeypatch.setattr(youtube, 'youtube_client', YouTubeClient(transport=httpx.MockTransport(handler), max_retries=2))
+    # No backoff jitter, so retries wait the minimum
+    monkeypatch.setattr(youtube.random, 'random', lambda: 0.0)
+    return requests
+
+
+def test_batch_fetch_requires_a_user(client):
+    response = client.post('/videos/fetch/batch', json={'youtube_ids': ['abc']})
+    assert response.status_code == 401
+
+
+def test_batch_fetch_takes_at_most_1000_ids(client, db):
+    headers = auth_headers(make_user(db))
+    response = client.post('/videos/fetch/batch', json={'youtube_ids': [f'id{i}' for i in range(1001)]}, headers=headers)
+    assert response.status_code == 422
+
+
+def test_batch_fetch_chunks_retries_and_caches_misses(client, db, monkeypatch):
+    requests = stub_youtube(monkeypatch, fail_first={'v0': 503, 'v50': 429})
+    youtube_ids = [f'v{i}' for i in range(120)] + ['missing1']
+    headers = auth_headers(make_user(db))
+
+    response = client.post('/videos/fetch/batch', json={'youtube_ids': youtube_ids}, headers=headers)
+    assert response.status_code == 200
+    statuses = {result['youtube_id']: result['status'] for result in response.json()['results']}
+    assert statuses['missing1'] == 'not_found'
+    assert all(statuses[f'v{i}'] == 'created' for i in range(120))
+    # 50 ids per call; the 503 and the 429 were each retried once
+    assert all(len(ids) <= 50 for ids in requests)
+    assert sorted(len(ids) for ids in requests) == [21, 50, 50, 50, 50]
+
+    # The unknown id is a negative entry, in the database too, and isn't asked for again
+    assert db.get(VideoMetadataCache, 'missing1').payload is None
+    response = client.post('/videos/fetch/batch', json={'youtube_ids': ['missing1']}, headers=headers)
+    assert response.json()['results'] == [{'youtube_id': 'missing1', 'status': 'not_found', 'video': None}]
+    assert len(requests) == 5
@@ -1,34 +1,226 @@
+import asyncio
 import os
-import requests
-from typing import Optional
+import random
+import time
+import httpx
+import isodate
+from datetime import datetime, timezone
+from typing import Optional, Dict, List
+from cache import cache
+from metadata_cache import YOUTUBE_CACHE_TTL, metadata_cache
 
 def get_youtube_api_key():
     return os.getenv('YOUTUBE_API_KEY', '')
 
-YOUTUBE_API_URL = 'https://www.googleapis.com/youtube/v3/videos'
+# Overridable so the importer can be pointed at a local stub of the Data API
+YOUTUBE_API_URL = os.getenv('YOUTUBE_API_URL', 'https://www.googleapis.com/youtube/v3/videos')
 
-def fetch_video_metadata(youtube_id: str) -> Optional[dict]:
-    api_key = get_youtube_api_key()
-    params = {
-        'id': youtube_id,
-        'part': 'snippet,contentDetails',
-        'key': api_key
-    }
-    resp = requests.get(YOUTUBE_API_URL, params=params)
-    if resp.status_code != 200:
+YOUTUBE_PLAYLIST_ITEMS_URL = os.getenv('YOUTUBE_PLAYLIST_ITEMS_URL', 'https://www.googleapis.com/youtube/v3/playlistItems')
+
+# videos.list accepts at most 50 comma-separated ids per call (1 quota unit each call)
+YOUTUBE_BATCH_SIZE = 50
+
+YOUTUBE_TIMEOUT = float(os.getenv('YOUTUBE_TIMEOUT', 10))
+YOUTUBE_MAX_CONCURRENCY = int(os.getenv('YOUTUBE_MAX_CONCURRENCY', 4))
+YOUTUBE_MAX_RETRIES = int(os.getenv('YOUTUBE_MAX_RETRIES', 4))
+# The Data API grants 10,000 units per day by default; videos.list costs 1 unit
+YOUTUBE_DAILY_QUOTA = int(os.getenv('YOUTUBE_DAILY_QUOTA', 10000))
+YOUTUBE_BURST = int(os.getenv('YOUTUBE_BURST', 100))
+
+# 403 reasons that mean "slow down" rather than "you may not do this"
+QUOTA_ERROR_REASONS = {'quotaExceeded', 'rateLimitExceeded', 'userRateLimitExceeded'}
+
+def parse_duration(duration: Optional[str]) -> Optional[int]:
+    """Convert an ISO 8601 duration (e.g. PT1H2M3S) to seconds."""
+    try:
+        return int(isodate.parse_duration(duration).total_seconds())
+    except Exception:
+        return None
+
+def parse_published_at(published_at: Optional[str]) -> Optional[datetime]:
+    """Convert YouTube's RFC 3339 timestamp to a naive UTC datetime."""
+    if not published_at:
         return None
-    items = resp.json().get('items', [])
-    if not items:
+    try:
+        parsed = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+    except ValueError:
         return None
-    item = items[0]
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def _parse_item(item: dict) -> dict:
     snippet = item['snippet']
     content_details = item['contentDetails']
     return {
-        'youtube_id': youtube_id,
+        'youtube_id': item['id'],
         'title': snippet.get('title'),
         'description': snippet.get('description'),
         'published_at': snippet.get('publishedAt'),
         'duration': content_details.get('duration'),
         'thumbnails': snippet.get('thumbnails'),
         'channel_title': snippet.get('channelTitle'),
-    } 
\ No newline at end of file
+    }
+
+def _is_quota_error(resp: httpx.Response) -> bool:
+    try:
+        errors = resp.json().get('error', {}).get('errors', [])
+    except ValueError:
+        return False
+    return any(error.get('reason') in QUOTA_ERROR_REASONS for error in errors)
+
+
+class TokenBucket:
+    """Async token bucket: holds up to `capacity` tokens, refilled at `rate` per second."""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class YouTubeClient:
+    """Shared async client for the YouTube Data API.
+
+    All calls share one pooled httpx.AsyncClient with explicit timeouts. At
+    most `max_concurrency` requests are in flight, each request first takes
+    a token from a bucket refilled at the daily quota rate, and 5xx, 429 and
+    quota 403 responses are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        api_url: str = YOUTUBE_API_URL,
+        timeout: float = YOUTUBE_TIMEOUT,
+        max_concurrency: int = YOUTUBE_MAX_CONCURRENCY,
+        max_retries: int = YOUTUBE_MAX_RETRIES,
+        daily_quota: int = YOUTUBE_DAILY_QUOTA,
+        burst: int = YOUTUBE_BURST,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.api_url = api_url
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        # Replaces the network, e.g. with an httpx.MockTransport in tests
+        self.transport = transport
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._bucket = TokenBucket(capacity=min(burst, daily_quota), rate=daily_quota / 86400)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Pooled connections belong to the loop that opened them
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._loop = loop
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+                transport=self.transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, params: dict, url: Optional[str] = None) -> Optional[dict]:
+        """GET an API resource, returning the decoded body or None once retries are exhausted."""
+        params = {**params, 'key': get_youtube_api_key()}
+        for attempt in range(self.max_retries + 1):
+            await self._bucket.acquire()
+            async with self._semaphore:
+                try:
+                    resp = await self._get_client().get(url or self.api_url, params=params)
+                except httpx.HTTPError:
+                    resp = None
+            if resp is not None and resp.status_code == 200:
+                return resp.json()
+            retryable = (
+                resp is None
+                or resp.status_code >= 500
+                or resp.status_code == 429
+                or (resp.status_code == 403 and _is_quota_error(resp))
+            )
+            if not retryable or attempt == self.max_retries:
+                return None
+            await asyncio.sleep(min(2 ** attempt, 60) * (0.5 + random.random()))
+        return None
+
+    async def fetch_videos(self, youtube_ids: List[str]) -> Dict[str, Optional[dict]]:
+        """Call videos.list for up to 50 ids at a time, running chunks concurrently."""
+        chunks = [youtube_ids[start:start + YOUTUBE_BATCH_SIZE] for start in range(0, len(youtube_ids), YOUTUBE_BATCH_SIZE)]
+        bodies = await asyncio.gather(*(
+            self.get({'id': ','.join(chunk), 'part': 'snippet,contentDetails'}) for chunk in chunks
+        ))
+        results: Dict[str, Optional[dict]] = {}
+        for chunk, body in zip(chunks, bodies):
+            if body is None:
+                continue
+            found = {item['id']: _parse_item(item) for item in body.get('items', [])}
+            for youtube_id in chunk:
+                results[youtube_id] = found.get(youtube_id)
+        return results
+
+    async def fetch_playlist_video_ids(self, playlist_id: str) -> Optional[List[str]]:
+        """Page through playlistItems.list; returns None if any page fails."""
+        youtube_ids: List[str] = []
+        page_token = None
+        while True:
+            params = {'playlistId': playlist_id, 'part': 'contentDetails', 'maxResults': YOUTUBE_BATCH_SIZE}
+            if page_token:
+                params['pageToken'] = page_token
+            body = await self.get(params, url=YOUTUBE_PLAYLIST_ITEMS_URL)
+            if body is None:
+                return None
+            youtube_ids.extend(item['contentDetails']['videoId'] for item in body.get('items', []))
+            page_token = body.get('nextPageToken')
+            if not page_token:
+                return youtube_ids
+
+
+youtube_client = YouTubeClient()
+youtube_cache = cache.namespace('youtube', YOUTUBE_CACHE_TTL)
+
+async def fetch_videos_metadata(youtube_ids: List[str]) -> Dict[str, Optional[dict]]:
+    """Fetch metadata for many videos, consulting the metadata caches first.
+
+    Returns a mapping of youtube_id to metadata, or to None when YouTube does
+    not know the id. Ids belonging to a chunk whose request failed are left
+    out of the mapping entirely so callers can tell errors from misses.
+    """
+    results = await youtube_cache.get_many(youtube_ids)
+    pending = [youtube_id for youtube_id in youtube_ids if youtube_id not in results]
+    if not pending:
+        return results
+
+    # The database tier is synchronous, keep it off the event loop
+    stored, misses = await asyncio.to_thread(metadata_cache.get_many, pending)
+    # Shared entries expire together with the stored ones
+    await asyncio.gather(*(youtube_cache.set(youtube_id, payload, ttl=ttl) for youtube_id, (payload, ttl) in stored.items()))
+    results.update({youtube_id: payload for youtube_id, (payload, ttl) in stored.items()})
+    if misses:
+        fetched = await youtube_client.fetch_videos(misses)
+        await asyncio.to_thread(metadata_cache.set_many, fetched)
+        await youtube_cache.set_many({k: v for k, v in fetched.items() if v is not None}, ttl=metadata_cache.ttl)
+        await youtube_cache.set_many({k: v for k, v in fetched.items() if v is None}, ttl=metadata_cache.negative_ttl)
+        results.update(fetched)
+    return results
+
+async def fetch_video_metadata(youtube_id: str) -> Optional[dict]:
+    return (await fetch_videos_metadata([youtube_id])).get(youtube_id)
@@ -1,9 +1,20 @@
-import { API_URL, DEFAULT_TIMEOUT, getDefaultHeaders } from './config';
+import {
+  API_URL,
+  DEFAULT_TIMEOUT,
+  getDefaultHeaders,
+  getRefreshToken,
+  removeAuthToken,
+  removeRefreshToken,
+  setAuthToken,
+  setRefreshToken,
+} from './config';
 
 /**
  * Generic API client for making HTTP requests to the backend
  */
 class ApiClient {
+  private refreshing: Promise<boolean> | null = null;
+
   /**
    * Make a GET request
    */
@@ -16,11 +27,11 @@ class ApiClient {
       });
     }
 
-    const response = await fetch(url.toString(), {
+    const response = await this.send(url.toString(), () => ({
       method: 'GET',
       headers: getDefaultHeaders(),
       credentials: 'include',
-    });
+    }));
 
     return this.handleResponse<T>(response);
   }
@@ -29,12 +40,12 @@ class ApiClient {
    * Make a POST request
    */
   async post<T>(endpoint: string, data: any): Promise<T> {
-    const response = await fetch(`${API_URL}${endpoint}`, {
+    const response = await this.send(`${API_URL}${endpoint}`, () => ({
       method: 'POST',
       headers: getDefaultHeaders(),
       credentials: 'include',
       body: JSON.stringify(data),
-    });
+    }));
 
     return this.handleResponse<T>(response);
   }
@@ -43,12 +54,12 @@ class ApiClient {
    * Make a PUT request
    */
   async put<T>(endpoint: string, data: any): Promise<T> {
-    const response = await fetch(`${API_URL}${endpoint}`, {
+    const response = await this.send(`${API_URL}${endpoint}`, () => ({
       method: 'PUT',
       headers: getDefaultHeaders(),
       credentials: 'include',
       body: JSON.stringify(data),
-    });
+    }));
 
     return this.handleResponse<T>(response);
   }
@@ -57,15 +68,67 @@ class ApiClient {
    * Make a DELETE request
    */
   async delete<T>(endpoint: string): Promise<T> {
-    const response = await fetch(`${API_URL}${endpoint}`, {
+    const response = await this.send(`${API_URL}${endpoint}`, () => ({
       method: 'DELETE',
       headers: getDefaultHeaders(),
       credentials: 'include',
-    });
+    }));
 
     return this.handleResponse<T>(response);
   }
 
+  /**
+   * Send a request; when the access token has expired, renew it with the
+   * refresh token and retry once. `init` is called again for the retry so
+   * the new token ends up in the headers.
+   */
+  private async send(url: string, init: () => RequestInit): Promise<Response> {
+    const response = await fetch(url, init());
+    if (response.status !== 401 || !getRefreshToken()) {
+      return response;
+    }
+    const refreshed = await this.refreshAccessToken();
+    return refreshed ? fetch(url, init()) : response;
+  }
+
+  /**
+   * Exchange the stored refresh token for a new token pair. Concurrent
+   * callers share one request, since every refresh token can be used once.
+   */
+  refreshAccessToken(): Promise<boolean> {
+    if (!this.refreshing) {
+      this.refreshing = this.requestTokenRefresh().finally(() => {
+        this.refreshing = null;
+      });
+    }
+    return this.refreshing;
+  }
+
+  private async requestTokenRefresh(): Promise<boolean> {
+    const refreshToken = getRefreshToken();
+    if (!refreshToken) {
+      return false;
+    }
+    const response = await fetch(`${API_URL}/token/refresh`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      credentials: 'include',
+      body: JSON.stringify({ refresh_token: refreshToken }),
+    }).catch(() => null);
+    if (!response || !response.ok) {
+      if (response?.status === 401) {
+        // Refresh token expired or revoked: the user has to log in again
+        removeAuthToken();
+        removeRefreshToken();
+      }
+      return false;
+    }
+    const tokenData = await response.json();
+    setAuthToken(tokenData.access_token);
+    setRefreshToken(tokenData.refresh_token);
+    return true;
+  }
+
   /**
    * Handle API responses and error cases
    */
@@ -104,3 +167,42 @@ export class ApiError extends Error {
 
 // Create and export a singleton instance
 export const apiClient = new ApiClient();
+
+/**
+ * A page of a cursor-paginated list endpoint
+ */
+export interface Page<T> {
+  items: T[];
+  next_cursor: number | null;
+}
+
+/**
+ * Drop unset filters and stringify the rest for use as query parameters
+ */
+export const toQueryParams = (filters: Record<string, string | number | undefined>): Record<string, string> => {
+  const params: Record<string, string> = {};
+  Object.entries(filters).forEach(([key, value]) => {
+    if (value !== undefined) {
+      params[key] = String(value);
+    }
+  });
+  return params;
+};
+
+/**
+ * Follow next_cursor until every page of a list endpoint has been fetched
+ */
+export const fetchAllPages = async <T>(endpoint: string, queryParams: Record<string, string> = {}): Promise<T[]> => {
+  const items: T[] = [];
+  let cursor: number | null = null;
+  do {
+    const params: Record<string, string> = { ...queryParams, limit: '200' };
+    if (cursor !== null) {
+      params.cursor = String(cursor);
+    }
+    const page: Page<T> = await apiClient.get<Page<T>>(endpoint, params);
+    items.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor !== null);
+  return items;
+};
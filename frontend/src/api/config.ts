@@ -11,6 +11,9 @@ export const DEFAULT_TIMEOUT = 10000;
 // Auth token storage key in localStorage
 export const TOKEN_STORAGE_KEY = 'skillcrawler_token';
 
+// Refresh token storage key in localStorage
+export const REFRESH_TOKEN_STORAGE_KEY = 'skillcrawler_refresh_token';
+
 // Get auth token from localStorage
 export const getAuthToken = (): string | null => {
   return localStorage.getItem(TOKEN_STORAGE_KEY);
@@ -26,6 +29,21 @@ export const removeAuthToken = (): void => {
   localStorage.removeItem(TOKEN_STORAGE_KEY);
 };
 
+// Get refresh token from localStorage
+export const getRefreshToken = (): string | null => {
+  return localStorage.getItem(REFRESH_TOKEN_STORAGE_KEY);
+};
+
+// Set refresh token in localStorage
+export const setRefreshToken = (token: string): void => {
+  localStorage.setItem(REFRESH_TOKEN_STORAGE_KEY, token);
+};
+
+// Remove refresh token from localStorage
+export const removeRefreshToken = (): void => {
+  localStorage.removeItem(REFRESH_TOKEN_STORAGE_KEY);
+};
+
 // Default headers for API requests
 export const getDefaultHeaders = () => {
   const headers: Record<string, string> = {
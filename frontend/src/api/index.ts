@@ -7,16 +7,29 @@ export { authService } from './services/auth.service';
 export { skillsService } from './services/skills.service';
 export { videosService } from './services/videos.service';
 export { learningPathsService } from './services/learningPaths.service';
+export type { SearchResult, SearchResultType, SearchFilters, Suggestion } from './services/search.service';
+export { searchService } from './services/search.service';
+export { achievementsService } from './services/achievements.service';
+export { adminService } from './services/admin.service';
 
 // Export types
 export type { UserProfile, LoginCredentials, UserRegistrationDto } from './services/auth.service';
-export type { Skill, CreateSkillDto } from './services/skills.service';
-export type { Video, FetchVideoDto } from './services/videos.service';
+export type { Skill, CreateSkillDto, SkillFilters } from './services/skills.service';
+export type { Video, FetchVideoDto, VideoFetchResult, ImportJob } from './services/videos.service';
 export type { 
   LearningPath, 
+  LearningPathDetail,
+  LearningPathInclude,
+  LearningPathFilters,
   LearningPathVideo, 
   CreateLearningPathDto,
   AddVideoToPathDto,
   ProgressUpdate,
-  UserProgress
+  ProgressSyncItem,
+  ProgressSyncResult,
+  UserProgress,
+  DashboardPath,
+  DashboardSummary
 } from './services/learningPaths.service';
+export type { UserAchievement, AchievementSummary, ActivityDay, ActivitySummary } from './services/achievements.service';
+export type { AdminStats, AdminTotals, FunnelStep, SkillStats, PathStats } from './services/admin.service';
@@ -0,0 +1,50 @@
+import { apiClient, toQueryParams } from '../client';
+
+/**
+ * Service for the current user's achievements
+ */
+export interface UserAchievement {
+  code: string;
+  name: string;
+  description: string;
+  earned_at: string | null;
+  current: number;
+  total: number;
+}
+
+export interface AchievementSummary {
+  videos_completed: number;
+  paths_completed: number;
+  skills_covered: number;
+  current_streak: number;
+  longest_streak: number;
+  achievements: UserAchievement[];
+}
+
+export interface ActivityDay {
+  day: string;
+  completed_videos: number;
+}
+
+export interface ActivitySummary {
+  completed_videos: number;
+  active_days: number;
+  // One entry per day, oldest first, including days without activity
+  days: ActivityDay[];
+}
+
+export const achievementsService = {
+  /**
+   * Get the current user's counters and every achievement with progress towards it
+   */
+  getMyAchievements: async (): Promise<AchievementSummary> => {
+    return await apiClient.get<AchievementSummary>('/me/achievements');
+  },
+
+  /**
+   * Get the current user's completed videos per day over the last `days` days
+   */
+  getMyActivity: async (days?: number): Promise<ActivitySummary> => {
+    return await apiClient.get<ActivitySummary>('/me/activity', toQueryParams({ days }));
+  },
+};
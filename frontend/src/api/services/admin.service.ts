@@ -0,0 +1,54 @@
+import { apiClient, toQueryParams } from '../client';
+
+/**
+ * Service for the admin statistics, served from precomputed summaries
+ */
+export interface AdminTotals {
+  users: number;
+  skills: number;
+  learning_paths: number;
+  videos: number;
+  completed_videos: number;
+}
+
+export interface FunnelStep {
+  step: 'registered' | 'started_a_path' | 'completed_a_video' | 'finished_a_path';
+  users: number;
+}
+
+export interface SkillStats {
+  skill_id: number;
+  name: string;
+  learning_paths: number;
+  videos: number;
+  started_learners: number;
+}
+
+export interface PathStats {
+  learning_path_id: number;
+  name: string;
+  skill_id: number | null;
+  videos: number;
+  started_learners: number;
+  halfway_learners: number;
+  finishing_learners: number;
+  completed_videos: number;
+}
+
+export interface AdminStats {
+  totals: AdminTotals;
+  funnel: FunnelStep[];
+  skills: SkillStats[];
+  top_paths: PathStats[];
+  // When the summaries were last recomputed
+  refreshed_at: string;
+}
+
+export const adminService = {
+  /**
+   * Get catalog totals, the completion funnel and the most started learning paths
+   */
+  getStats: async (top?: number): Promise<AdminStats> => {
+    return await apiClient.get<AdminStats>('/admin/stats', toQueryParams({ top }));
+  },
+};
@@ -1,5 +1,5 @@
 import { apiClient } from '../client';
-import { setAuthToken, removeAuthToken } from '../config';
+import { API_URL, setAuthToken, removeAuthToken, getRefreshToken, setRefreshToken, removeRefreshToken } from '../config';
 
 /**
  * Authentication service for user login, registration, and account management
@@ -17,6 +17,7 @@ export interface LoginCredentials {
 
 export interface AuthResponse {
   access_token: string;
+  refresh_token: string;
   token_type: string;
 }
 
@@ -131,6 +132,7 @@ export const authService = {
       const tokenData = await response.json();
       console.log('Login successful, token received');
       setAuthToken(tokenData.access_token);
+      setRefreshToken(tokenData.refresh_token);
       return tokenData;
     } catch (error) {
       console.error('Error during login:', error instanceof Error ? error.message : 'Unknown error');
@@ -143,7 +145,17 @@ export const authService = {
    * Logout current user
    */
   logout: (): void => {
+    const refreshToken = getRefreshToken();
+    if (refreshToken) {
+      // Best effort: revoke the refresh token server-side, the local logout doesn't wait for it
+      fetch(`${API_URL}/token/revoke`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+      }).catch(() => undefined);
+    }
     removeAuthToken();
+    removeRefreshToken();
   },
 
   /**
@@ -1,6 +1,8 @@
-import { apiClient } from '../client';
+import { apiClient, fetchAllPages, toQueryParams } from '../client';
+import type { Page } from '../client';
 // Import Video interface directly with type import syntax
 import type { Video } from './videos.service';
+import type { Skill } from './skills.service';
 
 /**
  * Service for interacting with learning paths API endpoints
@@ -12,6 +14,17 @@ export interface LearningPath {
   skill_id: number;
   created_by: number;
   created_at: string;
+  video_count: number;
+  total_duration_seconds: number;
+}
+
+export interface LearningPathFilters {
+  skill_id?: number;
+  created_by?: number;
+  category?: string;
+  ids?: number[];
+  cursor?: number;
+  limit?: number;
 }
 
 export interface CreateLearningPathDto {
@@ -38,6 +51,20 @@ export interface ProgressUpdate {
   completed: boolean;
 }
 
+export interface ProgressSyncItem {
+  learning_path_id: number;
+  video_id: number;
+  completed: boolean;
+  client_timestamp: string;
+}
+
+export interface ProgressSyncResult {
+  applied: number;
+  unchanged: number;
+  stale: number;
+  rejected: [number, number][];
+}
+
 export interface UserProgress {
   id: number;
   user_id: number;
@@ -47,12 +74,59 @@ export interface UserProgress {
   completed_at?: string;
 }
 
+export type LearningPathInclude = 'skill' | 'videos' | 'progress';
+
+// Related data is only present when requested with `include`
+export interface LearningPathDetail extends LearningPath {
+  skill?: Skill;
+  videos?: LearningPathVideo[];
+  progress?: UserProgress[];
+}
+
+export interface DashboardPath {
+  learning_path_id: number;
+  name: string;
+  description?: string;
+  skill_id?: number;
+  completed_videos: number;
+  total_videos: number;
+  percent_complete: number;
+  last_activity?: string;
+}
+
+export interface DashboardSummary {
+  completed_videos: number;
+  total_videos: number;
+  percent_complete: number;
+  paths: DashboardPath[];
+}
+
 export const learningPathsService = {
   /**
-   * Get all learning paths
+   * Get one page of learning paths
+   */
+  getLearningPaths: async (filters: LearningPathFilters = {}): Promise<Page<LearningPath>> => {
+    const { ids, ...rest } = filters;
+    return await apiClient.get<Page<LearningPath>>('/learning-paths', toQueryParams({
+      ...rest,
+      ids: ids ? ids.join(',') : undefined
+    }));
+  },
+
+  /**
+   * Get all learning paths matching the filters, following pagination cursors
+   */
+  getAllLearningPaths: async (filters: Omit<LearningPathFilters, 'ids' | 'cursor' | 'limit'> = {}): Promise<LearningPath[]> => {
+    return await fetchAllPages<LearningPath>('/learning-paths', toQueryParams({ ...filters }));
+  },
+
+  /**
+   * Get one learning path, with its skill, ordered videos and the user's progress embedded as requested
    */
-  getAllLearningPaths: async (): Promise<LearningPath[]> => {
-    return await apiClient.get<LearningPath[]>('/learning-paths');
+  getLearningPath: async (pathId: number, include: LearningPathInclude[] = []): Promise<LearningPathDetail> => {
+    return await apiClient.get<LearningPathDetail>(`/learning-paths/${pathId}`, toQueryParams({
+      include: include.length > 0 ? include.join(',') : undefined
+    }));
   },
 
   /**
@@ -83,10 +157,24 @@ export const learningPathsService = {
     return await apiClient.post<UserProgress>(`/progress?learning_path_id=${learningPathId}`, progressData);
   },
 
+  /**
+   * Replay many progress changes in one request; the newest change per video wins
+   */
+  syncProgress: async (items: ProgressSyncItem[]): Promise<ProgressSyncResult> => {
+    return await apiClient.post<ProgressSyncResult>('/progress/batch', { items });
+  },
+
   /**
    * Get user progress for a learning path
    */
   getProgress: async (learningPathId: number): Promise<UserProgress[]> => {
     return await apiClient.get<UserProgress[]>(`/progress/${learningPathId}`);
   },
+
+  /**
+   * Get the current user's progress across every learning path they started
+   */
+  getDashboard: async (): Promise<DashboardSummary> => {
+    return await apiClient.get<DashboardSummary>('/me/dashboard');
+  },
 };
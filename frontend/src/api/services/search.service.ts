@@ -0,0 +1,53 @@
+import { apiClient, toQueryParams } from '../client';
+import type { Page } from '../client';
+
+/**
+ * Service for the full-text search endpoint
+ */
+export type SearchResultType = 'video' | 'skill' | 'learning_path';
+
+export interface SearchResult {
+  type: SearchResultType;
+  id: number;
+  title?: string;
+  // HTML-escaped description excerpt with the matched words wrapped in <mark>
+  snippet?: string;
+  rank: number;
+}
+
+export interface Suggestion {
+  type: SearchResultType;
+  id: number;
+  label: string;
+}
+
+export interface SearchFilters {
+  types?: SearchResultType[];
+  cursor?: number;
+  limit?: number;
+}
+
+export const searchService = {
+  /**
+   * Get one page of search results, best match first
+   */
+  search: async (query: string, filters: SearchFilters = {}): Promise<Page<SearchResult>> => {
+    const { types, ...rest } = filters;
+    return await apiClient.get<Page<SearchResult>>('/search', toQueryParams({
+      q: query,
+      types: types && types.length > 0 ? types.join(',') : undefined,
+      ...rest
+    }));
+  },
+
+  /**
+   * Autocomplete names starting with the prefix, most popular first
+   */
+  suggest: async (prefix: string, types: SearchResultType[] = [], limit?: number): Promise<Suggestion[]> => {
+    return await apiClient.get<Suggestion[]>('/search/suggest', toQueryParams({
+      prefix,
+      types: types.length > 0 ? types.join(',') : undefined,
+      limit
+    }));
+  },
+};
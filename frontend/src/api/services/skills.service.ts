@@ -1,4 +1,5 @@
-import { apiClient } from '../client';
+import { apiClient, fetchAllPages, toQueryParams } from '../client';
+import type { Page } from '../client';
 
 /**
  * Service for interacting with skills API endpoints
@@ -16,12 +17,37 @@ export interface CreateSkillDto {
   description?: string;
 }
 
+export interface SkillFilters {
+  category?: string;
+  ids?: number[];
+  cursor?: number;
+  limit?: number;
+}
+
 export const skillsService = {
   /**
-   * Get all available skills
+   * Get one page of skills
+   */
+  getSkills: async (filters: SkillFilters = {}): Promise<Page<Skill>> => {
+    const { ids, ...rest } = filters;
+    return await apiClient.get<Page<Skill>>('/skills', toQueryParams({
+      ...rest,
+      ids: ids ? ids.join(',') : undefined
+    }));
+  },
+
+  /**
+   * Get the distinct skill categories, for filters
+   */
+  getCategories: async (): Promise<string[]> => {
+    return await apiClient.get<string[]>('/skills/categories');
+  },
+
+  /**
+   * Get all available skills, following pagination cursors
    */
-  getAllSkills: async (): Promise<Skill[]> => {
-    return await apiClient.get<Skill[]>('/skills');
+  getAllSkills: async (filters: Pick<SkillFilters, 'category'> = {}): Promise<Skill[]> => {
+    return await fetchAllPages<Skill>('/skills', toQueryParams({ ...filters }));
   },
 
   /**
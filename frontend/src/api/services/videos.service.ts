@@ -17,6 +17,27 @@ export interface FetchVideoDto {
   youtube_id: string;
 }
 
+export interface VideoFetchResult {
+  youtube_id: string;
+  status: 'created' | 'exists' | 'not_found' | 'error';
+  video?: Video;
+}
+
+export interface ImportJob {
+  id: number;
+  kind: string;
+  status: 'pending' | 'running' | 'completed' | 'failed';
+  total: number;
+  created_count: number;
+  existing_count: number;
+  not_found_count: number;
+  failed_count: number;
+  error?: string;
+  created_at?: string;
+  started_at?: string;
+  finished_at?: string;
+}
+
 export const videosService = {
   /**
    * Fetch and store video metadata from YouTube
@@ -24,4 +45,27 @@ export const videosService = {
   fetchVideo: async (youtubeId: string): Promise<Video> => {
     return await apiClient.post<Video>('/videos/fetch', { youtube_id: youtubeId });
   },
+
+  /**
+   * Fetch and store metadata for up to 1000 YouTube videos in one request; use
+   * startImport for more
+   */
+  fetchVideos: async (youtubeIds: string[]): Promise<VideoFetchResult[]> => {
+    const response = await apiClient.post<{ results: VideoFetchResult[] }>('/videos/fetch/batch', { youtube_ids: youtubeIds });
+    return response.results;
+  },
+
+  /**
+   * Queue a background import of videos or a whole playlist
+   */
+  startImport: async (youtubeIds: string[], playlistId?: string): Promise<ImportJob> => {
+    return await apiClient.post<ImportJob>('/jobs/video-imports', { youtube_ids: youtubeIds, playlist_id: playlistId });
+  },
+
+  /**
+   * Poll the progress of a background import
+   */
+  getJob: async (jobId: number): Promise<ImportJob> => {
+    return await apiClient.get<ImportJob>(`/jobs/${jobId}`);
+  },
 };
@@ -1,67 +1,32 @@
 import React, { useState, useEffect } from 'react';
 import AchievementBadge from './AchievementBadge';
 import type { Achievement } from './AchievementBadge';
+import { achievementsService } from '../api';
+import type { UserAchievement } from '../api';
 
-// Sample achievements - in a real app, these would come from an API
-const sampleAchievements: Achievement[] = [
-  {
-    id: 1,
-    name: 'First Steps',
-    description: 'Completed your first learning path',
-    icon: 'fas fa-shoe-prints',
-    color: 'bg-blue-500 text-white',
-    earnedAt: '2023-04-15T12:30:00Z',
-  },
-  {
-    id: 2,
-    name: 'Skill Master',
-    description: 'Completed 5 learning paths for a single skill',
-    icon: 'fas fa-award',
-    color: 'bg-yellow-500 text-white',
-    earnedAt: '2023-05-20T09:45:00Z',
-  },
-  {
-    id: 3,
-    name: 'Learning Explorer',
-    description: 'Explored learning paths across 3 different skills',
-    icon: 'fas fa-compass',
-    color: 'bg-green-600 text-white',
-    earnedAt: '2023-06-10T15:20:00Z',
-  },
-  {
-    id: 4,
-    name: 'Persistent Learner',
-    description: 'Completed learning activities for 7 consecutive days',
-    icon: 'fas fa-calendar-check',
-    color: 'bg-purple-600 text-white',
-    progress: {
-      current: 4,
-      total: 7
-    }
-  },
-  {
-    id: 5,
-    name: 'Video Marathon',
-    description: 'Watched 20 educational videos',
-    icon: 'fas fa-film',
-    color: 'bg-red-500 text-white',
-    progress: {
-      current: 12,
-      total: 20
-    }
-  },
-  {
-    id: 6,
-    name: 'Rising Star',
-    description: 'Achieved 80% or higher in 3 skill assessments',
-    icon: 'fas fa-star',
-    color: 'bg-amber-400 text-white',
-    progress: {
-      current: 1,
-      total: 3
-    }
-  }
-];
+// Presentation of each achievement code returned by the API
+const achievementStyles: Record<string, { icon: string; color: string }> = {
+  first_video: { icon: 'fas fa-shoe-prints', color: 'bg-blue-500 text-white' },
+  video_marathon: { icon: 'fas fa-film', color: 'bg-red-500 text-white' },
+  video_century: { icon: 'fas fa-trophy', color: 'bg-red-700 text-white' },
+  first_path: { icon: 'fas fa-route', color: 'bg-teal-500 text-white' },
+  path_master: { icon: 'fas fa-award', color: 'bg-yellow-500 text-white' },
+  explorer: { icon: 'fas fa-compass', color: 'bg-green-600 text-white' },
+  polymath: { icon: 'fas fa-brain', color: 'bg-indigo-600 text-white' },
+  streak_7: { icon: 'fas fa-calendar-check', color: 'bg-purple-600 text-white' },
+  streak_30: { icon: 'fas fa-fire', color: 'bg-orange-500 text-white' },
+};
+
+const defaultStyle = { icon: 'fas fa-medal', color: 'bg-gray-500 text-white' };
+
+const toAchievement = (achievement: UserAchievement, index: number): Achievement => ({
+  id: index + 1,
+  name: achievement.name,
+  description: achievement.description,
+  ...(achievementStyles[achievement.code] || defaultStyle),
+  earnedAt: achievement.earned_at ?? undefined,
+  progress: achievement.earned_at ? undefined : { current: achievement.current, total: achievement.total },
+});
 
 interface AchievementSectionProps {
   userId?: number;
@@ -71,17 +36,14 @@ interface AchievementSectionProps {
 const AchievementSection: React.FC<AchievementSectionProps> = ({ userId, className = '' }) => {
   const [selectedAchievement, setSelectedAchievement] = useState<Achievement | null>(null);
   const [isModalOpen, setIsModalOpen] = useState(false);
-  const [achievements, setAchievements] = useState<Achievement[]>(sampleAchievements);
+  const [achievements, setAchievements] = useState<Achievement[]>([]);
 
   useEffect(() => {
-    // In a real app, we would fetch achievements from an API based on userId
+    // Achievements are only available for the signed-in user
     const fetchUserAchievements = async () => {
       try {
-        // This is where we would make an API call using the userId
-        // const response = await achievementsService.getUserAchievements(userId);
-        // setAchievements(response.data);
-        console.log(`Fetching achievements for user ${userId}`);
-        // For now, we're using the sample data
+        const summary = await achievementsService.getMyAchievements();
+        setAchievements(summary.achievements.map(toAchievement));
       } catch (error) {
         console.error('Error fetching user achievements:', error);
       }
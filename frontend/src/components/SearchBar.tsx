@@ -1,4 +1,6 @@
 import React, { useState, useEffect, useRef } from 'react';
+import { searchService } from '../api';
+import type { SearchResultType, Suggestion } from '../api';
 
 interface SearchBarProps {
   onSearch: (query: string) => void;
@@ -6,6 +8,8 @@ interface SearchBarProps {
   className?: string;
   initialValue?: string;
   debounceTime?: number;
+  // Show autocomplete suggestions of these types while typing
+  suggestionTypes?: SearchResultType[];
 }
 
 const SearchBar: React.FC<SearchBarProps> = ({
@@ -13,15 +17,46 @@ const SearchBar: React.FC<SearchBarProps> = ({
   placeholder = 'Search...',
   className = '',
   initialValue = '',
-  debounceTime = 300
+  debounceTime = 300,
+  suggestionTypes
 }) => {
   const [searchTerm, setSearchTerm] = useState(initialValue);
+  const [suggestions, setSuggestions] = useState<Suggestion[]>([]);
   const debounceTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
+  // Only the answer to the latest keystroke is shown
+  const suggestRequestRef = useRef(0);
+
+  const updateSuggestions = (value: string) => {
+    const request = ++suggestRequestRef.current;
+    if (!suggestionTypes || value.trim() === '') {
+      setSuggestions([]);
+      return;
+    }
+    // Served from an in-memory index, cheap enough to ask on every keystroke
+    searchService.suggest(value, suggestionTypes)
+      .then(results => {
+        if (request === suggestRequestRef.current) {
+          setSuggestions(results);
+        }
+      })
+      .catch(err => console.error('Error loading suggestions:', err));
+  };
+
+  const selectSuggestion = (suggestion: Suggestion) => {
+    if (debounceTimerRef.current) {
+      clearTimeout(debounceTimerRef.current);
+    }
+    suggestRequestRef.current++;
+    setSearchTerm(suggestion.label);
+    setSuggestions([]);
+    onSearch(suggestion.label);
+  };
 
   // Handle input change with debounce
   const handleInputChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     const value = e.target.value;
     setSearchTerm(value);
+    updateSuggestions(value);
 
     // Clear any existing timer
     if (debounceTimerRef.current) {
@@ -50,6 +85,8 @@ const SearchBar: React.FC<SearchBarProps> = ({
     if (debounceTimerRef.current) {
       clearTimeout(debounceTimerRef.current);
     }
+    suggestRequestRef.current++;
+    setSuggestions([]);
     onSearch(searchTerm);
   };
 
@@ -88,6 +125,7 @@ const SearchBar: React.FC<SearchBarProps> = ({
             className="absolute inset-y-0 right-0 pr-3 flex items-center text-gray-400 hover:text-gray-500"
             onClick={() => {
               setSearchTerm('');
+              updateSuggestions('');
               onSearch('');
             }}
           >
@@ -106,6 +144,23 @@ const SearchBar: React.FC<SearchBarProps> = ({
           </button>
         )}
       </div>
+
+      {/* Autocomplete suggestions */}
+      {suggestions.length > 0 && (
+        <ul className="absolute z-10 mt-1 w-full bg-white border border-gray-200 rounded-md shadow-lg max-h-64 overflow-auto">
+          {suggestions.map(suggestion => (
+            <li key={`${suggestion.type}-${suggestion.id}`}>
+              <button
+                type="button"
+                className="w-full text-left px-3 py-2 text-sm hover:bg-gray-100"
+                onClick={() => selectSuggestion(suggestion)}
+              >
+                {suggestion.label}
+              </button>
+            </li>
+          ))}
+        </ul>
+      )}
     </form>
   );
 };
@@ -2,37 +2,20 @@ import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
 import { learningPathsService } from '../api';
-import type { LearningPath, UserProgress } from '../api';
+import type { DashboardPath, DashboardSummary } from '../api';
 
 const Dashboard: React.FC = () => {
   const { user } = useAuth();
-  const [learningPaths, setLearningPaths] = useState<LearningPath[]>([]);
-  const [userProgress, setUserProgress] = useState<Map<number, UserProgress[]>>(new Map());
+  const [dashboard, setDashboard] = useState<DashboardSummary | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
     const fetchUserData = async () => {
       try {
-        // Fetch all learning paths
-        const paths = await learningPathsService.getAllLearningPaths();
-        setLearningPaths(paths);
-
-        // Fetch progress for each learning path
-        const progressData = new Map<number, UserProgress[]>();
-        
-        for (const path of paths) {
-          try {
-            const pathProgress = await learningPathsService.getProgress(path.id);
-            if (pathProgress.length > 0) {
-              progressData.set(path.id, pathProgress);
-            }
-          } catch (err) {
-            console.error(`Error fetching progress for path ${path.id}:`, err);
-          }
-        }
-        
-        setUserProgress(progressData);
+        // One request returns progress for every path the user has started
+        const data = await learningPathsService.getDashboard();
+        setDashboard(data);
       } catch (err) {
         setError('Failed to load dashboard data. Please try again later.');
         console.error('Error fetching dashboard data:', err);
@@ -44,53 +27,24 @@ const Dashboard: React.FC = () => {
     fetchUserData();
   }, []);
 
-  // Calculate overall progress across all learning paths
-  const calculateOverallProgress = () => {
-    let totalVideos = 0;
-    let completedVideos = 0;
-
-    userProgress.forEach((progressItems) => {
-      totalVideos += progressItems.length;
-      completedVideos += progressItems.filter(item => item.completed).length;
-    });
-
-    return {
-      totalVideos,
-      completedVideos,
-      percentage: totalVideos > 0 ? Math.round((completedVideos / totalVideos) * 100) : 0
-    };
-  };
+  const paths: DashboardPath[] = dashboard?.paths ?? [];
 
-  // Get in-progress learning paths (paths with some but not all videos completed)
-  const getInProgressPaths = () => {
-    return Array.from(userProgress.entries())
-      .filter(([_, progressItems]) => {
-        const completedCount = progressItems.filter(item => item.completed).length;
-        return completedCount > 0 && completedCount < progressItems.length;
-      })
-      .map(([pathId]) => learningPaths.find(path => path.id === pathId))
-      .filter(Boolean) as LearningPath[];
+  // Overall progress across all started learning paths
+  const overallProgress = {
+    totalVideos: dashboard?.total_videos ?? 0,
+    completedVideos: dashboard?.completed_videos ?? 0,
+    percentage: dashboard?.percent_complete ?? 0
   };
 
-  // Get completed learning paths (all videos completed)
-  const getCompletedPaths = () => {
-    return Array.from(userProgress.entries())
-      .filter(([_, progressItems]) => {
-        const completedCount = progressItems.filter(item => item.completed).length;
-        return completedCount > 0 && completedCount === progressItems.length;
-      })
-      .map(([pathId]) => learningPaths.find(path => path.id === pathId))
-      .filter(Boolean) as LearningPath[];
-  };
+  // In-progress learning paths (some but not all videos completed)
+  const inProgressPaths = paths.filter(
+    path => path.completed_videos > 0 && path.completed_videos < path.total_videos
+  );
 
-  // Calculate progress percentage for a specific path
-  const calculatePathProgress = (pathId: number) => {
-    const progressItems = userProgress.get(pathId);
-    if (!progressItems || progressItems.length === 0) return 0;
-    
-    const completedCount = progressItems.filter(item => item.completed).length;
-    return Math.round((completedCount / progressItems.length) * 100);
-  };
+  // Completed learning paths (all videos completed)
+  const completedPaths = paths.filter(
+    path => path.total_videos > 0 && path.completed_videos === path.total_videos
+  );
 
   if (loading) {
     return (
@@ -110,10 +64,6 @@ const Dashboard: React.FC = () => {
     );
   }
 
-  const overallProgress = calculateOverallProgress();
-  const inProgressPaths = getInProgressPaths();
-  const completedPaths = getCompletedPaths();
-
   return (
     <div className="container mx-auto px-4 py-8">
       <h1 className="text-3xl font-bold mb-8">Your Learning Dashboard</h1>
@@ -143,8 +93,8 @@ const Dashboard: React.FC = () => {
         {/* Stats */}
         <div className="grid grid-cols-1 md:grid-cols-3 gap-4">
           <div className="bg-blue-50 p-4 rounded-lg">
-            <p className="text-sm text-blue-800">Learning Paths</p>
-            <p className="text-2xl font-bold">{learningPaths.length}</p>
+            <p className="text-sm text-blue-800">Started Paths</p>
+            <p className="text-2xl font-bold">{paths.length}</p>
           </div>
           <div className="bg-green-50 p-4 rounded-lg">
             <p className="text-sm text-green-800">In Progress</p>
@@ -173,7 +123,7 @@ const Dashboard: React.FC = () => {
         ) : (
           <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
             {inProgressPaths.map(path => (
-              <div key={path.id} className="bg-white rounded-lg shadow-md overflow-hidden hover:shadow-lg transition-shadow duration-300">
+              <div key={path.learning_path_id} className="bg-white rounded-lg shadow-md overflow-hidden hover:shadow-lg transition-shadow duration-300">
                 <div className="p-5">
                   <h3 className="text-xl font-semibold text-gray-800 mb-2">{path.name}</h3>
                   
@@ -187,18 +137,18 @@ const Dashboard: React.FC = () => {
                         <div className="w-full bg-gray-200 rounded-full h-2.5">
                           <div 
                             className="bg-blue-600 h-2.5 rounded-full" 
-                            style={{ width: `${calculatePathProgress(path.id)}%` }}
+                            style={{ width: `${path.percent_complete}%` }}
                           ></div>
                         </div>
                       </div>
                       <span className="text-xs font-medium text-gray-700">
-                        {calculatePathProgress(path.id)}%
+                        {path.percent_complete}%
                       </span>
                     </div>
                   </div>
                   
                   <Link 
-                    to={`/paths/${path.id}`}
+                    to={`/paths/${path.learning_path_id}`}
                     className="bg-blue-600 hover:bg-blue-700 text-white py-2 px-4 rounded-md inline-flex items-center transition-colors"
                   >
                     <span>Continue</span>
@@ -219,7 +169,7 @@ const Dashboard: React.FC = () => {
           <h2 className="text-xl font-semibold mb-4">Completed Learning Paths</h2>
           <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
             {completedPaths.map(path => (
-              <div key={path.id} className="bg-white rounded-lg shadow-md overflow-hidden border-l-4 border-green-500">
+              <div key={path.learning_path_id} className="bg-white rounded-lg shadow-md overflow-hidden border-l-4 border-green-500">
                 <div className="p-5">
                   <div className="flex items-center mb-2">
                     <svg className="w-5 h-5 text-green-500 mr-2" fill="currentColor" viewBox="0 0 20 20">
@@ -229,7 +179,7 @@ const Dashboard: React.FC = () => {
                   </div>
                   
                   <Link 
-                    to={`/paths/${path.id}`}
+                    to={`/paths/${path.learning_path_id}`}
                     className="text-blue-600 hover:text-blue-800 text-sm font-medium flex items-center mt-3"
                   >
                     <span>View Again</span>
@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { useParams, Link } from 'react-router-dom';
-import { learningPathsService } from '../api';
-import type { LearningPath, LearningPathVideo, UserProgress } from '../api';
+import { ApiError, learningPathsService } from '../api';
+import type { LearningPath, LearningPathInclude, LearningPathVideo, UserProgress } from '../api';
 import { useAuth } from '../context/AuthContext';
 import VideoPlayer from '../components/VideoPlayer';
 
@@ -22,29 +22,21 @@ const LearningPathDetail: React.FC = () => {
       if (!id) return;
       
       try {
-        // Fetch learning paths to find the current one by id
-        const paths = await learningPathsService.getAllLearningPaths();
-        const currentPath = paths.find(path => path.id === parseInt(id));
-        if (currentPath) {
-          setLearningPath(currentPath);
-        } else {
-          setError('Learning path not found');
-          return;
-        }
+        // Path, ordered videos and (when signed in) progress in one request
+        const include: LearningPathInclude[] = isAuthenticated ? ['videos', 'progress'] : ['videos'];
+        const detail = await learningPathsService.getLearningPath(parseInt(id), include);
+        setLearningPath(detail);
         
-        // Fetch videos for this learning path
-        const pathVideos = await learningPathsService.getPathVideos(parseInt(id));
+        const pathVideos = detail.videos ?? [];
         setVideos(pathVideos);
         
         // Select the first video by default or the first uncompleted video
         if (pathVideos.length > 0) {
-          pathVideos.sort((a, b) => a.order - b.order);
           setSelectedVideo(pathVideos[0]);
         }
         
-        // Fetch user progress if authenticated
         if (isAuthenticated) {
-          const userProgress = await learningPathsService.getProgress(parseInt(id));
+          const userProgress = detail.progress ?? [];
           setProgress(userProgress);
           
           // If user has progress, select first uncompleted video
@@ -56,6 +48,10 @@ const LearningPathDetail: React.FC = () => {
           }
         }
       } catch (err) {
+        if (err instanceof ApiError && err.status === 404) {
+          setError('Learning path not found');
+          return;
+        }
         setError('Failed to load learning path data. Please try again.');
         console.error('Error fetching learning path data:', err);
       } finally {
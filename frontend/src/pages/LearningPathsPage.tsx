@@ -1,56 +1,100 @@
-import React, { useEffect, useState, useMemo } from 'react';
+import React, { useCallback, useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
-import { learningPathsService, skillsService } from '../api';
-import type { LearningPath, Skill } from '../api';
+import { learningPathsService, searchService, skillsService } from '../api';
+import type { LearningPath, Page, Skill } from '../api';
 import LearningPathCard from '../components/LearningPathCard';
 import SearchBar from '../components/SearchBar';
 import { useAuth } from '../context/AuthContext';
 
+// Paths loaded at a time; more are fetched when the user asks for them
+const PAGE_SIZE = 24;
+
 const LearningPathsPage: React.FC = () => {
   const { isAuthenticated } = useAuth();
   const [learningPaths, setLearningPaths] = useState<LearningPath[]>([]);
+  const [nextCursor, setNextCursor] = useState<number | null>(null);
   const [skills, setSkills] = useState<Skill[]>([]);
   const [loading, setLoading] = useState<boolean>(true);
+  const [loadingMore, setLoadingMore] = useState<boolean>(false);
   const [error, setError] = useState<string | null>(null);
   const [searchTerm, setSearchTerm] = useState('');
   const [selectedSkillId, setSelectedSkillId] = useState<number | 'all'>('all');
 
-  // Filter learning paths based on search and selected skill
-  // Always call this hook, even if the data is loading or there's an error
-  const filteredLearningPaths = useMemo(() => {
-    return learningPaths.filter(path => {
-      const matchesSearch = searchTerm === '' ||
-        path.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        (path.description && path.description.toLowerCase().includes(searchTerm.toLowerCase()));
-      
-      const matchesSkill = selectedSkillId === 'all' || path.skill_id === selectedSkillId;
-      
-      return matchesSearch && matchesSkill;
+  // One page of paths: the listing, or the search matches best first when searching
+  const fetchPage = useCallback(async (cursor: number | null): Promise<Page<LearningPath>> => {
+    const skillId = selectedSkillId === 'all' ? undefined : selectedSkillId;
+    if (searchTerm.trim() === '') {
+      return await learningPathsService.getLearningPaths({ skill_id: skillId, cursor: cursor ?? undefined, limit: PAGE_SIZE });
+    }
+    // Rank matches on the server so stemming and prefixes work like everywhere else,
+    // then load the matched paths with one request
+    const matches = await searchService.search(searchTerm, { types: ['learning_path'], cursor: cursor ?? undefined, limit: PAGE_SIZE });
+    if (matches.items.length === 0) {
+      return { items: [], next_cursor: matches.next_cursor };
+    }
+    const paths = await learningPathsService.getLearningPaths({
+      ids: matches.items.map(item => item.id),
+      skill_id: skillId,
+      limit: PAGE_SIZE
     });
-  }, [learningPaths, searchTerm, selectedSkillId]);
+    const pathsById = new Map(paths.items.map(path => [path.id, path]));
+    return {
+      items: matches.items
+        .map(item => pathsById.get(item.id))
+        .filter((path): path is LearningPath => path !== undefined),
+      next_cursor: matches.next_cursor
+    };
+  }, [searchTerm, selectedSkillId]);
 
+  // Start over from the first page whenever the search or the filter changes
   useEffect(() => {
-    const fetchData = async () => {
-      try {
-        // Fetch learning paths and skills in parallel
-        const [pathsData, skillsData] = await Promise.all([
-          learningPathsService.getAllLearningPaths(),
-          skillsService.getAllSkills()
-        ]);
-        
-        setLearningPaths(pathsData);
-        setSkills(skillsData);
-      } catch (err) {
-        setError('Failed to load data. Please try again later.');
-        console.error('Error fetching data:', err);
-      } finally {
-        setLoading(false);
-      }
+    let cancelled = false;
+    fetchPage(null)
+      .then(page => {
+        if (!cancelled) {
+          setLearningPaths(page.items);
+          setNextCursor(page.next_cursor);
+        }
+      })
+      .catch(err => {
+        if (!cancelled) {
+          setError('Failed to load data. Please try again later.');
+        }
+        console.error('Error fetching learning paths:', err);
+      })
+      .finally(() => {
+        if (!cancelled) {
+          setLoading(false);
+        }
+      });
+    return () => {
+      cancelled = true;
     };
+  }, [fetchPage]);
 
-    fetchData();
+  // Every skill is an option of the filter
+  useEffect(() => {
+    skillsService.getAllSkills()
+      .then(setSkills)
+      .catch(err => console.error('Error fetching skills:', err));
   }, []);
 
+  const loadMore = async () => {
+    if (nextCursor === null) {
+      return;
+    }
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(nextCursor);
+      setLearningPaths(paths => [...paths, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      console.error('Error loading more learning paths:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading) {
     return (
       <div className="flex justify-center items-center h-64">
@@ -108,6 +152,7 @@ const LearningPathsPage: React.FC = () => {
               onSearch={handleSearch}
               placeholder="Search learning paths..."
               className="w-full"
+              suggestionTypes={['learning_path']}
             />
           </div>
           
@@ -130,9 +175,9 @@ const LearningPathsPage: React.FC = () => {
         </div>
       </div>
       
-      {filteredLearningPaths.length === 0 ? (
+      {learningPaths.length === 0 ? (
         <div className="bg-yellow-50 border border-yellow-200 text-yellow-800 p-4 rounded-md">
-          {learningPaths.length === 0 ? (
+          {searchTerm.trim() === '' && selectedSkillId === 'all' ? (
             <p>No learning paths available yet. {isAuthenticated ? 'Be the first to create one!' : 'Sign in to create one!'}</p>
           ) : (
             <p>No learning paths match your search criteria. Try a different search or filter.</p>
@@ -140,11 +185,23 @@ const LearningPathsPage: React.FC = () => {
         </div>
       ) : (
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-          {filteredLearningPaths.map(path => (
+          {learningPaths.map(path => (
             <LearningPathCard key={path.id} learningPath={path} />
           ))}
         </div>
       )}
+
+      {nextCursor !== null && (
+        <div className="flex justify-center mt-8">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="bg-white border border-gray-300 hover:bg-gray-50 text-gray-700 py-2 px-6 rounded-md transition-colors disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
@@ -28,11 +28,8 @@ const SkillDetail: React.FC = () => {
         
         setSkill(currentSkill);
         
-        // Get all learning paths
-        const paths = await learningPathsService.getAllLearningPaths();
-        
-        // Filter paths for this skill
-        const skillPaths = paths.filter(path => path.skill_id === currentSkill.id);
+        // Get only the learning paths for this skill
+        const skillPaths = await learningPathsService.getAllLearningPaths({ skill_id: currentSkill.id });
         setLearningPaths(skillPaths);
       } catch (err) {
         setError('Failed to load skill data. Please try again later.');
@@ -1,58 +1,92 @@
-import React, { useEffect, useState, useMemo } from 'react';
-import { skillsService } from '../api';
-import type { Skill } from '../api';
+import React, { useCallback, useEffect, useState } from 'react';
+import { searchService, skillsService } from '../api';
+import type { Page, Skill } from '../api';
 import SkillCard from '../components/SkillCard';
 import SearchBar from '../components/SearchBar';
 
+// Skills loaded at a time; more are fetched when the user asks for them
+const PAGE_SIZE = 24;
+
 const SkillsPage: React.FC = () => {
   const [skills, setSkills] = useState<Skill[]>([]);
+  const [nextCursor, setNextCursor] = useState<number | null>(null);
+  const [categories, setCategories] = useState<string[]>([]);
   const [loading, setLoading] = useState<boolean>(true);
+  const [loadingMore, setLoadingMore] = useState<boolean>(false);
   const [error, setError] = useState<string | null>(null);
   const [searchTerm, setSearchTerm] = useState('');
   const [selectedCategory, setSelectedCategory] = useState<string>('all');
 
-  // Extract unique categories from skills
-  // Always call hooks, even if they return empty arrays when loading
-  const categories = useMemo(() => {
-    const uniqueCategories = new Set<string>();
-    skills.forEach(skill => {
-      if (skill.category) {
-        uniqueCategories.add(skill.category);
-      }
-    });
-    return ['all', ...Array.from(uniqueCategories)];
-  }, [skills]);
-  
-  // Filter skills based on search term and selected category
-  const filteredSkills = useMemo(() => {
-    return skills.filter(skill => {
-      const matchesSearch = searchTerm === '' ||
-        skill.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        (skill.description && skill.description.toLowerCase().includes(searchTerm.toLowerCase()));
-      
-      const matchesCategory = selectedCategory === 'all' || 
-        skill.category === selectedCategory;
-      
-      return matchesSearch && matchesCategory;
-    });
-  }, [skills, searchTerm, selectedCategory]);
+  // One page of skills: the listing, or the search matches best first when searching
+  const fetchPage = useCallback(async (cursor: number | null): Promise<Page<Skill>> => {
+    const category = selectedCategory === 'all' ? undefined : selectedCategory;
+    if (searchTerm.trim() === '') {
+      return await skillsService.getSkills({ category, cursor: cursor ?? undefined, limit: PAGE_SIZE });
+    }
+    // Rank matches on the server so stemming and prefixes work like everywhere else,
+    // then load the matched skills with one request
+    const matches = await searchService.search(searchTerm, { types: ['skill'], cursor: cursor ?? undefined, limit: PAGE_SIZE });
+    if (matches.items.length === 0) {
+      return { items: [], next_cursor: matches.next_cursor };
+    }
+    const found = await skillsService.getSkills({ ids: matches.items.map(item => item.id), category, limit: PAGE_SIZE });
+    const skillsById = new Map(found.items.map(skill => [skill.id, skill]));
+    return {
+      items: matches.items
+        .map(item => skillsById.get(item.id))
+        .filter((skill): skill is Skill => skill !== undefined),
+      next_cursor: matches.next_cursor
+    };
+  }, [searchTerm, selectedCategory]);
 
+  // Start over from the first page whenever the search or the filter changes
   useEffect(() => {
-    const fetchSkills = async () => {
-      try {
-        const data = await skillsService.getAllSkills();
-        setSkills(data);
-      } catch (err) {
-        setError('Failed to load skills. Please try again later.');
+    let cancelled = false;
+    fetchPage(null)
+      .then(page => {
+        if (!cancelled) {
+          setSkills(page.items);
+          setNextCursor(page.next_cursor);
+        }
+      })
+      .catch(err => {
+        if (!cancelled) {
+          setError('Failed to load skills. Please try again later.');
+        }
         console.error('Error fetching skills:', err);
-      } finally {
-        setLoading(false);
-      }
+      })
+      .finally(() => {
+        if (!cancelled) {
+          setLoading(false);
+        }
+      });
+    return () => {
+      cancelled = true;
     };
+  }, [fetchPage]);
 
-    fetchSkills();
+  useEffect(() => {
+    skillsService.getCategories()
+      .then(setCategories)
+      .catch(err => console.error('Error fetching skill categories:', err));
   }, []);
 
+  const loadMore = async () => {
+    if (nextCursor === null) {
+      return;
+    }
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(nextCursor);
+      setSkills(loaded => [...loaded, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      console.error('Error loading more skills:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading) {
     return (
       <div className="flex justify-center items-center h-64">
@@ -93,6 +127,7 @@ const SkillsPage: React.FC = () => {
               onSearch={handleSearch}
               placeholder="Search skills..."
               className="w-full"
+              suggestionTypes={['skill']}
             />
           </div>
           
@@ -102,9 +137,10 @@ const SkillsPage: React.FC = () => {
               value={selectedCategory}
               onChange={handleCategoryChange}
             >
+              <option value="all">All Categories</option>
               {categories.map(category => (
                 <option key={category} value={category}>
-                  {category === 'all' ? 'All Categories' : category}
+                  {category}
                 </option>
               ))}
             </select>
@@ -112,9 +148,9 @@ const SkillsPage: React.FC = () => {
         </div>
       </div>
       
-      {filteredSkills.length === 0 ? (
+      {skills.length === 0 ? (
         <div className="bg-yellow-50 border border-yellow-200 text-yellow-800 p-4 rounded-md">
-          {skills.length === 0 ? (
+          {searchTerm.trim() === '' && selectedCategory === 'all' ? (
             <p>No skills available yet. Be the first to add one!</p>
           ) : (
             <p>No skills match your search criteria. Try a different search or filter.</p>
@@ -122,11 +158,23 @@ const SkillsPage: React.FC = () => {
         </div>
       ) : (
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-          {filteredSkills.map(skill => (
+          {skills.map(skill => (
             <SkillCard key={skill.id} skill={skill} />
           ))}
         </div>
       )}
+
+      {nextCursor !== null && (
+        <div className="flex justify-center mt-8">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="bg-white border border-gray-300 hover:bg-gray-50 text-gray-700 py-2 px-6 rounded-md transition-colors disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
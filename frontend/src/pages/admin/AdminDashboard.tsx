@@ -1,14 +1,10 @@
 import React, { useState, useEffect } from 'react';
-import { skillsService, learningPathsService } from '../../api';
+import { adminService } from '../../api';
+import type { AdminStats } from '../../api';
 import { useToast } from '../../context/ToastContext';
 
 const AdminDashboard: React.FC = () => {
-  const [stats, setStats] = useState({
-    totalSkills: 0,
-    totalLearningPaths: 0,
-    totalUsers: 0,
-    recentActivity: []
-  });
+  const [stats, setStats] = useState<AdminStats | null>(null);
   const [loading, setLoading] = useState(true);
   const { addToast } = useToast();
 
@@ -17,20 +13,8 @@ const AdminDashboard: React.FC = () => {
       try {
         setLoading(true);
         
-        // Fetch stats from multiple endpoints in parallel
-        const [skills, paths] = await Promise.all([
-          skillsService.getAllSkills(),
-          learningPathsService.getAllLearningPaths()
-        ]);
-        
-        // In a real application, we would have an admin API to get these statistics
-        // For now, we'll just use the data we have
-        setStats({
-          totalSkills: skills.length,
-          totalLearningPaths: paths.length,
-          totalUsers: 0, // This would come from an admin API
-          recentActivity: [] // This would come from an admin API
-        });
+        // Precomputed on the server, so this stays cheap however large the catalog gets
+        setStats(await adminService.getStats());
       } catch (err) {
         console.error('Error fetching admin stats:', err);
         addToast('Failed to load admin statistics', 'error');
@@ -50,6 +34,10 @@ const AdminDashboard: React.FC = () => {
     );
   }
 
+  if (!stats) {
+    return <p className="text-gray-500 italic">Admin statistics are not available.</p>;
+  }
+
   return (
     <div>
       <h2 className="text-xl font-semibold mb-6">Admin Overview</h2>
@@ -64,7 +52,7 @@ const AdminDashboard: React.FC = () => {
             </div>
             <div className="ml-4">
               <h3 className="text-gray-500 text-sm">Total Skills</h3>
-              <p className="font-semibold text-xl">{stats.totalSkills}</p>
+              <p className="font-semibold text-xl">{stats.totals.skills}</p>
             </div>
           </div>
         </div>
@@ -78,7 +66,7 @@ const AdminDashboard: React.FC = () => {
             </div>
             <div className="ml-4">
               <h3 className="text-gray-500 text-sm">Learning Paths</h3>
-              <p className="font-semibold text-xl">{stats.totalLearningPaths}</p>
+              <p className="font-semibold text-xl">{stats.totals.learning_paths}</p>
             </div>
           </div>
         </div>
@@ -92,7 +80,7 @@ const AdminDashboard: React.FC = () => {
             </div>
             <div className="ml-4">
               <h3 className="text-gray-500 text-sm">Users</h3>
-              <p className="font-semibold text-xl">{stats.totalUsers}</p>
+              <p className="font-semibold text-xl">{stats.totals.users}</p>
             </div>
           </div>
         </div>
@@ -124,16 +112,25 @@ const AdminDashboard: React.FC = () => {
         </div>
         
         <div className="bg-white p-6 rounded-lg border border-gray-200 shadow-sm">
-          <h3 className="font-semibold text-lg mb-4">Recent Activity</h3>
+          <h3 className="font-semibold text-lg mb-4">Top Learning Paths</h3>
           
-          {stats.recentActivity.length === 0 ? (
-            <p className="text-gray-500 italic">No recent activity to display.</p>
+          {stats.top_paths.length === 0 ? (
+            <p className="text-gray-500 italic">No learning paths yet.</p>
           ) : (
             <div className="space-y-3">
-              {/* This would render recent activity items from the admin API */}
-              <p className="text-gray-500 italic">Activity log would appear here.</p>
+              {stats.top_paths.map(path => (
+                <div key={path.learning_path_id} className="flex justify-between text-sm">
+                  <span className="text-gray-700">{path.name}</span>
+                  <span className="text-gray-500">
+                    {path.started_learners} started · {path.finishing_learners} finished
+                  </span>
+                </div>
+              ))}
             </div>
           )}
+          <p className="text-xs text-gray-400 mt-4">
+            Updated {new Date(`${stats.refreshed_at}Z`).toLocaleString()}
+          </p>
         </div>
       </div>
     </div>